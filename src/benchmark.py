@@ -0,0 +1,549 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from src.cli import MODEL_SIZES, collect_inputs
+from src.core.audio_buffer import SAMPLE_RATE
+from src.core.transcription_service import EnhancedTranscriptionService
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_VERSION = 1
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_USAGE = 2
+
+# Everything that adds work beyond decode and inference is off in the
+# minimal config; each stage config turns exactly one of them on, so its
+# cost is the difference from minimal. The cache and checkpoints are never
+# on: a benchmark that hits either measures nothing
+MINIMAL_OPTIONS = {
+    "enable_audio_enhancement": False,
+    "enable_vad": False,
+    "enable_text_processing": False,
+    "enable_speaker_detection": False,
+    "enable_language_predetection": False,
+    "enable_model_optimization": False,
+    "enable_result_cache": False,
+    "enable_checkpoints": False,
+}
+
+
+@dataclass
+class BenchmarkConfig:
+    name: str
+    service_options: Dict[str, Any] = field(default_factory=dict)
+    transcribe_options: Dict[str, Any] = field(default_factory=dict)
+
+
+CONFIGS = {
+    "minimal": BenchmarkConfig("minimal", {}, {"enable_enhancements": False}),
+    # accuracy priority makes the enhancer run whatever the quality score
+    "enhancement": BenchmarkConfig(
+        "enhancement",
+        {"enable_audio_enhancement": True},
+        {"accuracy_priority": "accuracy"},
+    ),
+    "vad": BenchmarkConfig("vad", {"enable_vad": True}, {"enable_enhancements": False}),
+    "text": BenchmarkConfig("text", {"enable_text_processing": True}),
+    "diarization": BenchmarkConfig(
+        "diarization",
+        {"enable_speaker_detection": True},
+        {"enable_enhancements": False},
+    ),
+    "language": BenchmarkConfig(
+        "language",
+        {"enable_language_predetection": True},
+        {"enable_enhancements": False},
+    ),
+    "full": BenchmarkConfig(
+        "full",
+        {
+            "enable_audio_enhancement": True,
+            "enable_vad": True,
+            "enable_text_processing": True,
+            "enable_speaker_detection": True,
+            "enable_language_predetection": True,
+        },
+        {"accuracy_priority": "accuracy"},
+    ),
+}
+DEFAULT_CONFIGS = ("minimal", "enhancement", "vad", "text", "full")
+
+# Relative slowdown tolerated before compare flags a metric, and the
+# absolute change below which a metric counts as noise whatever the ratio
+DEFAULT_TOLERANCE = 0.15
+NOISE_FLOORS = {
+    "wall_seconds": 0.05,
+    "rtf": 0.005,
+    "peak_rss_mb": 25.0,
+    "alloc_peak_mb": 5.0,
+    "alloc_retained_mb": 5.0,
+    "stage_seconds": 0.05,
+}
+
+RSS_SAMPLE_SECONDS = 0.01
+
+
+@dataclass
+class BenchmarkInput:
+    name: str
+    path: Path
+    audio_seconds: Optional[float] = None  # known for synthetic inputs
+    snr_db: Optional[float] = None
+
+
+def synthesize_speech(
+    seconds: float, snr_db: Optional[float] = None, seed: int = 0
+) -> np.ndarray:
+    # Speech-shaped, not speech: voiced bursts with a wandering pitch and
+    # syllable-rate envelope, separated by pauses, so VAD, enhancement and
+    # the decoder see realistic structure. Seeded, so runs are comparable
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    samples = np.zeros(total, dtype=np.float32)
+
+    position = 0
+    while position < total:
+        burst = int(rng.uniform(1.0, 4.0) * SAMPLE_RATE)
+        pause = int(rng.uniform(0.2, 1.0) * SAMPLE_RATE)
+        end = min(position + burst, total)
+        t = np.arange(end - position) / SAMPLE_RATE
+
+        pitch = rng.uniform(100.0, 220.0) * (1 + 0.05 * np.sin(2 * np.pi * 0.7 * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+        envelope = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3.0, 5.0) * t))
+        samples[position:end] = 0.2 * voiced * envelope
+        position = end + pause
+
+    if snr_db is not None:
+        signal_power = float(np.mean(samples**2)) or 1e-8
+        noise = rng.standard_normal(total).astype(np.float32)
+        noise *= np.sqrt(signal_power / 10 ** (snr_db / 10))
+        samples += noise
+    return np.clip(samples, -1.0, 1.0)
+
+
+def synthetic_inputs(
+    durations: Sequence[float],
+    snrs: Sequence[Optional[float]],
+    directory: Path,
+) -> List[BenchmarkInput]:
+    inputs = []
+    for seconds in durations:
+        for snr_db in snrs:
+            noise = "clean" if snr_db is None else f"snr{snr_db:g}"
+            name = f"synthetic-{seconds:g}s-{noise}"
+            path = directory / f"{name}.wav"
+            sf.write(str(path), synthesize_speech(seconds, snr_db), SAMPLE_RATE)
+            inputs.append(BenchmarkInput(name, path, seconds, snr_db))
+    return inputs
+
+
+def fixture_inputs(fixtures_dir: Path = FIXTURES_DIR) -> List[BenchmarkInput]:
+    # Media fixtures are large and not always checked out; use whatever is
+    # present
+    return [
+        BenchmarkInput(f"fixture-{path.name}", path)
+        for path in collect_inputs([str(fixtures_dir)], recursive=True)
+    ]
+
+
+class PeakRSSSampler:
+    # ru_maxrss only ever grows over the life of the process, so each run's
+    # peak is sampled from a background thread instead
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        import psutil
+
+        process = psutil.Process()
+        while True:
+            self.peak_bytes = max(self.peak_bytes, process.memory_info().rss)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / (1024 * 1024)
+
+
+@dataclass
+class CaseResult:
+    name: str
+    input: str
+    config: str
+    audio_seconds: float
+    runs: int
+    wall_seconds: float  # median over runs
+    rtf: float  # wall seconds per second of audio; lower is faster
+    stage_seconds: Dict[str, float]  # median per span, from metadata["timings"]
+    peak_rss_mb: float
+    # Python and numpy heap, via tracemalloc (torch's allocator is not seen);
+    # retained is what one run leaves allocated once it returns
+    alloc_peak_mb: Optional[float] = None
+    alloc_retained_mb: Optional[float] = None
+
+
+def _run_once(
+    service: EnhancedTranscriptionService,
+    item: BenchmarkInput,
+    config: BenchmarkConfig,
+) -> Tuple[float, Any]:
+    started = time.perf_counter()
+    result = service.transcribe_file(item.path, **config.transcribe_options)
+    return time.perf_counter() - started, result
+
+
+def run_case(
+    item: BenchmarkInput,
+    config: BenchmarkConfig,
+    model: str = "base",
+    repeat: int = 3,
+    warmup: int = 1,
+    measure_allocations: bool = True,
+    service_factory: Optional[Callable[..., EnhancedTranscriptionService]] = None,
+) -> CaseResult:
+    service_factory = service_factory or EnhancedTranscriptionService
+    service = service_factory(
+        model_size=model, **{**MINIMAL_OPTIONS, **config.service_options}
+    )
+    try:
+        # Warm-up runs load the model and fill lazy caches, so the timed
+        # runs measure steady-state throughput
+        for _ in range(warmup):
+            _run_once(service, item, config)
+
+        walls: List[float] = []
+        stages: Dict[str, List[float]] = {}
+        audio_seconds = item.audio_seconds or 0.0
+        with PeakRSSSampler() as sampler:
+            for _ in range(max(1, repeat)):
+                wall, result = _run_once(service, item, config)
+                walls.append(wall)
+                audio_seconds = item.audio_seconds or result.duration
+                for name, seconds in result.metadata.get("timings", {}).items():
+                    stages.setdefault(name, []).append(seconds)
+
+        alloc_peak_mb = alloc_retained_mb = None
+        if measure_allocations:
+            # tracemalloc slows everything down, so it gets a run of its own
+            tracemalloc.start()
+            try:
+                _, result = _run_once(service, item, config)
+                del result
+                retained, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            alloc_peak_mb = round(peak / (1024 * 1024), 2)
+            alloc_retained_mb = round(retained / (1024 * 1024), 2)
+    finally:
+        service.cleanup()
+
+    wall_seconds = statistics.median(walls)
+    return CaseResult(
+        name=f"{item.name}/{config.name}",
+        input=item.name,
+        config=config.name,
+        audio_seconds=round(audio_seconds, 3),
+        runs=len(walls),
+        wall_seconds=round(wall_seconds, 4),
+        rtf=round(wall_seconds / max(audio_seconds, 1e-6), 5),
+        stage_seconds={
+            name: round(statistics.median(values), 4)
+            for name, values in sorted(stages.items())
+        },
+        peak_rss_mb=round(sampler.peak_mb, 1),
+        alloc_peak_mb=alloc_peak_mb,
+        alloc_retained_mb=alloc_retained_mb,
+    )
+
+
+def machine_info() -> Dict[str, Any]:
+    info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return info
+
+
+def run_benchmark(
+    inputs: Sequence[BenchmarkInput],
+    configs: Sequence[BenchmarkConfig],
+    model: str = "base",
+    repeat: int = 3,
+    warmup: int = 1,
+    measure_allocations: bool = True,
+    service_factory: Optional[Callable[..., EnhancedTranscriptionService]] = None,
+) -> Dict[str, Any]:
+    cases = []
+    for item in inputs:
+        for config in configs:
+            logger.info(f"⏱️ Benchmarking {item.name} with {config.name}")
+            case = run_case(
+                item,
+                config,
+                model,
+                repeat,
+                warmup,
+                measure_allocations,
+                service_factory,
+            )
+            logger.info(
+                f"   {case.wall_seconds:.2f}s, RTF {case.rtf:.3f}, "
+                f"peak RSS {case.peak_rss_mb:.0f} MB"
+            )
+            cases.append(asdict(case))
+
+    return {
+        "version": BENCHMARK_VERSION,
+        "created_at": time.time(),
+        "model": model,
+        "repeat": repeat,
+        "machine": machine_info(),
+        "cases": cases,
+    }
+
+
+@dataclass
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / max(self.baseline, 1e-9)
+
+
+def _metrics(case: Dict[str, Any]) -> Dict[str, Tuple[Optional[float], float]]:
+    metrics = {
+        name: (case.get(name), NOISE_FLOORS[name])
+        for name in (
+            "wall_seconds",
+            "rtf",
+            "peak_rss_mb",
+            "alloc_peak_mb",
+            "alloc_retained_mb",
+        )
+    }
+    for stage, seconds in case.get("stage_seconds", {}).items():
+        metrics[f"stage:{stage}"] = (seconds, NOISE_FLOORS["stage_seconds"])
+    return metrics
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Regression]:
+    # Only cases present in both reports are compared; every metric here is
+    # lower-is-better
+    if baseline.get("model") != current.get("model"):
+        logger.warning(
+            f"Baseline used model {baseline.get('model')}, "
+            f"this run {current.get('model')}"
+        )
+
+    baseline_cases = {case["name"]: case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in current.get("cases", []):
+        old_case = baseline_cases.get(case["name"])
+        if old_case is None:
+            continue
+        old_metrics = _metrics(old_case)
+        for metric, (value, floor) in _metrics(case).items():
+            old_value = old_metrics.get(metric, (None, floor))[0]
+            if value is None or old_value is None:
+                continue
+            if value - old_value > floor and value > old_value * (1 + tolerance):
+                regressions.append(Regression(case["name"], metric, old_value, value))
+    return regressions
+
+
+def _parse_snrs(spec: str) -> List[Optional[float]]:
+    snrs: List[Optional[float]] = []
+    for part in filter(None, (p.strip().lower() for p in spec.split(","))):
+        snrs.append(None if part == "clean" else float(part))
+    return snrs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xscribe-benchmark",
+        description=(
+            "Time the transcription pipeline on synthetic audio (and optionally "
+            "the test fixtures) with each stage toggled, and compare against a "
+            "stored baseline."
+        ),
+    )
+    parser.add_argument("inputs", nargs="*", help="Extra audio/video files to time")
+    parser.add_argument("-m", "--model", default="base", choices=MODEL_SIZES)
+    parser.add_argument(
+        "--durations",
+        default="30,120",
+        help="Synthetic audio lengths in seconds, comma-separated; '' for none",
+    )
+    parser.add_argument(
+        "--noise",
+        default="clean,10",
+        help="Synthetic noise levels: 'clean' or an SNR in dB, comma-separated",
+    )
+    parser.add_argument(
+        "--fixtures", action="store_true", help="Also time media in tests/fixtures"
+    )
+    parser.add_argument(
+        "--configs",
+        default=",".join(DEFAULT_CONFIGS),
+        help=f"Stage configurations to run (from {', '.join(CONFIGS)})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case")
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Skip the extra tracemalloc run per case",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Write the JSON report here (default stdout)"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="Flag metrics that regressed against this earlier report",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative slowdown allowed before a metric is flagged (default 0.15)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log pipeline details to stderr"
+    )
+    return parser
+
+
+def run(args: argparse.Namespace, stdout: TextIO) -> int:
+    try:
+        configs = [
+            CONFIGS[name.strip()] for name in args.configs.split(",") if name.strip()
+        ]
+        durations = [float(d) for d in args.durations.split(",") if d.strip()]
+        snrs = _parse_snrs(args.noise) or [None]
+    except (KeyError, ValueError) as e:
+        print(f"Invalid benchmark setting: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Cannot read baseline {args.compare}: {e}", file=sys.stderr)
+            return EXIT_USAGE
+
+    with tempfile.TemporaryDirectory(prefix="xscribe-bench-") as tmp:
+        inputs = synthetic_inputs(durations, snrs, Path(tmp))
+        if args.fixtures:
+            inputs += fixture_inputs()
+        inputs += [
+            BenchmarkInput(f"input-{path.name}", path)
+            for path in collect_inputs(args.inputs)
+        ]
+        if not inputs or not configs:
+            print("Nothing to benchmark", file=sys.stderr)
+            return EXIT_USAGE
+
+        report = run_benchmark(
+            inputs,
+            configs,
+            args.model,
+            args.repeat,
+            args.warmup,
+            not args.no_allocations,
+        )
+
+    exit_code = EXIT_OK
+    if baseline is not None:
+        regressions = compare(baseline, report, args.tolerance)
+        report["regressions"] = [
+            {**asdict(r), "change": round(r.change, 4)} for r in regressions
+        ]
+        for r in regressions:
+            print(
+                f"REGRESSION {r.case} {r.metric}: {r.baseline:g} -> {r.current:g} "
+                f"(+{r.change:.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            exit_code = EXIT_REGRESSION
+        else:
+            print("No regressions against baseline", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        stdout.write(text + "\n")
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    # The pipeline prints diagnostics; keep stdout for the report
+    stdout = sys.stdout
+    with redirect_stdout(sys.stderr):
+        return run(args, stdout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,603 @@
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+from src.core.audio_processor import AudioProcessor
+from src.core.batch_pipeline import PipelinedBatchExecutor, parse_stage_spec
+from src.core.batch_scheduler import (
+    POLICIES,
+    BatchScheduler,
+    default_policy,
+    match_deadlines,
+    parse_deadline_rules,
+)
+from src.core.filename_utils import create_safe_output_path
+from src.core.tracing import TRACE_ENV_VAR, get_tracer, span
+from src.core.transcription_service import EnhancedTranscriptionService
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("txt", "srt", "vtt", "json")
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large")
+
+EXIT_OK = 0
+EXIT_FAILED_FILES = 1
+EXIT_USAGE = 2
+
+Emit = Callable[[Dict[str, Any]], None]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xscribe-cli",
+        description="Transcribe audio and video files without the GUI.",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="Audio/video files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        help="Where to write results (default: next to each input file)",
+    )
+    parser.add_argument(
+        "-f",
+        "--formats",
+        default="txt",
+        help=f"Comma-separated output formats: {', '.join(OUTPUT_FORMATS)}",
+    )
+    parser.add_argument("-m", "--model", default="base", choices=MODEL_SIZES)
+    parser.add_argument(
+        "-l", "--language", default="auto", help="Language code or 'auto'"
+    )
+    parser.add_argument("--domain", help="Domain prompt, e.g. medical or meeting")
+    parser.add_argument(
+        "--no-enhance",
+        action="store_true",
+        help="Skip audio enhancement and text post-processing",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Let the optimizer pick the model and decoding profile per file",
+    )
+    parser.add_argument(
+        "--priority",
+        default="balanced",
+        choices=("speed", "balanced", "accuracy"),
+        help="Accuracy priority used with --optimize",
+    )
+    parser.add_argument(
+        "--speakers", action="store_true", help="Label speakers (diarization)"
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Send only detected speech to the model; long silences are skipped",
+    )
+    parser.add_argument(
+        "--checkpoints",
+        action="store_true",
+        help="Checkpoint long files window by window so a rerun resumes them",
+    )
+    parser.add_argument(
+        "--predetect-language",
+        action="store_true",
+        help="With -l auto, detect each file's language once with the tiny model",
+    )
+    parser.add_argument("--device", help="Torch device, e.g. cpu or cuda")
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16", "int8"))
+    parser.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help="Stream long files window by window to keep memory flat",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes, each holding its own model (default: 1)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        nargs="?",
+        const="",
+        metavar="STAGES",
+        help=(
+            "With one worker, overlap decoding/enhancement of the next files with "
+            "inference. Optional tuning, e.g. 'enhance=3,infer=1:4' "
+            "(stage=workers[:queue depth]; stages: decode, enhance, infer, finalize)"
+        ),
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=POLICIES,
+        help=(
+            "Processing order: shortest_first gets many short files done early, "
+            "longest_first packs parallel workers best, fifo keeps input order, "
+            "earliest_deadline follows --deadline (default: earliest_deadline "
+            "when any --deadline is given, else shortest_first)"
+        ),
+    )
+    parser.add_argument(
+        "--deadline",
+        action="append",
+        default=[],
+        metavar="PATTERN=WHEN",
+        help=(
+            "Due time for files matching a glob, e.g. 'calls/*.mp3=2h' or "
+            "'urgent.wav=2026-10-16T17:00' (repeatable)"
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        default=os.environ.get(TRACE_ENV_VAR),
+        help=(
+            "Write a Chrome trace (chrome://tracing, Perfetto) of every stage "
+            f"(default: ${TRACE_ENV_VAR})"
+        ),
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="Recurse into directories"
+    )
+    parser.add_argument(
+        "--progress-log",
+        default="-",
+        help="JSON-lines progress log path, or '-' for stdout (default)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log pipeline details to stderr"
+    )
+    return parser
+
+
+def collect_inputs(patterns: List[str], recursive: bool = False) -> List[Path]:
+    processor = AudioProcessor()
+    supported = processor.supported_formats | processor.supported_video_formats
+
+    files: List[Path] = []
+    for pattern in patterns:
+        path = Path(pattern).expanduser()
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.iterdir()
+            files.extend(sorted(p for p in candidates if p.suffix.lower() in supported))
+        elif path.exists():
+            files.append(path)
+        else:
+            # Explicit files are kept even if unsupported so they are reported
+            # as failures; glob matches are filtered to supported formats
+            matches = glob.glob(str(path), recursive=True)
+            files.extend(
+                sorted(Path(m) for m in matches if Path(m).suffix.lower() in supported)
+            )
+
+    unique: Dict[Path, None] = {}
+    for file_path in files:
+        unique.setdefault(file_path.resolve(), None)
+    return list(unique)
+
+
+def service_options(args: argparse.Namespace) -> Dict[str, Any]:
+    # Only subtitles use word timing, so other formats skip it while decoding
+    subtitles = {"srt", "vtt"} & {f.strip().lower() for f in args.formats.split(",")}
+    return {
+        "model_size": args.model,
+        "device": args.device,
+        "enable_model_optimization": args.optimize,
+        "enable_audio_enhancement": not args.no_enhance,
+        "enable_speaker_detection": args.speakers,
+        "enable_vad": args.vad,
+        "enable_checkpoints": args.checkpoints,
+        "enable_language_predetection": args.predetect_language,
+        "precision": args.precision,
+        "bounded_memory": args.bounded_memory,
+        "word_timestamps": bool(subtitles),
+    }
+
+
+def transcribe_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "language": None if args.language == "auto" else args.language,
+        "domain": args.domain,
+        "accuracy_priority": args.priority,
+        "enable_enhancements": not args.no_enhance,
+    }
+
+
+def render_output(service: EnhancedTranscriptionService, result: Any, fmt: str) -> str:
+    if fmt == "txt":
+        return result.full_text + "\n"
+    if fmt == "json":
+        return json.dumps(result.to_dict(), indent=2, ensure_ascii=False, default=str)
+    if fmt in ("srt", "vtt"):
+        return service.generate_subtitles(result, fmt)
+    raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def write_outputs(
+    service: EnhancedTranscriptionService,
+    result: Any,
+    file_path: Path,
+    formats: List[str],
+    output_dir: Optional[Path],
+) -> List[str]:
+    base_dir = output_dir or file_path.parent
+    base_dir.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for fmt in formats:
+        with span("export", format=fmt, file=file_path.name):
+            content = render_output(service, result, fmt)
+
+            # Subtitles keep the media file's stem so players pick them up
+            suffix = "" if fmt in ("srt", "vtt") else "_transcript"
+            output_path = create_safe_output_path(
+                base_dir, str(file_path), suffix, f".{fmt}"
+            )
+            output_path.write_text(content, encoding="utf-8")
+        written.append(str(output_path))
+    return written
+
+
+def file_outcome(result: Any, outputs: List[str]) -> Dict[str, Any]:
+    return {
+        "outputs": outputs,
+        "language": result.language,
+        "duration": result.duration,
+        "processing_time": result.processing_time,
+        "cache_hit": bool(result.metadata.get("cache_hit")),
+        "timings": result.metadata.get("timings", {}),
+    }
+
+
+def process_file(
+    service: EnhancedTranscriptionService,
+    index: int,
+    file_path: Path,
+    options: Dict[str, Any],
+    formats: List[str],
+    output_dir: Optional[Path],
+    emit: Emit,
+) -> Dict[str, Any]:
+    emit({"event": "file_started", "index": index, "file": str(file_path)})
+    service.progress_callback = lambda message, progress: emit(
+        {
+            "event": "progress",
+            "index": index,
+            "file": str(file_path),
+            "message": message,
+            "progress": round(float(progress), 1),
+        }
+    )
+    try:
+        result = service.transcribe_file(file_path, **options)
+        outputs = write_outputs(service, result, file_path, formats, output_dir)
+    finally:
+        service.progress_callback = None
+
+    return file_outcome(result, outputs)
+
+
+# Worker-process state: one service (and so one resident model) per process
+_worker_service: Optional[EnhancedTranscriptionService] = None
+_worker_queue: Any = None
+
+
+def _init_worker(
+    options: Dict[str, Any], queue: Any, verbose: bool, trace: bool
+) -> None:
+    global _worker_service, _worker_queue
+
+    # The pipeline prints diagnostics; keep stdout free for the progress log
+    sys.stdout = sys.stderr
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING)
+    get_tracer().enabled = trace
+    _worker_service = EnhancedTranscriptionService(**options)
+    _worker_queue = queue
+
+
+def _worker_process_file(
+    index: int,
+    file_path: Path,
+    options: Dict[str, Any],
+    formats: List[str],
+    output_dir: Optional[Path],
+) -> Dict[str, Any]:
+    outcome = process_file(
+        _worker_service,
+        index,
+        file_path,
+        options,
+        formats,
+        output_dir,
+        _worker_queue.put,
+    )
+    tracer = get_tracer()
+    if tracer.enabled:
+        # The parent merges these into its own trace
+        outcome["trace_events"] = tracer.drain()
+    return outcome
+
+
+class ProgressLog:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        event = {"time": round(time.time(), 3), **event}
+        with self._lock:
+            self.stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+
+def _error_message(error: BaseException) -> str:
+    if isinstance(error, FileNotFoundError):
+        return f"File not found: {error}"
+    if isinstance(error, ValueError):
+        return f"Invalid file: {error}"
+    return str(error) or type(error).__name__
+
+
+def run(args: argparse.Namespace, log: ProgressLog) -> int:
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        print(f"Unsupported output format(s): {', '.join(unknown)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    stages = None
+    try:
+        if args.pipeline is not None:
+            stages = parse_stage_spec(args.pipeline)
+        deadline_rules = parse_deadline_rules(args.deadline)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+
+    files = collect_inputs(args.inputs, args.recursive)
+    if not files:
+        print("No supported audio or video files found", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.trace:
+        get_tracer().enabled = True
+
+    workers = max(1, min(args.workers, len(files)))
+    options = transcribe_options(args)
+    start_time = time.time()
+
+    # Jobs keep their input index for the log but run in scheduled order
+    deadlines = match_deadlines(files, deadline_rules)
+    policy = args.schedule or default_policy(bool(deadlines))
+    scheduler = BatchScheduler(policy, args.model, workers)
+    schedule = scheduler.schedule(files, deadlines)
+    jobs = [(item.index, item.file_path) for item in schedule]
+    remaining = {item.index: item for item in schedule}
+    log.emit(
+        {
+            "event": "start",
+            "files": len(files),
+            "workers": workers,
+            "schedule": policy,
+            "eta_seconds": round(scheduler.remaining_seconds(schedule), 1),
+        }
+    )
+
+    completed: List[str] = []
+    failed: Dict[str, str] = {}
+    done_lock = threading.Lock()
+
+    def on_done(index: int, file_path: Path, outcome: Any) -> None:
+        with done_lock:
+            remaining.pop(index, None)
+            if not isinstance(outcome, BaseException):
+                scheduler.record_result(outcome)
+            eta = round(scheduler.remaining_seconds(list(remaining.values())), 1)
+
+        if isinstance(outcome, BaseException):
+            failed[str(file_path)] = _error_message(outcome)
+            log.emit(
+                {
+                    "event": "file_failed",
+                    "index": index,
+                    "file": str(file_path),
+                    "error": failed[str(file_path)],
+                    "eta_seconds": eta,
+                }
+            )
+        else:
+            completed.append(str(file_path))
+            log.emit(
+                {
+                    "event": "file_completed",
+                    "index": index,
+                    "file": str(file_path),
+                    **outcome,
+                    "eta_seconds": eta,
+                }
+            )
+
+    if workers == 1 and stages is not None:
+        _run_pipelined(jobs, stages, args, options, formats, log, on_done)
+    elif workers == 1:
+        service = EnhancedTranscriptionService(**service_options(args))
+        try:
+            for index, file_path in jobs:
+                try:
+                    outcome = process_file(
+                        service,
+                        index,
+                        file_path,
+                        options,
+                        formats,
+                        args.output_dir,
+                        log.emit,
+                    )
+                except Exception as e:
+                    outcome = e
+                on_done(index, file_path, outcome)
+        finally:
+            service.cleanup()
+    else:
+        _run_pool(jobs, workers, args, options, formats, log, on_done)
+
+    log.emit(
+        {
+            "event": "done",
+            "completed": len(completed),
+            "failed": sorted(failed),
+            "elapsed": round(time.time() - start_time, 3),
+        }
+    )
+    if args.trace:
+        get_tracer().export_chrome_trace(args.trace)
+
+    if failed:
+        print(f"{len(failed)} of {len(files)} files failed:", file=sys.stderr)
+        for file_path, error in sorted(failed.items()):
+            print(f"  {file_path}: {error}", file=sys.stderr)
+        return EXIT_FAILED_FILES
+    return EXIT_OK
+
+
+def _run_pipelined(
+    jobs: List[Tuple[int, Path]],
+    stages: Dict[str, Any],
+    args: argparse.Namespace,
+    options: Dict[str, Any],
+    formats: List[str],
+    log: ProgressLog,
+    on_done: Callable[[int, Path, Any], None],
+) -> None:
+    executor = PipelinedBatchExecutor(
+        stages=stages,
+        service_factory=EnhancedTranscriptionService,
+        **service_options(args),
+    )
+
+    # The executor numbers files by their position in jobs
+    def export(service: EnhancedTranscriptionService, position: int, result: Any):
+        file_path = jobs[position][1]
+        return write_outputs(service, result, file_path, formats, args.output_dir)
+
+    def completed(position: int, result: Any, outputs: List[str]) -> None:
+        on_done(*jobs[position], file_outcome(result, outputs))
+
+    executor.run(
+        [file_path for _, file_path in jobs],
+        on_started=lambda position, file_path: log.emit(
+            {
+                "event": "file_started",
+                "index": jobs[position][0],
+                "file": str(file_path),
+            }
+        ),
+        on_progress=lambda position, message, progress: log.emit(
+            {
+                "event": "progress",
+                "index": jobs[position][0],
+                "file": str(jobs[position][1]),
+                "message": message,
+                "progress": round(float(progress), 1),
+            }
+        ),
+        on_completed=completed,
+        on_failed=lambda position, error: on_done(*jobs[position], error),
+        export=export,
+        **options,
+    )
+
+
+def _run_pool(
+    jobs: List[Tuple[int, Path]],
+    workers: int,
+    args: argparse.Namespace,
+    options: Dict[str, Any],
+    formats: List[str],
+    log: ProgressLog,
+    on_done: Callable[[int, Path, Any], None],
+) -> None:
+    # spawn rather than fork: torch's thread pools do not survive a fork
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    def drain() -> None:
+        while True:
+            event = queue.get()
+            if event is None:
+                return
+            log.emit(event)
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(
+                service_options(args),
+                queue,
+                args.verbose,
+                bool(args.trace),
+            ),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _worker_process_file,
+                    index,
+                    file_path,
+                    options,
+                    formats,
+                    args.output_dir,
+                ): (index, file_path)
+                for index, file_path in jobs
+            }
+            for future in as_completed(futures):
+                index, file_path = futures[future]
+                try:
+                    outcome = future.result()
+                    get_tracer().extend(outcome.pop("trace_events", []))
+                except Exception as e:
+                    outcome = e
+                on_done(index, file_path, outcome)
+    finally:
+        queue.put(None)
+        drainer.join(timeout=5)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    if args.progress_log == "-":
+        log = ProgressLog(sys.stdout)
+        # The pipeline prints diagnostics; keep stdout for the progress log
+        with redirect_stdout(sys.stderr):
+            return run(args, log)
+
+    with open(args.progress_log, "a", encoding="utf-8") as stream:
+        return run(args, ProgressLog(stream))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
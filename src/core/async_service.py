@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple, Union
+
+from ..models.transcription_result import TranscriptionResult
+from .audio_processor import AudioProcessor
+from .transcription_service import (
+    EnhancedTranscriptionService,
+    TranscriptionCancelled,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+AUX_WORKERS = 2
+PROGRESS_QUEUE_SIZE = 256
+
+
+@dataclass
+class ProgressEvent:
+    message: str
+    progress: float
+
+
+class TranscriptionJob:
+    def __init__(self, file_path: Path, loop: asyncio.AbstractEventLoop):
+        self.file_path = file_path
+        self._loop = loop
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_QUEUE_SIZE)
+        self._cancelled = threading.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def __await__(self):
+        return self.task.__await__()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop the job at its next checkpoint.
+
+        A running job stops before its next model call (each chunk, window
+        or re-decoded span) or at its next progress report, whichever comes
+        first. A call already inside the model runs to completion; a file
+        decoded in one pass therefore only stops once that pass is done.
+        """
+        self._cancelled.set()
+        if self.task is not None:
+            self.task.cancel()
+
+    async def progress(self) -> AsyncIterator[ProgressEvent]:
+        # Ends once the job has finished, failed or been cancelled
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def _report(self, message: str, progress: float) -> None:
+        # Runs on the worker thread in place of progress_callback; the
+        # service reports at every stage, which is another place a cancelled
+        # job stops
+        if self._cancelled.is_set():
+            raise TranscriptionCancelled(f"{self.file_path.name} was cancelled")
+        self._loop.call_soon_threadsafe(self._put, ProgressEvent(message, progress))
+
+    def _put(self, event: Optional[ProgressEvent]) -> None:
+        # Progress is advisory: a slow consumer loses the oldest events rather
+        # than stalling the job
+        if self._events.full():
+            self._events.get_nowait()
+        self._events.put_nowait(event)
+
+
+class AsyncTranscriptionService:
+    def __init__(
+        self,
+        max_concurrent_jobs: int = DEFAULT_MAX_CONCURRENT_JOBS,
+        service_factory: Optional[Callable[..., EnhancedTranscriptionService]] = None,
+        **service_options: Any,
+    ):
+        # Each job gets its own service instance (they are not thread-safe);
+        # models are still shared through the process-wide registry
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.service_factory = service_factory or EnhancedTranscriptionService
+        self.service_options = service_options
+
+        self._slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs, thread_name_prefix="xscribe-job"
+        )
+        self._aux_executor = ThreadPoolExecutor(
+            max_workers=AUX_WORKERS, thread_name_prefix="xscribe-aux"
+        )
+        self._audio_processor = AudioProcessor()
+
+    async def __aenter__(self) -> "AsyncTranscriptionService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def submit(
+        self,
+        file_path: Union[str, Path],
+        language: Optional[str] = None,
+        domain: Optional[str] = None,
+        accuracy_priority: str = "balanced",
+        enable_enhancements: bool = True,
+    ) -> TranscriptionJob:
+        # Must be called from a running event loop. Jobs beyond
+        # max_concurrent_jobs wait for a slot before any work starts
+        loop = asyncio.get_running_loop()
+        job = TranscriptionJob(Path(file_path), loop)
+        options = {
+            "language": language,
+            "domain": domain,
+            "accuracy_priority": accuracy_priority,
+            "enable_enhancements": enable_enhancements,
+        }
+        job.task = loop.create_task(self._run_job(job, options))
+        return job
+
+    async def transcribe_file(
+        self,
+        file_path: Union[str, Path],
+        language: Optional[str] = None,
+        domain: Optional[str] = None,
+        accuracy_priority: str = "balanced",
+        enable_enhancements: bool = True,
+    ) -> TranscriptionResult:
+        job = self.submit(
+            file_path, language, domain, accuracy_priority, enable_enhancements
+        )
+        try:
+            return await job
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    async def generate_subtitles(
+        self, transcription_result: TranscriptionResult, format: str = "srt"
+    ) -> str:
+        # Word alignment needs the model, so this runs on a job slot
+        async with self._slots:
+            return await self._run_cancellable(
+                self._executor, self._generate_subtitles, transcription_result, format
+            )
+
+    async def validate_file(self, file_path: Union[str, Path]) -> Tuple[bool, str]:
+        return await self._run_cancellable(
+            self._aux_executor, self._audio_processor.validate_audio_file, file_path
+        )
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        await loop.run_in_executor(None, self._aux_executor.shutdown)
+
+    async def _run_job(
+        self, job: TranscriptionJob, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        try:
+            async with self._slots:
+                if job.cancelled:
+                    raise asyncio.CancelledError()
+                return await self._run_cancellable(
+                    self._executor, self._transcribe, job, options, job=job
+                )
+        finally:
+            job._put(None)
+
+    async def _run_cancellable(
+        self,
+        executor: ThreadPoolExecutor,
+        func: Callable,
+        *args: Any,
+        job: Optional[TranscriptionJob] = None,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # A thread cannot be interrupted; flag the job and keep its slot
+            # until the worker notices, so cancelled work never over-commits
+            if job is not None:
+                job._cancelled.set()
+            try:
+                await future
+            except Exception:
+                pass
+            raise
+
+    def _transcribe(
+        self, job: TranscriptionJob, options: Dict[str, Any]
+    ) -> TranscriptionResult:
+        service = self.service_factory(
+            **self.service_options,
+            progress_callback=job._report,
+            cancel_event=job._cancelled,
+        )
+        try:
+            return service.transcribe_file(job.file_path, **options)
+        except RuntimeError as e:
+            if job.cancelled:
+                raise TranscriptionCancelled(str(e)) from e
+            raise
+        finally:
+            service.cleanup()
+
+    def _generate_subtitles(
+        self, transcription_result: TranscriptionResult, format: str
+    ) -> str:
+        service = self.service_factory(**self.service_options)
+        try:
+            return service.generate_subtitles(transcription_result, format)
+        finally:
+            service.cleanup()
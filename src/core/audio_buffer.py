@@ -0,0 +1,103 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # Whisper's native input rate
+
+
+@dataclass
+class AudioBuffer:
+    samples: np.ndarray
+    sample_rate: int = SAMPLE_RATE
+    source_path: Optional[Path] = None
+    source_size: int = 0
+    source_mtime: float = 0.0
+    is_video: bool = False
+    # Rate of the source before resampling to 16 kHz, when it is known
+    native_sample_rate: Optional[int] = None
+
+    def __post_init__(self):
+        if self.sample_rate != SAMPLE_RATE:
+            raise ValueError(f"AudioBuffer must be {SAMPLE_RATE} Hz")
+
+        samples = np.asarray(self.samples)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=0)
+        if samples.dtype != np.float32:
+            samples = samples.astype(np.float32)
+        self.samples = np.ascontiguousarray(samples)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.samples)
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    def slice(self, start: float, end: Optional[float] = None) -> np.ndarray:
+        start_sample = max(0, int(start * self.sample_rate))
+        end_sample = len(self.samples) if end is None else int(end * self.sample_rate)
+        return self.samples[start_sample:end_sample]
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path]) -> "AudioBuffer":
+        import whisper
+
+        file_path = Path(file_path)
+        stat = file_path.stat()
+
+        logger.info(f"🎧 Decoding audio once: {file_path.name}")
+        samples = whisper.load_audio(str(file_path))
+
+        from .audio_processor import AudioProcessor
+
+        return cls(
+            samples=samples,
+            source_path=file_path,
+            source_size=stat.st_size,
+            source_mtime=stat.st_mtime,
+            is_video=AudioProcessor().is_video_file(str(file_path)),
+            native_sample_rate=_header_sample_rate(file_path),
+        )
+
+    @classmethod
+    def from_array(
+        cls,
+        samples: np.ndarray,
+        sample_rate: int = SAMPLE_RATE,
+        source_path: Optional[Union[str, Path]] = None,
+    ) -> "AudioBuffer":
+        if sample_rate != SAMPLE_RATE:
+            import librosa
+
+            samples = librosa.resample(
+                np.asarray(samples, dtype=np.float32),
+                orig_sr=sample_rate,
+                target_sr=SAMPLE_RATE,
+            )
+
+        return cls(
+            samples=samples,
+            source_path=Path(source_path) if source_path else None,
+            native_sample_rate=sample_rate,
+        )
+
+
+def _header_sample_rate(file_path: Path) -> Optional[int]:
+    # Header only; formats libsndfile cannot read (e.g. video) stay unknown
+    try:
+        import soundfile
+
+        return soundfile.info(str(file_path)).samplerate or None
+    except Exception:
+        return None
@@ -1,6 +1,6 @@
 import logging
 import warnings
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
 
 import librosa
 import noisereduce as nr
@@ -8,6 +8,9 @@ import numpy as np
 import scipy.ndimage
 import scipy.signal
 
+from .audio_buffer import AudioBuffer
+from .tracing import span
+
 # Suppress librosa warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="librosa")
 
@@ -19,9 +22,14 @@ class AudioEnhancer:
         self.target_sr = target_sr
         self.logger = logging.getLogger(__name__)
 
-    def analyze_audio_quality(self, audio_path: str) -> Dict[str, Any]:
+    def _load(self, audio: Union[str, AudioBuffer], sr) -> Tuple[np.ndarray, int]:
+        if isinstance(audio, AudioBuffer):
+            return audio.samples, audio.sample_rate
+        return librosa.load(audio, sr=sr)
+
+    def analyze_audio_quality(self, audio: Union[str, AudioBuffer]) -> Dict[str, Any]:
         try:
-            y, sr = librosa.load(audio_path, sr=None)
+            y, sr = self._load(audio, sr=None)
 
             if len(y) == 0:
                 return {
@@ -99,10 +107,18 @@ class AudioEnhancer:
                     "Audio may benefit from high-frequency enhancement"
                 )
 
+            # A shared buffer is analysed at 16 kHz, so the centroid and
+            # clipping thresholds above see at most 8 kHz of bandwidth; the
+            # source's own rate is what gets reported as sample_rate
+            native_sr = sr
+            if isinstance(audio, AudioBuffer) and audio.native_sample_rate:
+                native_sr = audio.native_sample_rate
+
             return {
                 "quality_score": float(quality_score),
                 "duration": float(duration),
-                "sample_rate": int(sr),
+                "sample_rate": int(native_sr),
+                "analysis_sample_rate": int(sr),
                 "snr_estimate": float(snr_estimate)
                 if not np.isnan(snr_estimate)
                 else 0.0,
@@ -125,25 +141,37 @@ class AudioEnhancer:
 
     def enhance_audio(
         self,
-        audio_path: str,
+        audio: Union[str, AudioBuffer],
         enable_noise_reduction: bool = True,
         enable_speech_enhancement: bool = True,
         enable_normalization: bool = True,
         noise_reduction_strength: float = 0.5,
         target_lufs: float = -23.0,
+        trim_silence: bool = True,
     ) -> Tuple[np.ndarray, int]:
         try:
-            logger.info(f"🎵 Loading audio: {audio_path}")
+            if isinstance(audio, AudioBuffer):
+                logger.info("🎵 Using shared decoded audio buffer")
+            else:
+                logger.info(f"🎵 Loading audio: {audio}")
 
-            y, sr = librosa.load(audio_path, sr=self.target_sr)
+            y, sr = self._load(audio, sr=self.target_sr)
             original_length = len(y)
 
             logger.info(f"📊 Original: {sr}Hz, {len(y)} samples ({len(y) / sr:.2f}s)")
 
             y = y - np.mean(y)
 
-            y_trimmed, trim_indices = librosa.effects.trim(y, top_db=30)
-            logger.info(f"✂️ Trimmed {original_length - len(y_trimmed)} silent samples")
+            # Trimming shifts the timeline, so callers that map timestamps
+            # back to the original (the VAD stage) keep the full length
+            if trim_silence:
+                with span("enhancement.trim"):
+                    y_trimmed, trim_indices = librosa.effects.trim(y, top_db=30)
+                logger.info(
+                    f"✂️ Trimmed {original_length - len(y_trimmed)} silent samples"
+                )
+            else:
+                y_trimmed = y
 
             if enable_noise_reduction and len(y_trimmed) > 0:
                 logger.info(
@@ -152,25 +180,29 @@ class AudioEnhancer:
 
                 try:
                     # Use noisereduce library for spectral noise reduction
-                    y_denoised = nr.reduce_noise(
-                        y=y_trimmed,
-                        sr=self.target_sr,
-                        prop_decrease=noise_reduction_strength,
-                        stationary=False,  # Non-stationary noise reduction
-                    )
+                    with span("enhancement.noise_reduction"):
+                        y_denoised = nr.reduce_noise(
+                            y=y_trimmed,
+                            sr=self.target_sr,
+                            prop_decrease=noise_reduction_strength,
+                            stationary=False,  # Non-stationary noise reduction
+                        )
                     y_trimmed = y_denoised
                 except Exception as e:
                     logger.warning(f"Noise reduction failed: {e}, continuing without")
 
             if enable_speech_enhancement:
                 logger.info("🗣️ Applying speech enhancement")
-                y_trimmed = self._apply_speech_filter(y_trimmed, self.target_sr)
+                with span("enhancement.speech_filter"):
+                    y_trimmed = self._apply_speech_filter(y_trimmed, self.target_sr)
 
-            y_trimmed = self._apply_compression(y_trimmed)
+            with span("enhancement.compression"):
+                y_trimmed = self._apply_compression(y_trimmed)
 
             if enable_normalization:
                 logger.info(f"📈 Normalizing to {target_lufs} LUFS")
-                y_trimmed = self._normalize_audio(y_trimmed, target_lufs)
+                with span("enhancement.normalization"):
+                    y_trimmed = self._normalize_audio(y_trimmed, target_lufs)
 
             final_rms = np.sqrt(np.mean(y_trimmed**2))
             logger.info(
@@ -182,9 +214,77 @@ class AudioEnhancer:
         except Exception as e:
             logger.error(f"Audio enhancement failed: {e}")
             # Return original audio as fallback
-            y_fallback, sr_fallback = librosa.load(audio_path, sr=self.target_sr)
+            y_fallback, sr_fallback = self._load(audio, sr=self.target_sr)
             return y_fallback, sr_fallback
 
+    def enhance_stream(
+        self,
+        blocks: Iterable[np.ndarray],
+        enable_noise_reduction: bool = True,
+        enable_speech_enhancement: bool = True,
+        enable_normalization: bool = True,
+        noise_reduction_strength: float = 0.5,
+        target_lufs: float = -23.0,
+    ) -> Iterator[np.ndarray]:
+        # Block-by-block variant of enhance_audio for inputs too long to hold
+        # in memory. The band-pass runs forward only with carried filter state
+        # (filtfilt needs the whole signal), normalization follows the running
+        # RMS, and nothing is trimmed so block timing is preserved
+        sos = self._speech_filter_sos(self.target_sr).astype(np.float32)
+        zi = None
+        previous_sample = np.float32(0.0)
+        sum_squares = 0.0
+        sample_count = 0
+
+        for block in blocks:
+            y = np.asarray(block, dtype=np.float32)
+            if len(y) == 0:
+                continue
+
+            # Charged per block, without the time the consumer holds it
+            with span("enhancement"):
+                if enable_noise_reduction:
+                    try:
+                        y = nr.reduce_noise(
+                            y=y,
+                            sr=self.target_sr,
+                            prop_decrease=noise_reduction_strength,
+                            stationary=False,
+                        ).astype(np.float32)
+                    except Exception as e:
+                        logger.warning(
+                            f"Noise reduction failed: {e}, continuing without"
+                        )
+
+                if enable_speech_enhancement:
+                    if zi is None:
+                        zi = (scipy.signal.sosfilt_zi(sos) * y[0]).astype(np.float32)
+                    y, zi = scipy.signal.sosfilt(sos, y, zi=zi)
+                    emphasized = np.empty_like(y)
+                    emphasized[0] = y[0] - 0.95 * previous_sample
+                    emphasized[1:] = y[1:] - 0.95 * y[:-1]
+                    previous_sample = y[-1]
+                    y = emphasized
+
+                y = self._apply_compression(y)
+
+                if enable_normalization:
+                    sum_squares += float(np.dot(y, y))
+                    sample_count += len(y)
+                    running_rms = np.sqrt(sum_squares / sample_count)
+                    if running_rms > 0:
+                        gain = 10 ** (target_lufs / 20.0) / running_rms
+                        y = np.tanh(y * gain * 0.95)
+
+            yield y.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _speech_filter_sos(sr: int) -> np.ndarray:
+        nyquist = sr // 2
+        low_freq = max(0.001, min(80 / nyquist, 0.99))
+        high_freq = max(low_freq + 0.001, min(8000 / nyquist, 0.99))
+        return scipy.signal.butter(4, [low_freq, high_freq], btype="band", output="sos")
+
     def _apply_speech_filter(self, y: np.ndarray, sr: int) -> np.ndarray:
         try:
             nyquist = sr // 2
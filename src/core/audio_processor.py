@@ -1,9 +1,14 @@
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .audio_buffer import AudioBuffer
 
 logger = logging.getLogger(__name__)
 
+MAX_DURATION_SECONDS = 14400  # 4 hours
+
 
 class AudioProcessor:
     def __init__(self):
@@ -83,68 +88,24 @@ class AudioProcessor:
 
         return str(file_path), None
 
-    def validate_audio_file(self, file_path: str) -> Tuple[bool, str]:
+    def validate_audio_file(
+        self, file_path: str, audio_buffer: Optional["AudioBuffer"] = None
+    ) -> Tuple[bool, str]:
         try:
-            file_path_obj = Path(file_path)
-
-            if not file_path_obj.exists():
-                return False, f"File not found: {file_path}"
-
-            if not file_path_obj.is_file():
-                return False, f"Not a file: {file_path}"
-
-            suffix = file_path_obj.suffix.lower()
-            is_audio = suffix in self.supported_formats
-            is_video = suffix in self.supported_video_formats
-
-            if not (is_audio or is_video):
-                return False, f"Unsupported format: {suffix}"
-
-            file_size = file_path_obj.stat().st_size
-
-            if file_size < 1024:  # Less than 1KB is likely corrupt/empty
-                return (
-                    False,
-                    f"File too small ({file_size} bytes) - possibly empty or corrupt",
-                )
-
-            size_mb = file_size / (1024 * 1024)
-            if size_mb > 10240:  # 10GB
-                return False, f"File too large: {size_mb:.1f}MB (max 10GB)"
+            is_valid, message = self.validate_file_properties(file_path)
+            if not is_valid:
+                return is_valid, message
 
             try:
-                import whisper
+                if audio_buffer is None:
+                    from .audio_buffer import AudioBuffer
 
-                audio = whisper.load_audio(str(file_path_obj))
+                    audio_buffer = AudioBuffer.from_file(Path(file_path))
 
-                if len(audio) == 0:
+                if len(audio_buffer.samples) == 0:
                     return False, "Audio file contains no data (corrupt or empty)"
 
-                duration_seconds = len(audio) / 16000
-
-                if duration_seconds < 0.1:
-                    return (
-                        False,
-                        f"Audio too short: {duration_seconds:.2f}s (minimum 0.1s)",
-                    )
-
-                max_duration = 14400  # 4 hours in seconds
-                if duration_seconds > max_duration:
-                    duration_mins = duration_seconds / 60
-                    max_mins = max_duration / 60
-                    return (
-                        False,
-                        f"Audio too long: {duration_mins:.1f} minutes (max {max_mins:.0f} minutes)",
-                    )
-
-                if duration_seconds > 1800:  # 30 minutes
-                    duration_mins = duration_seconds / 60
-                    return (
-                        True,
-                        f"LONG_FILE:{duration_mins:.1f}",
-                    )  # Special marker for confirmation dialog
-
-                return True, f"Valid audio file ({duration_seconds:.1f}s)"
+                return self.validate_duration(audio_buffer.duration)
 
             except Exception as audio_error:
                 return False, f"Corrupt or invalid audio file: {str(audio_error)}"
@@ -152,6 +113,62 @@ class AudioProcessor:
         except Exception as e:
             return False, f"Validation error: {str(e)}"
 
+    def validate_file_properties(self, file_path: str) -> Tuple[bool, str]:
+        # Checks that need no decoding, so streaming callers can run them
+        # before opening the decoder pipe
+        file_path_obj = Path(file_path)
+
+        if not file_path_obj.exists():
+            return False, f"File not found: {file_path}"
+
+        if not file_path_obj.is_file():
+            return False, f"Not a file: {file_path}"
+
+        suffix = file_path_obj.suffix.lower()
+        is_audio = suffix in self.supported_formats
+        is_video = suffix in self.supported_video_formats
+
+        if not (is_audio or is_video):
+            return False, f"Unsupported format: {suffix}"
+
+        file_size = file_path_obj.stat().st_size
+
+        if file_size < 1024:  # Less than 1KB is likely corrupt/empty
+            return (
+                False,
+                f"File too small ({file_size} bytes) - possibly empty or corrupt",
+            )
+
+        size_mb = file_size / (1024 * 1024)
+        if size_mb > 10240:  # 10GB
+            return False, f"File too large: {size_mb:.1f}MB (max 10GB)"
+
+        return True, "Valid file"
+
+    def validate_duration(self, duration_seconds: float) -> Tuple[bool, str]:
+        if duration_seconds < 0.1:
+            return (
+                False,
+                f"Audio too short: {duration_seconds:.2f}s (minimum 0.1s)",
+            )
+
+        if duration_seconds > MAX_DURATION_SECONDS:
+            duration_mins = duration_seconds / 60
+            max_mins = MAX_DURATION_SECONDS / 60
+            return (
+                False,
+                f"Audio too long: {duration_mins:.1f} minutes (max {max_mins:.0f} minutes)",
+            )
+
+        if duration_seconds > 1800:  # 30 minutes
+            duration_mins = duration_seconds / 60
+            return (
+                True,
+                f"LONG_FILE:{duration_mins:.1f}",
+            )  # Special marker for confirmation dialog
+
+        return True, f"Valid audio file ({duration_seconds:.1f}s)"
+
     def get_audio_info(self, file_path: str) -> Dict[str, any]:
         try:
             file_path_obj = Path(file_path)
@@ -0,0 +1,208 @@
+import logging
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+from .chunked_transcription import HARD_SPLIT_OVERLAP_SECONDS, AudioChunk
+from .voice_activity import find_split_points
+
+logger = logging.getLogger(__name__)
+
+# Raw PCM is pulled from the decoder in blocks of this length, and windows of
+# about STREAM_WINDOW_SECONDS are cut at silence and sent to the model. At most
+# 1.5 windows plus one block of 16 kHz float32 audio is resident at a time
+STREAM_BLOCK_SECONDS = 30.0
+STREAM_WINDOW_SECONDS = 120.0
+STREAM_SEARCH_SECONDS = 15.0
+
+
+@dataclass
+class StreamWindow:
+    chunk: AudioChunk
+    samples: np.ndarray
+    final: bool = False
+
+
+def decoder_command(
+    file_path: Union[str, Path], sample_rate: int = SAMPLE_RATE
+) -> List[str]:
+    # Same conversion whisper.load_audio runs, written to a pipe instead of
+    # being read back into one array
+    return [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-threads",
+        "0",
+        "-i",
+        str(file_path),
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    parts = []
+    while size > 0:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b"".join(parts)
+
+
+def iter_pcm_blocks(
+    stream: BinaryIO,
+    block_seconds: float = STREAM_BLOCK_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[np.ndarray]:
+    block_bytes = int(block_seconds * sample_rate) * 2
+    while True:
+        data = _read_exact(stream, block_bytes)
+        if len(data) < 2:
+            return
+        pcm = np.frombuffer(data[: len(data) // 2 * 2], dtype=np.int16)
+        yield pcm.astype(np.float32) / 32768.0
+
+
+def decode_pcm_blocks(
+    file_path: Union[str, Path],
+    block_seconds: float = STREAM_BLOCK_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[np.ndarray]:
+    try:
+        process = subprocess.Popen(
+            decoder_command(file_path, sample_rate),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found - it is required for streaming mode")
+
+    finished = False
+    try:
+        yield from iter_pcm_blocks(process.stdout, block_seconds, sample_rate)
+        finished = True
+    finally:
+        # Closing early (an error or a cancelled job) must not leave the
+        # decoder blocked on a full pipe
+        process.stdout.close()
+        if not finished and process.poll() is None:
+            process.kill()
+        stderr = process.stderr.read().decode(errors="replace").strip()
+        process.stderr.close()
+        returncode = process.wait()
+
+    if returncode != 0:
+        raise ValueError(f"Corrupt or invalid audio file: {stderr}")
+
+
+class StreamWindower:
+    def __init__(
+        self,
+        window_seconds: float = STREAM_WINDOW_SECONDS,
+        search_seconds: float = STREAM_SEARCH_SECONDS,
+        overlap_seconds: float = HARD_SPLIT_OVERLAP_SECONDS,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.window_seconds = window_seconds
+        self.search_seconds = search_seconds
+        self.sample_rate = sample_rate
+
+        self._window = int(window_seconds * sample_rate)
+        # find_split_points only places a split when the clip runs at least
+        # a quarter window past the target, so keep half a window of lookahead
+        self._lookahead = self._window + max(
+            int(search_seconds * sample_rate), self._window // 2
+        )
+        self._overlap = int(overlap_seconds * sample_rate)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_offset = 0  # sample index of _pending[0]
+        self._start = 0  # owned start of the next window
+        self._audio_start = 0  # first sample the next window decodes
+        self._index = 0
+
+    @property
+    def samples_seen(self) -> int:
+        return self._pending_offset + len(self._pending)
+
+    def push(self, block: np.ndarray) -> List[StreamWindow]:
+        self._pending = np.concatenate([self._pending, block.astype(np.float32)])
+
+        windows = []
+        while self.samples_seen - self._start >= self._lookahead:
+            windows.append(self._cut())
+        return windows
+
+    def finish(self) -> List[StreamWindow]:
+        if self.samples_seen <= self._start:
+            return []
+
+        window = self._make_window(self.samples_seen, self.samples_seen, final=True)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_offset = self.samples_seen
+        return [window]
+
+    def _cut(self) -> StreamWindow:
+        base = self._start - self._pending_offset
+        region = self._pending[base : base + self._lookahead]
+        splits = find_split_points(
+            region, self.window_seconds, self.sample_rate, self.search_seconds
+        )
+        split_seconds, is_silence = (
+            splits[0] if splits else (self.window_seconds, False)
+        )
+
+        end = self._start + int(split_seconds * self.sample_rate)
+        audio_end = end if is_silence else end + self._overlap
+        window = self._make_window(end, audio_end)
+
+        # Splitting inside speech cuts a word in half, so both neighbours
+        # decode a little past the cut and the stitcher keeps one copy
+        self._start = end
+        self._audio_start = end if is_silence else end - self._overlap
+        drop = self._audio_start - self._pending_offset
+        self._pending = self._pending[drop:].copy()
+        self._pending_offset = self._audio_start
+        return window
+
+    def _make_window(
+        self, end: int, audio_end: int, final: bool = False
+    ) -> StreamWindow:
+        sr = self.sample_rate
+        samples = self._pending[
+            self._audio_start - self._pending_offset : audio_end - self._pending_offset
+        ].copy()
+        chunk = AudioChunk(
+            index=self._index,
+            start=self._start / sr,
+            end=end / sr,
+            audio_start=self._audio_start / sr,
+            audio_end=audio_end / sr,
+        )
+        self._index += 1
+        return StreamWindow(chunk=chunk, samples=samples, final=final)
+
+
+def iter_windows(
+    blocks: Iterator[np.ndarray],
+    windower: Optional[StreamWindower] = None,
+) -> Iterator[StreamWindow]:
+    windower = windower or StreamWindower()
+    for block in blocks:
+        yield from windower.push(block)
+    yield from windower.finish()
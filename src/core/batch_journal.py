@@ -0,0 +1,218 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# File states. A file left "processing" by a crash is run again on resume;
+# its window checkpoint lets long files pick up mid-file
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Batch states
+ACTIVE = "active"
+FINISHED = "finished"
+ABANDONED = "abandoned"
+
+# Closed batches kept for inspection before they are pruned
+KEEP_CLOSED_BATCHES = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    settings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_files (
+    batch_id INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (batch_id, idx)
+);
+"""
+
+
+@dataclass
+class JournaledFile:
+    index: int
+    file_path: str
+    state: str
+    attempts: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class JournaledBatch:
+    batch_id: int
+    created_at: float
+    settings: Dict[str, Any]
+    files: List[JournaledFile] = field(default_factory=list)
+
+    @property
+    def completed(self) -> List[JournaledFile]:
+        return [f for f in self.files if f.state == COMPLETED]
+
+    @property
+    def remaining(self) -> List[JournaledFile]:
+        return [f for f in self.files if f.state in (PENDING, PROCESSING)]
+
+
+class BatchJournal:
+    # Every state change is committed before the GUI hears about it, so the
+    # journal is never behind what the user has seen
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        self.db_path = Path(
+            db_path or Path.home() / ".cache" / "xscribe" / "batch_journal.sqlite3"
+        )
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Stage threads and the pool's dispatcher all report through here
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        # A journal write that fails must not take the batch down with it;
+        # the worst case is redoing that file after a crash
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update batch journal: {e}")
+
+    def create_batch(
+        self, files: Sequence[Union[str, Path]], settings: Dict[str, Any]
+    ) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            # Only one batch is resumable at a time; starting a new one gives
+            # up on whatever was left over
+            self._conn.execute(
+                "UPDATE batches SET status = ?, updated_at = ? WHERE status = ?",
+                (ABANDONED, now, ACTIVE),
+            )
+            cursor = self._conn.execute(
+                "INSERT INTO batches (created_at, updated_at, status, settings) "
+                "VALUES (?, ?, ?, ?)",
+                (now, now, ACTIVE, json.dumps(settings, default=str)),
+            )
+            batch_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO batch_files (batch_id, idx, file_path, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (batch_id, index, str(file_path), PENDING, now)
+                    for index, file_path in enumerate(files)
+                ],
+            )
+        self._prune()
+        logger.info(f"📒 Journaled batch {batch_id} ({len(files)} files)")
+        return batch_id
+
+    def mark_processing(self, batch_id: int, index: int) -> None:
+        self._execute(
+            "UPDATE batch_files SET state = ?, attempts = attempts + 1, "
+            "updated_at = ? WHERE batch_id = ? AND idx = ?",
+            (PROCESSING, time.time(), batch_id, index),
+        )
+
+    def mark_completed(self, batch_id: int, index: int, result: Dict[str, Any]) -> None:
+        # The result itself is kept, so a resumed batch can export files it
+        # finished before the crash without transcribing them again
+        self._execute(
+            "UPDATE batch_files SET state = ?, result = ?, error = NULL, "
+            "updated_at = ? WHERE batch_id = ? AND idx = ?",
+            (COMPLETED, json.dumps(result, default=str), time.time(), batch_id, index),
+        )
+
+    def mark_failed(self, batch_id: int, index: int, error: str) -> None:
+        self._execute(
+            "UPDATE batch_files SET state = ?, error = ?, updated_at = ? "
+            "WHERE batch_id = ? AND idx = ?",
+            (FAILED, error, time.time(), batch_id, index),
+        )
+
+    def finish_batch(self, batch_id: int) -> None:
+        self._set_batch_status(batch_id, FINISHED)
+
+    def abandon_batch(self, batch_id: int) -> None:
+        self._set_batch_status(batch_id, ABANDONED)
+
+    def _set_batch_status(self, batch_id: int, status: str) -> None:
+        self._execute(
+            "UPDATE batches SET status = ?, updated_at = ? WHERE id = ?",
+            (status, time.time(), batch_id),
+        )
+
+    def unfinished_batch(self) -> Optional[JournaledBatch]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_at, settings FROM batches WHERE status = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (ACTIVE,),
+            ).fetchone()
+            if row is None:
+                return None
+            file_rows = self._conn.execute(
+                "SELECT idx, file_path, state, attempts, error, result "
+                "FROM batch_files WHERE batch_id = ? ORDER BY idx",
+                (row[0],),
+            ).fetchall()
+
+        batch = JournaledBatch(row[0], row[1], json.loads(row[2]))
+        for index, file_path, state, attempts, error, result in file_rows:
+            batch.files.append(
+                JournaledFile(
+                    index,
+                    file_path,
+                    state,
+                    attempts,
+                    error,
+                    json.loads(result) if result else None,
+                )
+            )
+
+        if not batch.remaining:
+            # Everything ran but the batch never got to say so
+            self.finish_batch(batch.batch_id)
+            return None
+        return batch
+
+    def _prune(self) -> None:
+        self._execute(
+            "DELETE FROM batches WHERE status != ? AND id NOT IN "
+            "(SELECT id FROM batches WHERE status != ? ORDER BY id DESC LIMIT ?)",
+            (ACTIVE, ACTIVE, KEEP_CLOSED_BATCHES),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_batch_journal: Optional[BatchJournal] = None
+
+
+def get_batch_journal() -> BatchJournal:
+    global _batch_journal
+    if _batch_journal is None:
+        _batch_journal = BatchJournal()
+    return _batch_journal
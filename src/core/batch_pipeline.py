@@ -0,0 +1,372 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from ..models.transcription_result import TranscriptionResult
+from .transcription_service import EnhancedTranscriptionService, TranscriptionWork
+
+logger = logging.getLogger(__name__)
+
+DECODE = "decode"
+ENHANCE = "enhance"
+INFER = "infer"
+FINALIZE = "finalize"
+STAGES = (DECODE, ENHANCE, INFER, FINALIZE)
+
+
+@dataclass
+class StageConfig:
+    workers: int = 1
+    # Files allowed to wait in front of the stage; bounds how far prep runs
+    # ahead of inference, and so how many decoded files sit in memory
+    queue_depth: int = 2
+
+
+def default_stage_configs() -> Dict[str, StageConfig]:
+    # Inference holds the model's lock, so a second infer worker only helps
+    # when stages use different models; prep is CPU-bound numpy/ffmpeg work
+    return {
+        DECODE: StageConfig(workers=1, queue_depth=2),
+        ENHANCE: StageConfig(workers=2, queue_depth=2),
+        INFER: StageConfig(workers=1, queue_depth=2),
+        FINALIZE: StageConfig(workers=1, queue_depth=2),
+    }
+
+
+def parse_stage_spec(spec: str) -> Dict[str, StageConfig]:
+    # "enhance=3,infer=1:4" -> 3 enhance workers; 1 infer worker behind a
+    # queue of 4. Stages not named keep their defaults
+    configs = default_stage_configs()
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        if name not in configs or not value:
+            raise ValueError(f"Invalid pipeline stage setting: {part!r}")
+        workers, _, depth = value.partition(":")
+        try:
+            configs[name] = StageConfig(
+                workers=int(workers),
+                queue_depth=int(depth) if depth else configs[name].queue_depth,
+            )
+        except ValueError:
+            raise ValueError(f"Invalid pipeline stage setting: {part!r}")
+        if configs[name].workers < 1 or configs[name].queue_depth < 1:
+            raise ValueError(f"Pipeline stage {name} needs at least 1 worker/slot")
+    return configs
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+
+_DONE = object()
+
+
+class PipelinedBatchExecutor:
+    def __init__(
+        self,
+        stages: Optional[Dict[str, StageConfig]] = None,
+        service_factory: Optional[Callable[..., EnhancedTranscriptionService]] = None,
+        **service_options: Any,
+    ):
+        self.stages = {**default_stage_configs(), **(stages or {})}
+        self.service_factory = service_factory or EnhancedTranscriptionService
+        self.service_options = service_options
+        # Bounded memory decodes and transcribes window by window in one
+        # call, which does not split into stages
+        self.service_options.pop("bounded_memory", None)
+
+        self.stats: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+        self._queues: Dict[str, queue.Queue] = {}
+        self._stop = threading.Event()
+        self._pause = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {name: q.qsize() for name, q in self._queues.items()}
+
+    def pause(self) -> None:
+        self._pause.set()
+
+    def resume(self) -> None:
+        self._pause.clear()
+
+    def stop(self) -> None:
+        # Files already inside the pipeline are dropped at their next stage
+        self._stop.set()
+        self._pause.clear()
+
+    def run(
+        self,
+        files: Sequence[Union[str, Path]],
+        on_started: Optional[Callable[[int, Path], None]] = None,
+        on_progress: Optional[Callable[[int, str, float], None]] = None,
+        on_completed: Optional[Callable[[int, TranscriptionResult, Any], None]] = None,
+        on_failed: Optional[Callable[[int, Exception], None]] = None,
+        export: Optional[
+            Callable[[EnhancedTranscriptionService, int, TranscriptionResult], Any]
+        ] = None,
+        **transcribe_options: Any,
+    ) -> Dict[str, StageStats]:
+        # Callbacks are called from the stage threads. export runs inside the
+        # finalize stage with that stage's service; its return value is
+        # passed to on_completed
+        self._stop.clear()
+        self.stats = {name: StageStats() for name in STAGES}
+        self._queues = {
+            name: queue.Queue(max(1, self.stages[name].queue_depth)) for name in STAGES
+        }
+        handlers = {
+            DECODE: self._decode,
+            ENHANCE: self._enhance,
+            INFER: self._infer,
+            FINALIZE: self._finalize,
+        }
+        callbacks = {
+            "started": on_started,
+            "progress": on_progress,
+            "completed": on_completed,
+            "failed": on_failed,
+            "export": export,
+        }
+
+        threads: List[threading.Thread] = []
+        remaining = {name: max(1, self.stages[name].workers) for name in STAGES}
+        remaining_lock = threading.Lock()
+
+        for position, name in enumerate(STAGES):
+            next_name = STAGES[position + 1] if position + 1 < len(STAGES) else None
+            for worker_index in range(remaining[name]):
+                thread = threading.Thread(
+                    target=self._stage_loop,
+                    args=(
+                        name,
+                        next_name,
+                        handlers[name],
+                        callbacks,
+                        remaining,
+                        remaining_lock,
+                    ),
+                    name=f"xscribe-{name}-{worker_index}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        logger.info(
+            "🏭 Batch pipeline: "
+            + ", ".join(
+                f"{name} x{self.stages[name].workers} (queue {self.stages[name].queue_depth})"
+                for name in STAGES
+            )
+        )
+
+        self._feed(files, transcribe_options)
+        for thread in threads:
+            thread.join()
+
+        for name in STAGES:
+            stats = self.stats[name]
+            logger.info(
+                f"📊 {name}: {stats.processed} files, {stats.busy_seconds:.1f}s busy, "
+                f"queue peaked at {stats.max_queue_depth}"
+            )
+        return self.stats
+
+    def _feed(
+        self,
+        files: Sequence[Union[str, Path]],
+        transcribe_options: Dict[str, Any],
+    ) -> None:
+        decode_queue = self._queues[DECODE]
+        for index, file_path in enumerate(files):
+            while self._pause.is_set() and not self._stop.is_set():
+                time.sleep(0.1)
+            if self._stop.is_set():
+                logger.info("🛑 Batch pipeline stopped")
+                break
+            work = TranscriptionWork(
+                Path(file_path),
+                transcribe_options.get("language"),
+                transcribe_options.get("domain"),
+                transcribe_options.get("accuracy_priority", "balanced"),
+                transcribe_options.get("enable_enhancements", True),
+            )
+            self._put(DECODE, (index, work))
+
+        for _ in range(max(1, self.stages[DECODE].workers)):
+            decode_queue.put(_DONE)
+
+    def _put(self, name: str, item: Any) -> None:
+        target = self._queues[name]
+        target.put(item)
+        depth = target.qsize()
+        with self._stats_lock:
+            stats = self.stats[name]
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+
+    def _stage_loop(
+        self,
+        name: str,
+        next_name: Optional[str],
+        handler: Callable[..., Optional[Any]],
+        callbacks: Dict[str, Optional[Callable]],
+        remaining: Dict[str, int],
+        remaining_lock: threading.Lock,
+    ) -> None:
+        # Each stage thread owns a service; models come from the shared
+        # registry, so this costs no extra model memory
+        incoming = self._queues[name]
+        service = None
+        try:
+            service = self.service_factory(**self.service_options)
+            while True:
+                item = incoming.get()
+                if item is _DONE:
+                    break
+                if self._stop.is_set():
+                    continue
+
+                index, work = item
+                service.progress_callback = self._progress_reporter(index, callbacks)
+                started = time.time()
+                try:
+                    forward = handler(service, index, work, callbacks)
+                except Exception as e:
+                    self._record(name, started, failed=True)
+                    if name != DECODE and not isinstance(
+                        e, (FileNotFoundError, ValueError)
+                    ):
+                        e = service.transcription_error(e)
+                    logger.error(f"❌ {work.file_path.name} failed in {name}: {e}")
+                    if callbacks["failed"]:
+                        callbacks["failed"](index, e)
+                    continue
+                finally:
+                    service.progress_callback = None
+
+                self._record(name, started)
+                if forward and next_name is not None:
+                    self._put(next_name, item)
+        except Exception as e:
+            # Without its service the stage cannot run; stop the batch rather
+            # than leave the stages around it blocked on full queues
+            logger.error(f"💥 Pipeline stage {name} failed: {e}")
+            self.stop()
+            while incoming.get() is not _DONE:
+                pass
+        finally:
+            if service is not None:
+                service.cleanup()
+            with remaining_lock:
+                remaining[name] -= 1
+                last = remaining[name] == 0
+            # The last worker out tells every worker of the next stage to stop
+            if last and next_name is not None:
+                for _ in range(max(1, self.stages[next_name].workers)):
+                    self._queues[next_name].put(_DONE)
+
+    def _record(self, name: str, started: float, failed: bool = False) -> None:
+        with self._stats_lock:
+            stats = self.stats[name]
+            stats.busy_seconds += time.time() - started
+            if failed:
+                stats.failed += 1
+            else:
+                stats.processed += 1
+
+    @staticmethod
+    def _progress_reporter(
+        index: int, callbacks: Dict[str, Optional[Callable]]
+    ) -> Optional[Callable[[str, float], None]]:
+        on_progress = callbacks["progress"]
+        if on_progress is None:
+            return None
+        return lambda message, progress: on_progress(index, message, progress)
+
+    # Stage handlers return whether the file moves on to the next stage
+
+    def _decode(
+        self,
+        service: EnhancedTranscriptionService,
+        index: int,
+        work: TranscriptionWork,
+        callbacks: Dict[str, Optional[Callable]],
+    ) -> bool:
+        if callbacks["started"]:
+            callbacks["started"](index, work.file_path)
+
+        prepared = service.prepare_file(
+            work.file_path,
+            work.language,
+            work.domain,
+            work.accuracy_priority,
+            work.enable_enhancements,
+        )
+        work.cache_key, work.result = prepared.cache_key, prepared.result
+        work.start_time = prepared.start_time
+        if work.result is not None:
+            # Cached: skip straight past enhancement and inference
+            self._complete(service, index, work, callbacks)
+            return False
+
+        service.decode_audio(work)
+        return True
+
+    def _enhance(
+        self,
+        service: EnhancedTranscriptionService,
+        index: int,
+        work: TranscriptionWork,
+        callbacks: Dict[str, Optional[Callable]],
+    ) -> bool:
+        service.enhance_audio(work)
+        return True
+
+    def _infer(
+        self,
+        service: EnhancedTranscriptionService,
+        index: int,
+        work: TranscriptionWork,
+        callbacks: Dict[str, Optional[Callable]],
+    ) -> bool:
+        service.run_inference(work)
+        if work.result is not None:
+            # Cached under the model chosen once the audio was analysed
+            self._complete(service, index, work, callbacks)
+            return False
+        return True
+
+    def _finalize(
+        self,
+        service: EnhancedTranscriptionService,
+        index: int,
+        work: TranscriptionWork,
+        callbacks: Dict[str, Optional[Callable]],
+    ) -> bool:
+        service.finalize_result(work)
+        self._complete(service, index, work, callbacks)
+        return False
+
+    @staticmethod
+    def _complete(
+        service: EnhancedTranscriptionService,
+        index: int,
+        work: TranscriptionWork,
+        callbacks: Dict[str, Optional[Callable]],
+    ) -> None:
+        exported = None
+        if callbacks["export"]:
+            exported = callbacks["export"](service, index, work.result)
+        # Drop the decoded audio before the result is handed on
+        work.audio_buffer = None
+        if callbacks["completed"]:
+            callbacks["completed"](index, work.result, exported)
@@ -0,0 +1,133 @@
+import logging
+import multiprocessing
+import os
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .hardware_monitor import HardwareMonitor
+from .model_registry import MODEL_MEMORY_ESTIMATES_GB
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Working set of one worker on top of its model weights: decoded audio,
+# enhancement buffers and decoder state for an hour-long file
+WORKER_OVERHEAD_GB = 1.0
+# Left free for the GUI process and the rest of the system
+MEMORY_RESERVE_GB = 2.0
+
+ProgressEvent = Tuple[int, str, float]  # file index, message, progress
+
+
+def batch_worker_count(
+    model_size: str, monitor: Optional[HardwareMonitor] = None
+) -> int:
+    # Each worker holds its own copy of the model, so the pool is limited by
+    # whichever runs out first: cores, free RAM, or the monitor's safe limit
+    monitor = monitor or HardwareMonitor()
+    workers = max(1, (os.cpu_count() or 1) // 2)
+
+    try:
+        import psutil
+
+        available_gb = psutil.virtual_memory().available / (1024**3)
+        per_worker_gb = MODEL_MEMORY_ESTIMATES_GB.get(model_size, 1.0)
+        per_worker_gb += WORKER_OVERHEAD_GB
+        workers = min(
+            workers, max(1, int((available_gb - MEMORY_RESERVE_GB) / per_worker_gb))
+        )
+    except Exception:
+        pass
+
+    safe_limit = monitor.get_safe_batch_size_recommendation()
+    if safe_limit is not None:
+        workers = min(workers, safe_limit)
+    return max(1, workers)
+
+
+# --- worker process side ----------------------------------------------------
+
+_worker_service = None
+_worker_events = None
+
+
+def _init_worker(
+    service_options: Dict[str, Any], events: Any, threads: int, trace: bool
+) -> None:
+    global _worker_service, _worker_events
+
+    import torch
+
+    from .transcription_service import EnhancedTranscriptionService
+
+    torch.set_num_threads(threads)
+    get_tracer().enabled = trace
+    _worker_service = EnhancedTranscriptionService(**service_options)
+    _worker_events = events
+
+
+def _transcribe_file(
+    index: int, file_path: str, options: Dict[str, Any]
+) -> Dict[str, Any]:
+    _worker_service.progress_callback = lambda message, progress: _worker_events.put(
+        (index, message, float(progress))
+    )
+    try:
+        result = _worker_service.transcribe_file(file_path, **options)
+    finally:
+        _worker_service.progress_callback = None
+
+    outcome = result.to_dict()
+    tracer = get_tracer()
+    if tracer.enabled:
+        # The parent merges these into its own trace
+        outcome["trace_events"] = tracer.drain()
+    return outcome
+
+
+# ---------------------------------------------------------------------------
+
+
+class BatchProcessPool:
+    def __init__(self, workers: int, service_options: Dict[str, Any]):
+        self.workers = max(1, workers)
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        logger.info(
+            f"🧵 Starting {self.workers} batch workers "
+            f"({threads} threads each, model '{service_options.get('model_size')}')"
+        )
+
+        # spawn: forking a process that already holds torch threads can hang
+        context = multiprocessing.get_context("spawn")
+        self._events = context.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(service_options, self._events, threads, get_tracer().enabled),
+        )
+
+    def submit(
+        self, index: int, file_path: Union[str, Path], options: Dict[str, Any]
+    ) -> Future:
+        return self._executor.submit(_transcribe_file, index, str(file_path), options)
+
+    def progress_events(self) -> List[ProgressEvent]:
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        self._events.close()
+
+    def __enter__(self) -> "BatchProcessPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown(cancel_pending=exc_info[0] is not None)
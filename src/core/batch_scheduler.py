@@ -0,0 +1,366 @@
+import heapq
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..models.transcription_result import TranscriptionResult
+from .model_optimizer import ModelOptimizer
+
+logger = logging.getLogger(__name__)
+
+FIFO = "fifo"
+SHORTEST_FIRST = "shortest_first"
+LONGEST_FIRST = "longest_first"
+EARLIEST_DEADLINE = "earliest_deadline"
+POLICIES = (FIFO, SHORTEST_FIRST, LONGEST_FIRST, EARLIEST_DEADLINE)
+
+# Used when neither the header nor ffprobe gives a duration: a typical
+# compressed speech recording (128 kbps)
+FALLBACK_BYTES_PER_SECOND = 16000
+PROBE_TIMEOUT_SECONDS = 10
+PROBE_THREADS = 8
+
+DEADLINE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Older measurements are scaled down once this much audio has been seen, so
+# the factor follows the machine's current speed rather than its history
+MAX_MEASURED_AUDIO_SECONDS = 36000.0
+# Anything faster was served from a cache or skipped, not measured
+MIN_MEASURED_PROCESSING_SECONDS = 0.1
+
+
+@dataclass
+class DurationProbe:
+    duration: Optional[float]
+    source: str  # header, ffprobe, size or unknown
+
+
+def _probe_header(file_path: Path) -> Optional[float]:
+    if file_path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(file_path), "rb") as wav:
+                if wav.getframerate() > 0:
+                    return wav.getnframes() / wav.getframerate()
+        except Exception:
+            pass
+
+    try:
+        import soundfile
+
+        info = soundfile.info(str(file_path))
+        if info.samplerate > 0 and info.frames > 0:
+            return info.frames / info.samplerate
+    except Exception:
+        pass
+    return None
+
+
+def _probe_ffprobe(file_path: Path) -> Optional[float]:
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+    try:
+        completed = subprocess.run(
+            [
+                ffprobe,
+                "-v",
+                "quiet",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(file_path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT_SECONDS,
+        )
+        if completed.returncode == 0:
+            return float(completed.stdout.strip())
+    except (subprocess.SubprocessError, ValueError, OSError):
+        pass
+    return None
+
+
+def probe_duration(file_path: Union[str, Path]) -> DurationProbe:
+    # Reads container metadata only; nothing is decoded
+    file_path = Path(file_path)
+
+    duration = _probe_header(file_path)
+    if duration is not None:
+        return DurationProbe(duration, "header")
+
+    duration = _probe_ffprobe(file_path)
+    if duration is not None and duration > 0:
+        return DurationProbe(duration, "ffprobe")
+
+    try:
+        size = file_path.stat().st_size
+    except OSError:
+        return DurationProbe(None, "unknown")
+    return DurationProbe(size / FALLBACK_BYTES_PER_SECOND, "size")
+
+
+def parse_deadline(value: str, now: Optional[float] = None) -> float:
+    # "90m", "2h" or "45s" from now, or a local date/time such as
+    # "2026-10-16T17:00"; returns epoch seconds
+    value = value.strip()
+    unit = DEADLINE_UNITS.get(value[-1:].lower())
+    if unit is not None:
+        try:
+            amount = float(value[:-1])
+        except ValueError:
+            amount = None
+        if amount is not None:
+            return (time.time() if now is None else now) + amount * unit
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"Invalid deadline: {value!r} (use e.g. 90m, 2h or an ISO time)"
+        )
+
+
+def parse_deadline_rules(
+    specs: Sequence[str], now: Optional[float] = None
+) -> List[Tuple[str, float]]:
+    # "calls/*.mp3=2h" -> files matching the glob are due two hours from now
+    rules = []
+    for spec in specs:
+        pattern, _, when = spec.rpartition("=")
+        if not pattern.strip():
+            raise ValueError(f"Invalid deadline rule: {spec!r} (use PATTERN=WHEN)")
+        rules.append((pattern.strip(), parse_deadline(when, now)))
+    return rules
+
+
+def match_deadlines(
+    files: Sequence[Union[str, Path]], rules: Sequence[Tuple[str, float]]
+) -> Dict[int, float]:
+    # Patterns match from the right like Path.match, so "*.mp3" matches by
+    # name and "calls/*.mp3" by parent folder; the earliest matching rule wins
+    deadlines: Dict[int, float] = {}
+    for index, file_path in enumerate(files):
+        path = PurePath(file_path)
+        matched = [when for pattern, when in rules if path.match(pattern)]
+        if matched:
+            deadlines[index] = min(matched)
+    return deadlines
+
+
+def default_policy(has_deadlines: bool) -> str:
+    return EARLIEST_DEADLINE if has_deadlines else SHORTEST_FIRST
+
+
+class RealtimeFactorStore:
+    # Seconds of audio finished per second of wall time, end to end, per
+    # model. Persisted so the first batch after a restart still has an ETA
+    def __init__(self, store_path: Optional[Union[str, Path]] = None):
+        self.store_path = Path(
+            store_path or Path.home() / ".cache" / "xscribe" / "realtime_factors.json"
+        )
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, float]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._entries is None:
+            try:
+                with open(self.store_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"Could not read realtime factors: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, model_size: str) -> Optional[float]:
+        with self._lock:
+            entry = self._load().get(model_size)
+        if not entry or entry.get("processing_seconds", 0) <= 0:
+            return None
+        return entry["audio_seconds"] / entry["processing_seconds"]
+
+    def record(
+        self, model_size: str, audio_seconds: float, processing_seconds: float
+    ) -> None:
+        if audio_seconds <= 0 or processing_seconds <= 0:
+            return
+
+        with self._lock:
+            entries = self._load()
+            entry = entries.setdefault(
+                model_size, {"audio_seconds": 0.0, "processing_seconds": 0.0}
+            )
+            if entry["audio_seconds"] > MAX_MEASURED_AUDIO_SECONDS:
+                entry["audio_seconds"] /= 2
+                entry["processing_seconds"] /= 2
+            entry["audio_seconds"] += audio_seconds
+            entry["processing_seconds"] += processing_seconds
+
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.store_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.store_path)
+            except Exception as e:
+                logger.warning(f"Could not write realtime factors: {e}")
+                tmp_path.unlink(missing_ok=True)
+
+
+_realtime_factor_store: Optional[RealtimeFactorStore] = None
+
+
+def get_realtime_factor_store() -> RealtimeFactorStore:
+    global _realtime_factor_store
+    if _realtime_factor_store is None:
+        _realtime_factor_store = RealtimeFactorStore()
+    return _realtime_factor_store
+
+
+@dataclass
+class ScheduledFile:
+    index: int  # position in the list the caller passed in
+    file_path: Path
+    duration: Optional[float]
+    duration_source: str
+    deadline: Optional[float] = None  # epoch seconds
+    estimated_seconds: float = 0.0
+    # Seconds after the batch starts at which the file should be done
+    finish_eta: float = 0.0
+
+    @property
+    def misses_deadline(self) -> bool:
+        if self.deadline is None:
+            return False
+        return self.finish_eta > self.deadline - time.time()
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        policy: str = SHORTEST_FIRST,
+        model_size: str = "base",
+        workers: int = 1,
+        store: Optional[RealtimeFactorStore] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown scheduling policy: {policy} (choose from {', '.join(POLICIES)})"
+            )
+        self.policy = policy
+        self.model_size = model_size
+        self.workers = max(1, workers)
+        self.store = store or get_realtime_factor_store()
+        self._optimizer = ModelOptimizer()
+
+    @property
+    def realtime_factor(self) -> float:
+        measured = self.store.get(self.model_size)
+        if measured is not None:
+            return measured
+        # Nothing measured on this machine yet: fall back to the optimizer's
+        # static per-model estimate for average-quality audio
+        return 60.0 / max(
+            self._optimizer.estimate_processing_time(1.0, self.model_size, 75), 1e-6
+        )
+
+    def estimate_seconds(self, duration: Optional[float]) -> float:
+        if duration is None:
+            return 0.0
+        return duration / self.realtime_factor
+
+    def schedule(
+        self,
+        files: Sequence[Union[str, Path]],
+        deadlines: Optional[Dict[int, float]] = None,
+    ) -> List[ScheduledFile]:
+        deadlines = deadlines or {}
+        with ThreadPoolExecutor(max_workers=PROBE_THREADS) as pool:
+            probes = list(pool.map(probe_duration, files))
+
+        scheduled = [
+            ScheduledFile(
+                index=index,
+                file_path=Path(file_path),
+                duration=probe.duration,
+                duration_source=probe.source,
+                deadline=deadlines.get(index),
+                estimated_seconds=self.estimate_seconds(probe.duration),
+            )
+            for index, (file_path, probe) in enumerate(zip(files, probes))
+        ]
+        scheduled.sort(key=self._sort_key)
+        self._assign_etas(scheduled)
+
+        total = sum(item.duration or 0.0 for item in scheduled)
+        logger.info(
+            f"🗓️ Scheduled {len(scheduled)} files ({total / 60:.1f} min of audio) "
+            f"{self.policy}, ~{self.realtime_factor:.1f}x realtime, "
+            f"ETA {self.remaining_seconds(scheduled):.0f}s"
+        )
+        for item in scheduled:
+            if item.misses_deadline:
+                logger.warning(
+                    f"⏰ {item.file_path.name} is likely to miss its deadline"
+                )
+        return scheduled
+
+    def _sort_key(self, item: ScheduledFile) -> Tuple:
+        # Unknown durations go last; ties keep submission order
+        duration = item.duration if item.duration is not None else float("inf")
+        if self.policy == SHORTEST_FIRST:
+            return (duration, item.index)
+        if self.policy == LONGEST_FIRST:
+            known = item.duration is not None
+            return (not known, -(item.duration or 0.0), item.index)
+        if self.policy == EARLIEST_DEADLINE:
+            # Files without a deadline follow, shortest first
+            deadline = item.deadline if item.deadline is not None else float("inf")
+            return (deadline, duration, item.index)
+        return (item.index,)
+
+    def _assign_etas(self, scheduled: List[ScheduledFile]) -> None:
+        # Each file starts on whichever worker frees up first
+        workers = [0.0] * self.workers
+        for item in scheduled:
+            start = heapq.heappop(workers)
+            item.finish_eta = start + item.estimated_seconds
+            heapq.heappush(workers, item.finish_eta)
+
+    def remaining_seconds(self, remaining: Sequence[ScheduledFile]) -> float:
+        # Wall-clock time to clear the files still to go from now
+        workers = [0.0] * self.workers
+        for item in remaining:
+            start = heapq.heappop(workers)
+            heapq.heappush(workers, start + self.estimate_seconds(item.duration))
+        return max(workers)
+
+    def record_result(self, result: Union[TranscriptionResult, Dict[str, Any]]) -> None:
+        # Takes results, their dicts, and the CLI's per-file outcomes (which
+        # carry cache_hit at the top level)
+        if isinstance(result, dict):
+            duration = result.get("duration", 0.0)
+            processing_time = result.get("processing_time", 0.0)
+            metadata = result.get("metadata") or {}
+            cache_hit = result.get("cache_hit") or metadata.get("cache_hit")
+        else:
+            duration = result.duration
+            processing_time = result.processing_time
+            cache_hit = result.metadata.get("cache_hit")
+
+        # A cache hit finishes instantly and says nothing about speed
+        if cache_hit or processing_time < MIN_MEASURED_PROCESSING_SECONDS:
+            return
+        self.store.record(self.model_size, duration, processing_time)
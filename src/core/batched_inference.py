@@ -0,0 +1,200 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 30.0  # one Whisper encoder window
+TIME_PRECISION = 0.02  # seconds per timestamp token
+DEFAULT_BATCH_SIZE = 8
+
+
+def fits_single_window(samples: np.ndarray) -> bool:
+    return len(samples) <= WINDOW_SECONDS * SAMPLE_RATE
+
+
+def split_timestamped_tokens(
+    tokens: Sequence[int], timestamp_begin: int, duration: float
+) -> List[Dict[str, Any]]:
+    # Whisper emits <|t0|> text <|t1|><|t1|> text <|t2|> ...; consecutive
+    # timestamps close one segment and open the next
+    segments: List[Dict[str, Any]] = []
+    start: Optional[float] = None
+    text_tokens: List[int] = []
+
+    for token in tokens:
+        if token >= timestamp_begin:
+            time_s = (token - timestamp_begin) * TIME_PRECISION
+            if text_tokens:
+                segments.append(
+                    {"start": start or 0.0, "end": time_s, "tokens": text_tokens}
+                )
+                text_tokens = []
+            start = time_s
+        else:
+            text_tokens.append(token)
+
+    if text_tokens:
+        segments.append({"start": start or 0.0, "end": duration, "tokens": text_tokens})
+
+    for segment in segments:
+        segment["start"] = min(max(0.0, segment["start"]), duration)
+        segment["end"] = min(max(segment["start"], segment["end"]), duration)
+
+    return segments
+
+
+class BatchedDecoder:
+    def __init__(
+        self,
+        model: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        decode_options: Optional[Dict[str, Any]] = None,
+        no_speech_threshold: Optional[float] = 0.6,
+        logprob_threshold: Optional[float] = -1.0,
+        compression_ratio_threshold: Optional[float] = 2.4,
+    ):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.decode_options = dict(decode_options or {})
+        self.no_speech_threshold = no_speech_threshold
+        self.logprob_threshold = logprob_threshold
+        self.compression_ratio_threshold = compression_ratio_threshold
+
+    @classmethod
+    def from_transcribe_options(
+        cls, model: Any, batch_size: int, options: Dict[str, Any]
+    ) -> "BatchedDecoder":
+        # Takes the whisper.transcribe() arguments the per-file path would
+        # use. The batch decodes at the first temperature only; clips whose
+        # output would have made transcribe() retry are flagged instead
+        temperature = options.get("temperature", 0.0)
+        if isinstance(temperature, (list, tuple)):
+            temperature = temperature[0]
+
+        decode_options: Dict[str, Any] = {
+            "temperature": temperature,
+            "fp16": options.get("fp16", True),
+        }
+        # Whisper rejects best_of when greedy and a beam when sampling
+        sampling = ("best_of",) if temperature > 0 else ("beam_size", "patience")
+        for name in sampling + ("length_penalty", "suppress_tokens"):
+            if options.get(name) is not None:
+                decode_options[name] = options[name]
+        if options.get("initial_prompt"):
+            decode_options["prompt"] = options["initial_prompt"]
+
+        return cls(
+            model,
+            batch_size,
+            decode_options=decode_options,
+            no_speech_threshold=options.get("no_speech_threshold", 0.6),
+            logprob_threshold=options.get("logprob_threshold", -1.0),
+            compression_ratio_threshold=options.get(
+                "compression_ratio_threshold", 2.4
+            ),
+        )
+
+    def _needs_fallback(self, decoding: Any) -> bool:
+        # Same test whisper.transcribe() applies before trying a higher
+        # temperature: repetitive output or low average log-probability
+        if (
+            self.compression_ratio_threshold is not None
+            and decoding.compression_ratio > self.compression_ratio_threshold
+        ):
+            return True
+        return (
+            self.logprob_threshold is not None
+            and decoding.avg_logprob < self.logprob_threshold
+        )
+
+    def _mel_batch(self, clips: List[np.ndarray]):
+        import torch
+        import whisper
+
+        n_mels = getattr(getattr(self.model, "dims", None), "n_mels", 80)
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), n_mels=n_mels)
+            for clip in clips
+        ]
+        return torch.stack(mels).to(self.model.device)
+
+    def decode(
+        self, clips: List[np.ndarray], language: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(clips), self.batch_size):
+            results.extend(
+                self._decode_batch(clips[start : start + self.batch_size], language)
+            )
+        return results
+
+    def _decode_batch(
+        self, clips: List[np.ndarray], language: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        for clip in clips:
+            if not fits_single_window(clip):
+                raise ValueError("Batched decoding only supports clips up to 30s")
+
+        options = whisper.DecodingOptions(
+            task="transcribe", language=language, **self.decode_options
+        )
+
+        logger.info(f"📦 Decoding {len(clips)} clips in one encoder batch")
+        decoded = whisper.decode(self.model, self._mel_batch(clips), options)
+
+        results = []
+        for clip, decoding in zip(clips, decoded):
+            duration = len(clip) / SAMPLE_RATE
+            tokenizer = get_tokenizer(
+                self.model.is_multilingual,
+                num_languages=getattr(self.model, "num_languages", 99),
+                language=decoding.language,
+                task="transcribe",
+            )
+
+            silent = (
+                self.no_speech_threshold is not None
+                and decoding.no_speech_prob > self.no_speech_threshold
+                and self.logprob_threshold is not None
+                and decoding.avg_logprob < self.logprob_threshold
+            )
+
+            segments = []
+            if not silent:
+                for index, raw in enumerate(
+                    split_timestamped_tokens(
+                        decoding.tokens, tokenizer.timestamp_begin, duration
+                    )
+                ):
+                    segments.append(
+                        {
+                            "id": index,
+                            "start": raw["start"],
+                            "end": raw["end"],
+                            "text": tokenizer.decode(raw["tokens"]),
+                            "tokens": raw["tokens"],
+                            "avg_logprob": decoding.avg_logprob,
+                            "no_speech_prob": decoding.no_speech_prob,
+                            "compression_ratio": decoding.compression_ratio,
+                            "temperature": decoding.temperature,
+                        }
+                    )
+
+            results.append(
+                {
+                    "text": "".join(segment["text"] for segment in segments),
+                    "segments": segments,
+                    "language": decoding.language,
+                    "duration": duration,
+                    "needs_fallback": not silent and self._needs_fallback(decoding),
+                }
+            )
+
+        return results
@@ -0,0 +1,299 @@
+import logging
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+from .model_registry import MODEL_MEMORY_ESTIMATES_GB
+from .voice_activity import find_split_points
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SECONDS = 300.0
+HARD_SPLIT_OVERLAP_SECONDS = 2.0
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start: float  # owned region on the original timeline
+    end: float
+    audio_start: float  # start of the samples sent to the model (incl. overlap)
+    audio_end: float
+
+
+def plan_chunks(
+    samples: np.ndarray,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    overlap_seconds: float = HARD_SPLIT_OVERLAP_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+    search_seconds: float = 30.0,
+) -> List[AudioChunk]:
+    duration = len(samples) / sample_rate
+    splits = find_split_points(samples, chunk_seconds, sample_rate, search_seconds)
+
+    boundaries = [(0.0, True)] + splits + [(duration, True)]
+    chunks = []
+    for index in range(len(boundaries) - 1):
+        start, start_is_silence = boundaries[index]
+        end, end_is_silence = boundaries[index + 1]
+
+        # Splitting inside speech cuts a word in half, so both neighbours
+        # decode a little past the cut and stitching keeps one copy
+        audio_start = start if start_is_silence else max(0.0, start - overlap_seconds)
+        audio_end = end if end_is_silence else min(duration, end + overlap_seconds)
+
+        chunks.append(
+            AudioChunk(
+                index=index,
+                start=start,
+                end=end,
+                audio_start=audio_start,
+                audio_end=audio_end,
+            )
+        )
+
+    return chunks
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"[^\w]+", " ", text.lower()).strip()
+
+
+def offset_segments(
+    segments: List[Dict[str, Any]], offset: float
+) -> List[Dict[str, Any]]:
+    shifted = []
+    for segment in segments:
+        segment = dict(segment)
+        segment["start"] = float(segment.get("start", 0.0)) + offset
+        segment["end"] = float(segment.get("end", 0.0)) + offset
+        if segment.get("words"):
+            segment["words"] = [
+                {
+                    **word,
+                    "start": float(word.get("start", 0.0)) + offset,
+                    "end": float(word.get("end", 0.0)) + offset,
+                }
+                for word in segment["words"]
+            ]
+        shifted.append(segment)
+    return shifted
+
+
+class ChunkStitcher:
+    def __init__(self, chunks: List[AudioChunk]):
+        self.chunks = sorted(chunks, key=lambda c: c.index)
+        self.segments: List[Dict[str, Any]] = []
+        self.languages: Counter = Counter()
+
+    def add(
+        self,
+        chunk: AudioChunk,
+        result: Dict[str, Any],
+        final: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        # Chunks must be added in index order; returns the newly kept segments.
+        # Streaming callers do not know the full plan up front and pass final
+        if result.get("language"):
+            self.languages[result["language"]] += 1
+
+        is_last = chunk is self.chunks[-1] if final is None else final
+        kept = []
+        for segment in offset_segments(result.get("segments", []), chunk.audio_start):
+            # A segment belongs to the chunk that owns its midpoint, which
+            # drops the duplicate copy decoded inside the overlap
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if midpoint < chunk.start or (midpoint >= chunk.end and not is_last):
+                continue
+
+            if self.segments:
+                previous = self.segments[-1]
+                same_text = _normalize_text(previous.get("text", "")) == (
+                    _normalize_text(segment.get("text", ""))
+                )
+                in_overlap = segment["start"] < chunk.start + HARD_SPLIT_OVERLAP_SECONDS
+                if same_text and chunk.audio_start < chunk.start and in_overlap:
+                    continue
+                if segment["start"] < previous["end"]:
+                    segment["start"] = previous["end"]
+                    segment["end"] = max(segment["end"], segment["start"])
+
+            segment["id"] = len(self.segments)
+            self.segments.append(segment)
+            kept.append(segment)
+
+        return kept
+
+    @property
+    def language(self) -> Optional[str]:
+        return self.languages.most_common(1)[0][0] if self.languages else None
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "text": "".join(segment.get("text", "") for segment in self.segments),
+            "segments": self.segments,
+            "language": self.language,
+            "duration": max((c.end for c in self.chunks), default=0.0),
+            "chunk_count": len(self.chunks),
+        }
+
+
+def stitch_chunk_results(
+    chunks: List[AudioChunk], results: Dict[int, Dict[str, Any]]
+) -> Dict[str, Any]:
+    stitcher = ChunkStitcher(chunks)
+    for chunk in stitcher.chunks:
+        if results.get(chunk.index):
+            stitcher.add(chunk, results[chunk.index])
+    return stitcher.result()
+
+
+def default_worker_count(model_size: str) -> int:
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, cpu_count // 2)
+
+    try:
+        import psutil
+
+        available_gb = psutil.virtual_memory().available / (1024**3)
+        per_worker_gb = MODEL_MEMORY_ESTIMATES_GB.get(model_size, 1.0) + 0.5
+        workers = min(workers, max(1, int(available_gb / per_worker_gb)))
+    except Exception:
+        pass
+
+    return workers
+
+
+# --- worker process side ----------------------------------------------------
+
+_worker_model = None
+_worker_precision = "fp32"
+
+
+def _init_worker(model_size: str, precision: str, threads: int) -> None:
+    global _worker_model, _worker_precision
+
+    import torch
+
+    from .model_registry import get_model_registry, resolve_precision
+
+    torch.set_num_threads(threads)
+    _worker_precision = resolve_precision(precision, "cpu")
+    _worker_model = get_model_registry().acquire(model_size, "cpu", precision)
+
+
+def _transcribe_chunk(
+    index: int, audio: np.ndarray, options: Dict[str, Any]
+) -> Dict[str, Any]:
+    from .model_registry import inference_context
+
+    with inference_context(_worker_model, _worker_precision, "cpu"):
+        result = _worker_model.transcribe(audio, **options)
+    return {
+        "index": index,
+        "text": result.get("text", ""),
+        "segments": result.get("segments", []),
+        "language": result.get("language"),
+    }
+
+
+# ---------------------------------------------------------------------------
+
+
+class ChunkedTranscriber:
+    def __init__(
+        self,
+        model_size: str,
+        workers: Optional[int] = None,
+        precision: str = "fp32",
+        chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    ):
+        self.model_size = model_size
+        self.precision = precision
+        self.workers = workers or default_worker_count(model_size)
+        self.chunk_seconds = chunk_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def should_chunk(self, num_samples: int) -> bool:
+        return self.workers > 1 and num_samples / SAMPLE_RATE > 2 * self.chunk_seconds
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            logger.info(
+                f"🧵 Starting {self.workers} chunk workers "
+                f"({threads} threads each, model '{self.model_size}')"
+            )
+            # spawn: forking a process that already holds torch threads can hang
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_size, self.precision, threads),
+            )
+        return self._executor
+
+    def transcribe(
+        self,
+        samples: np.ndarray,
+        options: Dict[str, Any],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        chunks: Optional[List[AudioChunk]] = None,
+        completed: Optional[Dict[int, Dict[str, Any]]] = None,
+        on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        # completed holds results restored from a checkpoint; on_result is
+        # told about each newly finished chunk so it can be persisted
+        chunks = chunks or plan_chunks(samples, self.chunk_seconds)
+        results: Dict[int, Dict[str, Any]] = dict(completed or {})
+        logger.info(
+            f"✂️ Split {len(samples) / SAMPLE_RATE:.0f}s of audio into "
+            f"{len(chunks)} chunks at silence boundaries"
+        )
+
+        # Silence per-window console output from the worker processes
+        options = dict(options)
+        options["verbose"] = None
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(
+                _transcribe_chunk,
+                chunk.index,
+                samples[
+                    int(chunk.audio_start * SAMPLE_RATE) : int(
+                        chunk.audio_end * SAMPLE_RATE
+                    )
+                ],
+                options,
+            ): chunk
+            for chunk in chunks
+            if chunk.index not in results
+        }
+
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["index"]] = result
+                if on_result:
+                    on_result(result["index"], result)
+                if progress_callback:
+                    progress_callback(len(results), len(chunks))
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+        return stitch_chunk_results(chunks, results)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
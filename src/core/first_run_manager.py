@@ -43,6 +43,18 @@ class FirstRunManager:
             "setup_date": None,
             "models_downloaded": [],
             "default_model": "base",
+            "warm_up_model_on_start": False,
+            "model_memory_budget_gb": None,
+            # "auto", "pipeline", "batched" or "pool"; see BatchProcessor
+            "batch_mode": "auto",
+            "batch_workers": None,
+            "batch_size": 8,
+            # Pipeline stage tuning, e.g. "enhance=3,infer=1:4"
+            "batch_pipeline": None,
+            # Processing order; None means earliest_deadline when any file
+            # matches "batch_deadlines" ({"glob": "2h"}), else shortest_first
+            "batch_schedule": None,
+            "batch_deadlines": {},
             "privacy_consent": False,
         }
 
@@ -137,6 +137,15 @@ class HardwareMonitor:
         except Exception:
             return 5
 
+    def get_model_memory_budget_gb(self, reserve_gb: float = 2.0) -> float:
+        # Resident models may use what is free now, less a reserve for audio
+        # buffers and the rest of the system; never below one base model
+        try:
+            available_gb = psutil.virtual_memory().available / (1024**3)
+            return max(0.5, available_gb - reserve_gb)
+        except Exception:
+            return 4.0
+
     def log_system_info(self):
         try:
             cpu_count = psutil.cpu_count(logical=False)
@@ -0,0 +1,381 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from ..models.transcription_result import TranscriptionResult
+from .job_store import JobStore
+from .transcription_service import (
+    EnhancedTranscriptionService,
+    TranscriptionCancelled,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUED_JOBS = 32
+DEFAULT_MAX_FINISHED_JOBS = 1000
+
+
+class JobState:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATES = {JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobCancelled(TranscriptionCancelled):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    file_path: Path
+    options: Dict[str, Any]
+    status: str = JobState.QUEUED
+    progress: float = 0.0
+    message: str = ""
+    error: Optional[str] = None
+    result: Optional[TranscriptionResult] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Uploaded files belong to the job. A completed job keeps its upload until
+    # it is evicted, since subtitles may still need the audio to align words
+    owns_file: bool = False
+    on_finished: Optional[Callable[["Job"], None]] = field(default=None, repr=False)
+    cancel_requested: threading.Event = field(
+        default_factory=threading.Event, repr=False
+    )
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "file": str(self.file_path),
+            "status": self.status,
+            "progress": round(self.progress, 1),
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        result = None
+        if self.result is not None:
+            result = self.result.to_dict()
+            result["word_timestamps"] = self.result.word_timestamps
+        return {
+            "id": self.id,
+            "file_path": str(self.file_path),
+            "options": self.options,
+            "owns_file": self.owns_file,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "result": result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Job":
+        result = record.get("result")
+        return cls(
+            id=record["id"],
+            file_path=Path(record["file_path"]),
+            options=record["options"],
+            owns_file=record.get("owns_file", False),
+            status=record["status"],
+            progress=record.get("progress") or 0.0,
+            message=record.get("message") or "",
+            error=record.get("error"),
+            result=TranscriptionResult.from_dict(result) if result else None,
+            created_at=record["created_at"],
+            started_at=record.get("started_at"),
+            finished_at=record.get("finished_at"),
+        )
+
+
+class TranscriptionJobQueue:
+    def __init__(
+        self,
+        concurrency: int = 1,
+        max_queued: int = DEFAULT_MAX_QUEUED_JOBS,
+        max_finished: int = DEFAULT_MAX_FINISHED_JOBS,
+        service_factory: Optional[Callable[..., EnhancedTranscriptionService]] = None,
+        store: Optional[JobStore] = None,
+        **service_options: Any,
+    ):
+        # Each worker thread owns a service; the model behind them comes from
+        # the shared registry and its inference lock serializes decoding, so
+        # extra workers overlap decoding/enhancement rather than inference
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max(1, max_queued)
+        self.max_finished = max_finished
+        self.service_factory = service_factory or EnhancedTranscriptionService
+        self.service_options = service_options
+
+        # Cancelled jobs stay in _pending until a worker skips them, so the
+        # bound is enforced on _queued, the number of jobs still waiting
+        self._pending: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._running = 0
+        self._queued = 0
+        self._shutting_down = False
+
+        self._result_service: Optional[EnhancedTranscriptionService] = None
+        self._result_service_lock = threading.Lock()
+
+        # Without a store jobs live only as long as the process
+        self.store = store
+        if store is not None:
+            self._restore()
+
+    def _restore(self) -> None:
+        # Finished jobs come back with their results; jobs that were queued
+        # or running when the process stopped are queued again from scratch
+        requeued = 0
+        for record in self.store.load():
+            job = Job.from_record(record)
+            if not job.is_finished:
+                job.status = JobState.QUEUED
+                job.progress = 0.0
+                job.message = ""
+                job.started_at = None
+                if self._queued < self.max_queued:
+                    self._pending.put(job)
+                    self._queued += 1
+                    requeued += 1
+                else:
+                    self._finish(
+                        job, JobState.FAILED, error="Queue was full after restart"
+                    )
+            self._jobs[job.id] = job
+        if self._jobs:
+            logger.info(
+                f"🗂️ Restored {len(self._jobs)} jobs ({requeued} queued again)"
+            )
+
+    def start(self) -> "TranscriptionJobQueue":
+        if not self._workers:
+            for index in range(self.concurrency):
+                worker = threading.Thread(
+                    target=self._worker_loop, name=f"xscribe-job-{index}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            logger.info(f"🗂️ Job queue started with {self.concurrency} workers")
+        return self
+
+    def submit(
+        self,
+        file_path: Union[str, Path],
+        on_finished: Optional[Callable[[Job], None]] = None,
+        owns_file: bool = False,
+        **options: Any,
+    ) -> Job:
+        job = Job(
+            id=uuid.uuid4().hex,
+            file_path=Path(file_path),
+            options=options,
+            owns_file=owns_file,
+            on_finished=on_finished,
+        )
+        with self._lock:
+            if self._queued >= self.max_queued:
+                raise QueueFullError(
+                    f"Job queue is full ({self.max_queued} jobs waiting)"
+                )
+            self._pending.put(job)
+            self._queued += 1
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self.persist(job)
+        logger.info(f"📥 Queued job {job.id[:8]} for {job.file_path.name}")
+        return job
+
+    def persist(self, job: Job) -> None:
+        if self.store is not None:
+            self.store.save(job.to_record())
+
+    @contextmanager
+    def result_service(self) -> Iterator[EnhancedTranscriptionService]:
+        # One service renders finished results (subtitles align words on
+        # demand) for the queue's lifetime instead of one per request
+        with self._result_service_lock:
+            if self._result_service is None:
+                self._result_service = self.service_factory(**self.service_options)
+            yield self._result_service
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        with job.lock:
+            if job.is_finished:
+                return job
+            job.cancel_requested.set()
+            if job.status == JobState.QUEUED:
+                # Still in the queue: the worker that picks it up drops it,
+                # but it stops counting against max_queued right away
+                with self._lock:
+                    self._queued -= 1
+                self._finish(job, JobState.CANCELLED, message="Cancelled")
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "concurrency": self.concurrency,
+            "max_queued": self.max_queued,
+            "queue_depth": self._queued,
+            "running": self._running,
+            "jobs": counts,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        # With a store, unfinished jobs stay queued on disk for the next start
+        self._shutting_down = True
+        for job in self.jobs():
+            if not job.is_finished:
+                self.cancel(job.id)
+        for _ in self._workers:
+            self._pending.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+
+        with self._result_service_lock:
+            if self._result_service is not None:
+                self._result_service.cleanup()
+                self._result_service = None
+
+    def _worker_loop(self) -> None:
+        service = self.service_factory(**self.service_options)
+        try:
+            while True:
+                job = self._pending.get()
+                if job is None:
+                    return
+                self._run_job(service, job)
+        finally:
+            service.cleanup()
+
+    def _run_job(self, service: EnhancedTranscriptionService, job: Job) -> None:
+        with job.lock:
+            if job.is_finished:
+                return
+            job.status = JobState.RUNNING
+            job.started_at = time.time()
+            with self._lock:
+                self._queued -= 1
+        self.persist(job)
+
+        def report(message: str, progress: float) -> None:
+            # The service reports at every stage, which is where a cancelled
+            # job stops
+            if job.cancel_requested.is_set():
+                raise JobCancelled(f"Job {job.id} was cancelled")
+            job.message = message
+            job.progress = float(progress)
+
+        with self._lock:
+            self._running += 1
+        service.progress_callback = report
+        # Also checked before each model call, so long files stop between
+        # windows rather than only between stages
+        service.cancel_event = job.cancel_requested
+        try:
+            result = service.transcribe_file(job.file_path, **job.options)
+        except Exception as e:
+            with job.lock:
+                if job.cancel_requested.is_set():
+                    self._finish(job, JobState.CANCELLED, message="Cancelled")
+                else:
+                    logger.error(f"❌ Job {job.id[:8]} failed: {e}")
+                    self._finish(job, JobState.FAILED, error=str(e))
+        else:
+            with job.lock:
+                job.result = result
+                self._finish(job, JobState.COMPLETED, message="Completed", progress=100)
+        finally:
+            service.progress_callback = None
+            service.cancel_event = None
+            with self._lock:
+                self._running -= 1
+
+    def _finish(
+        self,
+        job: Job,
+        status: str,
+        message: str = "",
+        error: Optional[str] = None,
+        progress: Optional[float] = None,
+    ) -> None:
+        job.status = status
+        job.message = message or job.message
+        job.error = error
+        if progress is not None:
+            job.progress = progress
+        job.finished_at = time.time()
+
+        if self._shutting_down and status == JobState.CANCELLED:
+            # Stopped by shutdown rather than by a client; the stored job is
+            # left as it was and its upload is kept so it can run again
+            return
+
+        self.persist(job)
+        if job.owns_file and status != JobState.COMPLETED:
+            job.file_path.unlink(missing_ok=True)
+        if job.on_finished is not None:
+            try:
+                job.on_finished(job)
+            except Exception as e:
+                logger.warning(f"Job {job.id[:8]} completion hook failed: {e}")
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            job = self._jobs.pop(job_id)
+            if job.owns_file:
+                job.file_path.unlink(missing_ok=True)
+            if self.store is not None:
+                self.store.delete(job_id)
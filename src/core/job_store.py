@@ -0,0 +1,109 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .json_utils import json_default
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    owns_file INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+"""
+
+_COLUMNS = (
+    "id",
+    "file_path",
+    "options",
+    "owns_file",
+    "status",
+    "progress",
+    "message",
+    "error",
+    "result",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+
+class JobStore:
+    # The server's jobs and their results, so a restart neither loses queued
+    # work nor the results clients have yet to fetch. Same WAL setup as the
+    # batch journal: every state change is committed before it is reported
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        self.db_path = Path(
+            db_path or Path.home() / ".cache" / "xscribe" / "server_jobs.sqlite3"
+        )
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Worker threads and request handlers all write through here
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        # A failed write must not fail the job; the worst case is that a
+        # restart runs it again or forgets its result
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update job store: {e}")
+
+    def save(self, job: Dict[str, Any]) -> None:
+        row = dict(job)
+        row["options"] = json.dumps(row["options"], default=json_default)
+        if row.get("result") is not None:
+            row["result"] = json.dumps(
+                row["result"], ensure_ascii=False, default=json_default
+            )
+        self._execute(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+            [row.get(column) for column in _COLUMNS],
+        )
+
+    def delete(self, job_id: str) -> None:
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def load(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY created_at"
+            ).fetchall()
+
+        jobs = []
+        for values in rows:
+            job = dict(zip(_COLUMNS, values))
+            try:
+                job["options"] = json.loads(job["options"])
+                job["result"] = json.loads(job["result"]) if job["result"] else None
+            except ValueError as e:
+                logger.warning(f"Dropping unreadable stored job {job['id']}: {e}")
+                self.delete(job["id"])
+                continue
+            job["owns_file"] = bool(job["owns_file"])
+            jobs.append(job)
+        return jobs
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,10 @@
+from typing import Any
+
+
+def json_default(value: Any) -> Any:
+    # Audio analysis and Whisper leave numpy scalars and arrays (and the odd
+    # tensor) in metadata, segments and words; tolist() turns all of them
+    # into native values so they come back as numbers, not strings
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
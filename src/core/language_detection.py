@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+from .model_registry import (
+    ModelRegistry,
+    get_model_registry,
+    inference_context,
+    resolve_device,
+)
+from .voice_activity import detect_speech_regions
+
+logger = logging.getLogger(__name__)
+
+DETECTION_MODEL_SIZE = "tiny"
+DETECTION_WINDOW_SECONDS = 30.0
+# About 100 bytes per entry, so the cache file stays in the low hundreds of KB
+DEFAULT_MAX_LANGUAGE_ENTRIES = 2000
+
+
+@dataclass
+class DetectedLanguage:
+    language: str
+    probability: float
+    model_size: str = DETECTION_MODEL_SIZE
+    cached: bool = False
+
+
+def first_speech_window(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    window_seconds: float = DETECTION_WINDOW_SECONDS,
+) -> np.ndarray:
+    # Leading silence or music would make the first 30 seconds useless for
+    # detection, so start at the first speech region
+    regions = detect_speech_regions(samples, sample_rate)
+    start = int(regions[0][0] * sample_rate) if regions else 0
+    return samples[start : start + int(window_seconds * sample_rate)]
+
+
+class LanguageCache:
+    def __init__(
+        self,
+        cache_path: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_MAX_LANGUAGE_ENTRIES,
+    ):
+        self.cache_path = Path(
+            cache_path or Path.home() / ".cache" / "xscribe" / "languages.json"
+        )
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, Dict]"] = None
+
+    def _load(self) -> "OrderedDict[str, Dict]":
+        # The file keeps entries in least- to most-recently-used order
+        if self._entries is None:
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._entries = OrderedDict(json.load(f))
+            except FileNotFoundError:
+                self._entries = OrderedDict()
+            except Exception as e:
+                logger.warning(f"Discarding unreadable language cache: {e}")
+                self._entries = OrderedDict()
+        return self._entries
+
+    def get(self, fingerprint: str) -> Optional[DetectedLanguage]:
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(fingerprint)
+            if entry is not None:
+                entries.move_to_end(fingerprint)
+        if entry is None:
+            return None
+        return DetectedLanguage(**{**entry, "cached": True})
+
+    def put(self, fingerprint: str, detected: DetectedLanguage) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[fingerprint] = {**asdict(detected), "cached": False}
+            entries.move_to_end(fingerprint)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.cache_path)
+            except Exception as e:
+                logger.warning(f"Could not write language cache: {e}")
+                tmp_path.unlink(missing_ok=True)
+
+
+class LanguageDetector:
+    def __init__(
+        self,
+        model_size: str = DETECTION_MODEL_SIZE,
+        device: Optional[str] = None,
+        precision: str = "fp32",
+        registry: Optional[ModelRegistry] = None,
+        cache: Optional[LanguageCache] = None,
+    ):
+        self.model_size = model_size
+        self.device = resolve_device(device)
+        self.precision = precision
+        self.registry = registry or get_model_registry()
+        self.cache = cache or get_language_cache()
+
+    def detect(
+        self, samples: np.ndarray, fingerprint: Optional[str] = None
+    ) -> DetectedLanguage:
+        if fingerprint:
+            cached = self.cache.get(fingerprint)
+            if cached is not None and cached.model_size == self.model_size:
+                logger.info(f"🌐 Cached language for this file: {cached.language}")
+                return cached
+
+        import whisper
+
+        window = first_speech_window(samples)
+        with self.registry.borrow(
+            self.model_size, self.device, self.precision
+        ) as model:
+            n_mels = getattr(getattr(model, "dims", None), "n_mels", 80)
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(window), n_mels=n_mels
+            ).to(model.device)
+            with inference_context(model, self.precision, self.device):
+                _, probs = model.detect_language(mel)
+
+        language = max(probs, key=probs.get)
+        detected = DetectedLanguage(
+            language=language,
+            probability=float(probs[language]),
+            model_size=self.model_size,
+        )
+        logger.info(
+            f"🌐 Detected language '{language}' ({detected.probability:.0%}) "
+            f"with the '{self.model_size}' model"
+        )
+
+        if fingerprint:
+            self.cache.put(fingerprint, detected)
+        return detected
+
+
+_language_cache: Optional[LanguageCache] = None
+_language_cache_lock = threading.Lock()
+
+
+def get_language_cache() -> LanguageCache:
+    global _language_cache
+    with _language_cache_lock:
+        if _language_cache is None:
+            _language_cache = LanguageCache()
+        return _language_cache
@@ -1,7 +1,7 @@
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import numpy as np
 
@@ -22,7 +22,42 @@ class ModelConfig:
     condition_on_previous_text: bool = True
     initial_prompt: str = ""
     suppress_tokens: str = ""
-    fp16: bool = False
+    # None keeps Whisper's default: fp16 on GPUs, fp32 on CPU
+    fp16: Optional[bool] = None
+    profile: str = "balanced"
+
+    def to_decode_options(self, device_type: str = "cpu") -> Dict[str, Any]:
+        # Maps the profile onto whisper.transcribe() keyword arguments. A
+        # beam of 1 means greedy decoding; patience is only valid with a beam
+        beam_size = self.beam_size if self.beam_size > 1 else None
+
+        # Keep Whisper's temperature fallback, starting from the profile's
+        # temperature, so a failed window can still be re-decoded
+        temperature = tuple(
+            round(t, 2) for t in np.arange(self.temperature, 1.0 + 1e-6, 0.2)
+        ) or (self.temperature,)
+
+        options: Dict[str, Any] = {
+            "temperature": temperature,
+            "beam_size": beam_size,
+            "best_of": self.best_of if self.best_of > 1 else None,
+            "patience": self.patience if beam_size else None,
+            # 1.0 is the neutral value here; Whisper's own neutral is None
+            "length_penalty": (
+                None if self.length_penalty == 1.0 else self.length_penalty
+            ),
+            "compression_ratio_threshold": self.compression_ratio_threshold,
+            "logprob_threshold": self.logprob_threshold,
+            "no_speech_threshold": self.no_speech_threshold,
+            "condition_on_previous_text": self.condition_on_previous_text,
+            "fp16": device_type != "cpu" and self.fp16 is not False,
+        }
+        if self.initial_prompt:
+            options["initial_prompt"] = self.initial_prompt
+        if self.suppress_tokens:
+            options["suppress_tokens"] = self.suppress_tokens
+
+        return options
 
     @classmethod
     def for_high_accuracy(cls) -> "ModelConfig":
@@ -36,6 +71,7 @@ class ModelConfig:
             logprob_threshold=-0.5,
             no_speech_threshold=0.7,
             condition_on_previous_text=True,
+            profile="accuracy",
         )
 
     @classmethod
@@ -48,6 +84,7 @@ class ModelConfig:
             compression_ratio_threshold=3.0,
             logprob_threshold=-1.5,
             no_speech_threshold=0.5,
+            profile="speed",
         )
 
     @classmethod
@@ -62,6 +99,7 @@ class ModelConfig:
             logprob_threshold=-0.3,
             no_speech_threshold=0.8,
             condition_on_previous_text=False,
+            profile="noisy",
         )
 
 
@@ -69,6 +107,7 @@ class ModelOptimizer:
     def __init__(self):
         self.performance_history = []
         self.optimal_configs = {}
+        self.profile_throughput: Dict[str, Dict[str, float]] = {}
 
     def select_optimal_model_size(
         self,
@@ -126,6 +165,7 @@ class ModelOptimizer:
             )
             config.no_speech_threshold = noisy_config.no_speech_threshold
             config.condition_on_previous_text = False
+            config.profile = f"{config.profile}+noisy"
 
         if duration > 1800:
             config.beam_size = min(config.beam_size, 5)
@@ -201,6 +241,38 @@ class ModelOptimizer:
 
         self._update_optimal_configs()
 
+    def record_decode_throughput(
+        self, config: ModelConfig, audio_seconds: float, decode_seconds: float
+    ) -> None:
+        if decode_seconds <= 0 or audio_seconds <= 0:
+            return
+
+        key = f"{config.model_size}/{config.profile}"
+        stats = self.profile_throughput.setdefault(
+            key, {"runs": 0, "audio_seconds": 0.0, "decode_seconds": 0.0}
+        )
+        stats["runs"] += 1
+        stats["audio_seconds"] += audio_seconds
+        stats["decode_seconds"] += decode_seconds
+        # Seconds of audio decoded per second of wall time
+        stats["realtime_factor"] = stats["audio_seconds"] / stats["decode_seconds"]
+
+        logger.info(
+            f"⏱️ {key}: {audio_seconds / decode_seconds:.1f}x realtime "
+            f"(avg {stats['realtime_factor']:.1f}x over {stats['runs']} runs)"
+        )
+
+    def get_profile_throughput(
+        self, profile: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        if profile is None:
+            return dict(self.profile_throughput)
+        return {
+            key: stats
+            for key, stats in self.profile_throughput.items()
+            if key.split("/", 1)[1] == profile
+        }
+
     def _update_optimal_configs(self) -> None:
         if len(self.performance_history) < 10:
             return
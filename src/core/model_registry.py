@@ -0,0 +1,443 @@
+import gc
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str, str]  # (model size, device, precision)
+
+DEFAULT_MEMORY_BUDGET_GB = 4.0
+
+# Approximate resident fp32 footprint, used before a model has been loaded
+MODEL_MEMORY_ESTIMATES_GB = {
+    "tiny": 0.15,
+    "base": 0.3,
+    "small": 1.0,
+    "medium": 3.0,
+    "large": 6.0,
+}
+
+# fp32 and bf16 share fp32 weights (bf16 is an autocast mode at inference
+# time); int8 swaps the Linear layers for dynamically quantized ones
+SUPPORTED_PRECISIONS = {"fp32", "bf16", "int8"}
+
+QUANTIZED_CACHE_DIR = Path.home() / ".cache" / "xscribe" / "quantized"
+
+
+@dataclass
+class RegistryEntry:
+    key: ModelKey
+    model: Any
+    size_bytes: int
+    refcount: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    load_time: float = 0.0
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    if device:
+        return device
+
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def bf16_supported() -> bool:
+    try:
+        import torch
+
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+def resolve_precision(precision: str, device: str) -> str:
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(
+            f"Unsupported precision '{precision}' "
+            f"(supported: {', '.join(sorted(SUPPORTED_PRECISIONS))})"
+        )
+
+    if precision != "fp32" and device != "cpu":
+        # GPUs already decode in fp16; these modes only target CPU inference
+        logger.warning(
+            f"⚠️ Precision '{precision}' is CPU-only, using fp32 on {device}"
+        )
+        return "fp32"
+    if precision == "bf16" and not bf16_supported():
+        logger.warning("⚠️ This CPU has no bf16 support, using fp32")
+        return "fp32"
+    return precision
+
+
+def weight_precision(precision: str) -> str:
+    return "int8" if precision == "int8" else "fp32"
+
+
+_model_locks: "weakref.WeakKeyDictionary[Any, threading.RLock]" = (
+    weakref.WeakKeyDictionary()
+)
+_model_locks_guard = threading.Lock()
+
+
+def model_lock(model: Any) -> threading.RLock:
+    # Whisper installs kv-cache hooks on the shared modules for every decode,
+    # so two threads must never run inference on the same model at once
+    with _model_locks_guard:
+        lock = _model_locks.get(model)
+        if lock is None:
+            lock = _model_locks[model] = threading.RLock()
+        return lock
+
+
+@contextmanager
+def inference_context(
+    model: Any, precision: str, device: str = "cpu"
+) -> Iterator[None]:
+    with model_lock(model):
+        with _precision_context(model, precision, device):
+            yield
+
+
+@contextmanager
+def _precision_context(model: Any, precision: str, device: str) -> Iterator[None]:
+    if precision != "bf16" or device != "cpu":
+        yield
+        return
+
+    import torch
+
+    # Whisper rejects audio features that are not fp32 when fp16=False, so
+    # the encoder output is cast back while everything else runs in bf16
+    handle = model.encoder.register_forward_hook(
+        lambda module, args, output: output.float()
+    )
+    try:
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            yield
+    finally:
+        handle.remove()
+
+
+def estimate_model_bytes(model: Any, model_size: Optional[str] = None) -> int:
+    try:
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        total += sum(b.numel() * b.element_size() for b in model.buffers())
+        # Dynamically quantized layers keep their int8 weights packed
+        # outside parameters()
+        for module in model.modules():
+            if hasattr(module, "_packed_params") and callable(
+                getattr(module, "weight", None)
+            ):
+                weight = module.weight()
+                total += weight.numel() * weight.element_size()
+        if total > 0:
+            return int(total)
+    except Exception:
+        pass
+
+    return int(MODEL_MEMORY_ESTIMATES_GB.get(model_size, 1.0) * 1024**3)
+
+
+def _quantized_cache_path(model_size: str) -> Path:
+    name = Path(model_size).stem if Path(model_size).suffix else model_size
+    return QUANTIZED_CACHE_DIR / f"{name}-int8.pt"
+
+
+def quantize_whisper_model(model: Any) -> Any:
+    import torch
+    from torch import nn
+
+    # Whisper's Linear subclass is rejected by quantize_dynamic, so swap in
+    # plain nn.Linear layers with the same weights first
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+                linear = nn.Linear(
+                    child.in_features, child.out_features, bias=child.bias is not None
+                )
+                linear.weight = child.weight
+                linear.bias = child.bias
+                setattr(parent, name, linear)
+
+    return torch.ao.quantization.quantize_dynamic(
+        model.eval(), {nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _load_quantized_model(model_size: str, download_root: Path) -> Any:
+    import torch
+    import whisper
+
+    # Conversion needs the fp32 weights once; later loads read the int8
+    # model straight from disk and never materialise fp32 weights
+    cache_path = _quantized_cache_path(model_size)
+    versions = {"whisper": whisper.__version__, "torch": torch.__version__}
+
+    if cache_path.exists():
+        try:
+            data = torch.load(cache_path, map_location="cpu", weights_only=False)
+            if data.get("versions") == versions:
+                logger.info(f"📦 Loaded int8 model from {cache_path.name}")
+                return data["model"]
+            logger.info("♻️ Quantized model cache is from another version")
+        except Exception as e:
+            logger.warning(f"Discarding unreadable quantized model: {e}")
+
+    model = whisper.load_model(
+        model_size, device="cpu", download_root=str(download_root)
+    )
+    logger.info(f"🗜️ Quantizing '{model_size}' linear layers to int8")
+    model = quantize_whisper_model(model)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        torch.save({"versions": versions, "model": model}, tmp_path)
+        tmp_path.replace(cache_path)
+    except Exception as e:
+        logger.warning(f"Could not cache quantized model: {e}")
+
+    return model
+
+
+def _load_whisper_model(model_size: str, device: str, precision: str) -> Any:
+    import whisper
+
+    download_root = Path.home() / ".cache" / "whisper"
+    download_root.mkdir(parents=True, exist_ok=True)
+
+    if precision == "int8":
+        return _load_quantized_model(model_size, download_root)
+
+    return whisper.load_model(
+        model_size, device=device, download_root=str(download_root)
+    )
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        memory_budget_gb: float = DEFAULT_MEMORY_BUDGET_GB,
+        loader: Optional[Callable[[str, str, str], Any]] = None,
+    ):
+        self.memory_budget_bytes = int(memory_budget_gb * 1024**3)
+        self._loader = loader or _load_whisper_model
+
+        self._entries: "OrderedDict[ModelKey, RegistryEntry]" = OrderedDict()
+        self._loading: set = set()
+        self._lock = threading.RLock()
+        self._condition = threading.Condition(self._lock)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        model_size: str, device: Optional[str] = None, precision: str = "fp32"
+    ) -> ModelKey:
+        device = resolve_device(device)
+        precision = weight_precision(resolve_precision(precision, device))
+        return (model_size, device, precision)
+
+    def set_memory_budget(self, memory_budget_gb: float) -> None:
+        with self._lock:
+            self.memory_budget_bytes = int(memory_budget_gb * 1024**3)
+            self._evict_to_budget()
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def is_resident(
+        self, model_size: str, device: Optional[str] = None, precision: str = "fp32"
+    ) -> bool:
+        with self._lock:
+            return self.make_key(model_size, device, precision) in self._entries
+
+    def acquire(
+        self, model_size: str, device: Optional[str] = None, precision: str = "fp32"
+    ) -> Any:
+        key = self.make_key(model_size, device, precision)
+
+        with self._condition:
+            while key in self._loading:
+                self._condition.wait()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                entry.last_used = time.time()
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.info(f"♻️ Reusing resident model {key} (refs: {entry.refcount})")
+                return entry.model
+
+            self.misses += 1
+            self._loading.add(key)
+
+        logger.info(f"🧠 Loading model {key} into registry")
+        load_start = time.time()
+        try:
+            model = self._loader(*key)
+        except Exception:
+            with self._condition:
+                self._loading.discard(key)
+                self._condition.notify_all()
+            raise
+
+        entry = RegistryEntry(
+            key=key,
+            model=model,
+            size_bytes=estimate_model_bytes(model, model_size),
+            refcount=1,
+            load_time=time.time() - load_start,
+        )
+
+        with self._condition:
+            self._loading.discard(key)
+            self._entries[key] = entry
+            self._evict_to_budget()
+            self._condition.notify_all()
+
+        logger.info(
+            f"✓ Model {key} loaded in {entry.load_time:.2f}s "
+            f"({entry.size_bytes / 1024**2:.0f}MB)"
+        )
+        return model
+
+    def release(self, model: Any) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.model is model:
+                    entry.refcount = max(0, entry.refcount - 1)
+                    entry.last_used = time.time()
+                    self._evict_to_budget()
+                    return
+
+        logger.debug("Released a model that is not tracked by the registry")
+
+    @contextmanager
+    def borrow(
+        self, model_size: str, device: Optional[str] = None, precision: str = "fp32"
+    ) -> Iterator[Any]:
+        model = self.acquire(model_size, device, precision)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def evict(self, key: ModelKey) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount > 0:
+                return False
+            self._drop(key)
+        self._free_memory()
+        return True
+
+    def clear_idle(self) -> int:
+        with self._lock:
+            idle = [key for key, e in self._entries.items() if e.refcount == 0]
+            for key in idle:
+                self._drop(key)
+        if idle:
+            self._free_memory()
+        return len(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resident_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "models": [
+                    {
+                        "model_size": e.key[0],
+                        "device": e.key[1],
+                        "precision": e.key[2],
+                        "refcount": e.refcount,
+                        "size_bytes": e.size_bytes,
+                        "load_time": e.load_time,
+                    }
+                    for e in self._entries.values()
+                ],
+            }
+
+    def _evict_to_budget(self) -> None:
+        # Least recently used idle models go first; borrowed models are never
+        # evicted even if that leaves the registry over budget
+        evicted = False
+        while sum(e.size_bytes for e in self._entries.values()) > (
+            self.memory_budget_bytes
+        ):
+            victim = next(
+                (key for key, e in self._entries.items() if e.refcount == 0), None
+            )
+            if victim is None:
+                logger.warning(
+                    "⚠️ Model registry over memory budget but all models are in use"
+                )
+                break
+            self._drop(victim)
+            evicted = True
+
+        if evicted:
+            self._free_memory()
+
+    def _drop(self, key: ModelKey) -> None:
+        entry = self._entries.pop(key)
+        self.evictions += 1
+        logger.info(f"🧹 Evicting model {key} from registry")
+        del entry
+
+    @staticmethod
+    def _free_memory() -> None:
+        gc.collect()
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def default_memory_budget_gb() -> float:
+    try:
+        from .hardware_monitor import HardwareMonitor
+
+        return HardwareMonitor().get_model_memory_budget_gb()
+    except Exception:
+        return DEFAULT_MEMORY_BUDGET_GB
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            # Sized from free RAM; the GUI overrides it with the
+            # "model_memory_budget_gb" config key when the user sets one
+            _registry = ModelRegistry(default_memory_budget_gb())
+            logger.info(
+                f"🧮 Model registry budget: "
+                f"{_registry.memory_budget_bytes / 1024**3:.1f}GB"
+            )
+        return _registry
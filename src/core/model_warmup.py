@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+from .model_registry import (
+    ModelRegistry,
+    get_model_registry,
+    inference_context,
+    resolve_device,
+    resolve_precision,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWarmup:
+    def __init__(
+        self,
+        model_size: str,
+        device: Optional[str] = None,
+        precision: str = "fp32",
+        registry: Optional[ModelRegistry] = None,
+        run_dummy_inference: bool = True,
+    ):
+        self.model_size = model_size
+        self.device = resolve_device(device)
+        self.precision = resolve_precision(precision, self.device)
+        self.registry = registry or get_model_registry()
+        self.run_dummy_inference = run_dummy_inference
+
+        self.key = ModelRegistry.make_key(model_size, self.device, self.precision)
+        self.error: Optional[str] = None
+        self.warmup_time = 0.0
+
+        self._model: Optional[Any] = None
+        self._cancelled = threading.Event()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set() and self._model is not None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> "ModelWarmup":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"model-warmup-{self.model_size}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._ready.wait(timeout)
+        return self.is_ready
+
+    def cancel(self) -> None:
+        if self._cancelled.is_set():
+            return
+        logger.info(f"🛑 Cancelling model warm-up for '{self.model_size}'")
+        self._cancelled.set()
+        self._drop_reference()
+
+    def hand_off(self) -> bool:
+        # The first job has taken its own reference from the registry, so the
+        # warm-up's pin is no longer needed to keep the model resident
+        if self._drop_reference():
+            logger.info(f"🤝 Warm model '{self.model_size}' handed to first job")
+            return True
+        return False
+
+    def _drop_reference(self) -> bool:
+        with self._lock:
+            model, self._model = self._model, None
+        if model is not None:
+            self.registry.release(model)
+            return True
+        return False
+
+    def _run(self) -> None:
+        start = time.time()
+        try:
+            logger.info(f"🔥 Preloading '{self.model_size}' model in background")
+            model = self.registry.acquire(self.model_size, self.device, self.precision)
+
+            with self._lock:
+                if self._cancelled.is_set():
+                    self.registry.release(model)
+                    return
+                self._model = model
+
+            if self.run_dummy_inference and not self._cancelled.is_set():
+                self._warm_kernels(model)
+
+            self.warmup_time = time.time() - start
+            logger.info(
+                f"✓ Model '{self.model_size}' warm and ready ({self.warmup_time:.2f}s)"
+            )
+        except Exception as e:
+            self.error = str(e)
+            logger.warning(f"Model warm-up failed: {e}")
+            self._drop_reference()
+        finally:
+            self._ready.set()
+
+    def _warm_kernels(self, model: Any) -> None:
+        # One second of silence is padded to a full 30s window, so this runs
+        # a complete encoder pass and a handful of decoder steps
+        options = {
+            "language": "en",
+            "verbose": None,
+            "condition_on_previous_text": False,
+            "without_timestamps": True,
+        }
+        if self.device == "cpu":
+            options["fp16"] = False
+
+        # The model is shared through the registry, so the dummy pass takes
+        # the model lock like any real decode (and warms bf16 autocast too)
+        with inference_context(model, self.precision, self.device):
+            model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), **options)
+
+
+_active_warmup: Optional[ModelWarmup] = None
+_warmup_lock = threading.Lock()
+
+
+def start_model_warmup(
+    model_size: str, device: Optional[str] = None, precision: str = "fp32"
+) -> ModelWarmup:
+    global _active_warmup
+    with _warmup_lock:
+        if _active_warmup is not None:
+            _active_warmup.cancel()
+        _active_warmup = ModelWarmup(model_size, device, precision).start()
+        return _active_warmup
+
+
+def get_active_warmup() -> Optional[ModelWarmup]:
+    return _active_warmup
+
+
+def claim_warm_model(
+    model_size: str, device: Optional[str] = None, precision: str = "fp32"
+) -> bool:
+    global _active_warmup
+    with _warmup_lock:
+        warmup = _active_warmup
+        if warmup is None:
+            return False
+        if warmup.key != ModelRegistry.make_key(model_size, device, precision):
+            return False
+        _active_warmup = None
+
+    # Whisper installs per-call hooks on the model, so the job must not share
+    # it with the dummy inference; that pass is short once the load is done
+    warmup.wait()
+    return warmup.hand_off()
+
+
+def cancel_model_warmup() -> None:
+    global _active_warmup
+    with _warmup_lock:
+        warmup, _active_warmup = _active_warmup, None
+    if warmup is not None:
+        warmup.cancel()
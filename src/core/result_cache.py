@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..models.transcription_result import TranscriptionResult
+from .json_utils import json_default
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+DEFAULT_MAX_CACHE_MB = 512
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024  # bytes sampled at start, middle and end
+
+
+def fingerprint_file(file_path: Union[str, Path]) -> str:
+    # Sampling three blocks plus the exact size keeps hour-long files to a
+    # few MB of reads while still changing whenever the content is edited
+    file_path = Path(file_path)
+    size = file_path.stat().st_size
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(size).encode())
+
+    with open(file_path, "rb") as f:
+        if size <= 3 * FINGERPRINT_BLOCK_SIZE:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2, size - FINGERPRINT_BLOCK_SIZE):
+                f.seek(offset)
+                digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_size_mb: float = DEFAULT_MAX_CACHE_MB,
+    ):
+        self.cache_dir = Path(
+            cache_dir or Path.home() / ".cache" / "xscribe" / "results"
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(fingerprint: str, config: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "fingerprint": fingerprint, "config": config},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            result = TranscriptionResult.from_dict(data)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch so eviction is least-recently-used rather than oldest-written
+        os.utime(path, None)
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = result.to_dict()
+        data["word_timestamps"] = result.word_timestamps
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=json_default)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write result cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict_to_limit()
+
+    def _entries(self):
+        return [p for p in self.cache_dir.glob("*/*.json") if p.is_file()]
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _evict_to_limit(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries()),
+                "size_bytes": self.size_bytes(),
+                "max_size_bytes": self.max_size_bytes,
+            }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -1,10 +1,12 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import librosa
 import numpy as np
 
+from .audio_buffer import AudioBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,12 +22,16 @@ class SpeakerDiarization:
         self.max_speakers = max_speakers
 
     def detect_speakers(
-        self, audio_path: str, segments: List[Dict[str, Any]]
+        self, audio: Union[str, AudioBuffer], segments: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         try:
-            logger.info(f"🎭 Starting speaker diarization for {Path(audio_path).name}")
-
-            y, sr = librosa.load(audio_path, sr=16000)
+            if isinstance(audio, AudioBuffer):
+                name = audio.source_path.name if audio.source_path else "buffer"
+                logger.info(f"🎭 Starting speaker diarization for {name}")
+                y, sr = audio.samples, audio.sample_rate
+            else:
+                logger.info(f"🎭 Starting speaker diarization for {Path(audio).name}")
+                y, sr = librosa.load(audio, sr=16000)
 
             segment_features = []
             for seg in segments:
@@ -143,7 +149,9 @@ class SpeakerDiarization:
 
 
 def add_speaker_labels(
-    audio_path: str, segments: List[Dict[str, Any]], n_speakers: Optional[int] = None
+    audio: Union[str, AudioBuffer],
+    segments: List[Dict[str, Any]],
+    n_speakers: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     diarizer = SpeakerDiarization(n_speakers=n_speakers)
-    return diarizer.detect_speakers(audio_path, segments)
+    return diarizer.detect_speakers(audio, segments)
@@ -0,0 +1,95 @@
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Span = Tuple[float, float]
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+SPAN_PADDING_SECONDS = 0.5
+SPAN_MERGE_GAP_SECONDS = 1.0
+
+
+def segment_confidence(segment: Dict[str, Any]) -> Optional[float]:
+    # Whisper's avg_logprob is the mean token log-probability, so exp() is the
+    # geometric-mean token probability; likely-silence and repetition loops
+    # (high compression ratio) are discounted on top of that
+    if segment.get("avg_logprob") is None:
+        return None
+
+    confidence = math.exp(min(0.0, float(segment["avg_logprob"])))
+
+    no_speech_prob = float(segment.get("no_speech_prob", 0.0))
+    if no_speech_prob > 0.5:
+        confidence *= 1.0 - no_speech_prob
+
+    if float(segment.get("compression_ratio", 0.0)) > 2.4:
+        confidence *= 0.5
+
+    return max(0.0, min(1.0, confidence))
+
+
+def find_low_confidence_spans(
+    segments: List[Dict[str, Any]],
+    threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    duration: Optional[float] = None,
+    padding: float = SPAN_PADDING_SECONDS,
+    merge_gap: float = SPAN_MERGE_GAP_SECONDS,
+) -> List[Span]:
+    spans: List[Span] = []
+    for segment in segments:
+        confidence = segment.get("confidence")
+        if confidence is None:
+            confidence = segment_confidence(segment)
+        if confidence is None or confidence >= threshold:
+            continue
+
+        start = max(0.0, float(segment["start"]) - padding)
+        end = float(segment["end"]) + padding
+        if duration is not None:
+            end = min(duration, end)
+
+        if spans and start - spans[-1][1] <= merge_gap:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+
+    return spans
+
+
+def splice_segments(
+    draft_segments: List[Dict[str, Any]],
+    redecoded: List[Tuple[Span, List[Dict[str, Any]]]],
+) -> List[Dict[str, Any]]:
+    # Within each re-decoded span the large model's segments replace the
+    # draft's; a segment belongs to whichever side its midpoint falls on
+    def midpoint(segment: Dict[str, Any]) -> float:
+        return (float(segment["start"]) + float(segment["end"])) / 2
+
+    def in_span(segment: Dict[str, Any], span: Span) -> bool:
+        return span[0] <= midpoint(segment) < span[1]
+
+    spans = [span for span, _ in redecoded]
+    kept = [
+        segment
+        for segment in draft_segments
+        if not any(in_span(segment, span) for span in spans)
+    ]
+
+    for span, segments in redecoded:
+        for segment in segments:
+            if in_span(segment, span):
+                segment = dict(segment)
+                segment["start"] = max(span[0], float(segment["start"]))
+                segment["end"] = min(span[1], float(segment["end"]))
+                kept.append(segment)
+
+    kept.sort(key=lambda s: float(s["start"]))
+    for index, segment in enumerate(kept):
+        # Spans are padded, so trim re-decoded segments against neighbours
+        if index and segment["start"] < kept[index - 1]["end"]:
+            segment["start"] = kept[index - 1]["end"]
+            segment["end"] = max(segment["end"], segment["start"])
+        segment["id"] = index
+    return kept
@@ -0,0 +1,151 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Setting this to a path records every span and writes a Chrome trace there
+# when the process finishes (GUI) or the batch ends (CLI)
+TRACE_ENV_VAR = "XSCRIBE_TRACE"
+
+# A few hundred spans per file; this covers very large batches and stops a
+# forgotten trace from growing without bound
+MAX_TRACE_EVENTS = 500_000
+
+# Spans finished while a file is being worked on add their time here; each
+# pipeline stage binds its file's dict on whichever thread it runs
+_file_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = (
+    contextvars.ContextVar("xscribe_file_timings", default=None)
+)
+
+
+class Tracer:
+    # Collects complete ("X") trace events from every thread in the process.
+    # Timestamps are wall-clock microseconds, so traces from worker processes
+    # line up when merged into one file
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration: float,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start * 1e6, 1),
+            "dur": round(duration * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+
+        with self._lock:
+            if len(self._events) >= MAX_TRACE_EVENTS:
+                if not self._dropped:
+                    logger.warning("⚠️ Trace buffer full, dropping further spans")
+                self._dropped += 1
+                return
+            self._events.append(event)
+            self._thread_names.setdefault((event["pid"], thread.ident), thread.name)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        # Hands the events over (e.g. from a worker process to the parent)
+        with self._lock:
+            events = self._events
+            events.extend(self._thread_name_events())
+            self._events = []
+            self._thread_names = {}
+        return events
+
+    def extend(self, events: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._events.extend(events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events = []
+            self._thread_names = {}
+            self._dropped = 0
+
+    def _thread_name_events(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for (pid, tid), name in self._thread_names.items()
+        ]
+
+    def export_chrome_trace(self, path: Union[str, Path]) -> Path:
+        # Loads in chrome://tracing and Perfetto
+        path = Path(path)
+        with self._lock:
+            events = self._events + self._thread_name_events()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        logger.info(f"🧭 Wrote {len(events)} trace events to {path}")
+        return path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV_VAR)))
+    return _tracer
+
+
+@contextmanager
+def span(name: str, category: str = "pipeline", **args: Any) -> Iterator[None]:
+    # Cheap enough to leave in place: two clock reads, plus an event append
+    # when the tracer is on. Nested spans are counted inside their parents
+    start = time.time()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        timings = _file_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + duration
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.add(name, category, start, duration, args)
+
+
+@contextmanager
+def trace_file(timings: Dict[str, float]) -> Iterator[Dict[str, float]]:
+    token = _file_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _file_timings.reset(token)
+
+
+def rounded_timings(timings: Dict[str, float]) -> Dict[str, float]:
+    # What goes into TranscriptionResult.metadata["timings"]
+    return {name: round(seconds, 4) for name, seconds in timings.items()}
@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .chunked_transcription import AudioChunk
+from .json_utils import json_default
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class TranscriptionCheckpoint:
+    def __init__(self, key: str, checkpoint_dir: Optional[Union[str, Path]] = None):
+        self.key = key
+        self.checkpoint_dir = Path(
+            checkpoint_dir or Path.home() / ".cache" / "xscribe" / "checkpoints"
+        )
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        self._chunks: List[Dict[str, float]] = []
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.checkpoint_dir / f"{self.key}.json"
+
+    def load(self, chunks: List[AudioChunk]) -> Dict[int, Dict[str, Any]]:
+        # Completed windows are only reused if the window plan is identical;
+        # otherwise their timestamps would not line up with this run
+        self._chunks = [asdict(chunk) for chunk in chunks]
+        self._results = {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Discarding unreadable checkpoint {self.path.name}: {e}")
+            self.clear()
+            return {}
+
+        if (
+            data.get("version") != CHECKPOINT_VERSION
+            or data.get("key") != self.key
+            or data.get("chunks") != self._chunks
+        ):
+            logger.info("♻️ Checkpoint does not match this run, starting over")
+            self.clear()
+            return {}
+
+        self._results = {
+            int(index): result for index, result in data.get("results", {}).items()
+        }
+        if self._results:
+            logger.info(
+                f"⏩ Resuming from checkpoint: {len(self._results)}/{len(chunks)} "
+                "windows already transcribed"
+            )
+        return dict(self._results)
+
+    def save(self, index: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._results[index] = {
+                "text": result.get("text", ""),
+                "segments": result.get("segments", []),
+                "language": result.get("language"),
+            }
+            data = {
+                "version": CHECKPOINT_VERSION,
+                "key": self.key,
+                "chunks": self._chunks,
+                "results": self._results,
+            }
+
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, default=json_default)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"Could not write checkpoint: {e}")
+                tmp_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -1,21 +1,150 @@
+import functools
+import itertools
 import logging
 import os
+import threading
 import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
+import numpy as np
 import torch
-import whisper
 
 from ..models.transcription_result import TranscriptionResult, TranscriptionSegment
+from .audio_buffer import SAMPLE_RATE, AudioBuffer
 from .audio_enhancer import AudioEnhancer
-from .audio_processor import AudioProcessor
+from .audio_processor import MAX_DURATION_SECONDS, AudioProcessor
+from .audio_stream import (
+    STREAM_WINDOW_SECONDS as BOUNDED_WINDOW_SECONDS,
+    StreamWindower,
+    decode_pcm_blocks,
+    iter_windows,
+)
+from .batched_inference import DEFAULT_BATCH_SIZE, BatchedDecoder, fits_single_window
+from .chunked_transcription import (
+    DEFAULT_CHUNK_SECONDS,
+    ChunkedTranscriber,
+    ChunkStitcher,
+    offset_segments,
+    plan_chunks,
+    stitch_chunk_results,
+)
+from .language_detection import DetectedLanguage, LanguageDetector
 from .model_optimizer import ModelConfig, ModelOptimizer
+from .model_registry import (
+    get_model_registry,
+    inference_context,
+    resolve_device,
+    resolve_precision,
+)
+from .model_warmup import claim_warm_model
+from .result_cache import ResultCache, fingerprint_file, get_result_cache
+from .speculative_transcription import (
+    DEFAULT_CONFIDENCE_THRESHOLD,
+    find_low_confidence_spans,
+    segment_confidence,
+    splice_segments,
+)
 from .subtitle_generator import SubtitleGenerator
 from .text_processor import TextPostProcessor
+from .tracing import rounded_timings, span, trace_file
+from .transcription_checkpoint import TranscriptionCheckpoint
+from .voice_activity import SpeechTimeline, VADConfig, compact_speech
+from .word_alignment import align_segments, is_covered, merge_ranges
 
 logger = logging.getLogger(__name__)
 
+# Stream windows are cut at silence near this length so each one fits in a
+# single 30-second Whisper decode window
+STREAM_WINDOW_SECONDS = 24.0
+STREAM_SEARCH_SECONDS = 5.0
+
+# Below this much silence the VAD stage passes audio through untouched; the
+# saved decode time would not cover the cost of remapping timestamps
+MIN_VAD_SKIP_FRACTION = 0.1
+
+# Files longer than this are decoded window by window with each finished
+# window checkpointed to disk, so a crash or quit can resume mid-file
+CHECKPOINT_MIN_SECONDS = 600.0
+CHECKPOINT_WINDOW_SECONDS = DEFAULT_CHUNK_SECONDS
+
+
+class TranscriptionCancelled(Exception):
+    pass
+
+
+@dataclass
+class TranscriptionWork:
+    # One file's state as it moves through the decode, enhance, inference and
+    # finalize stages; each stage fills in its part and may free the last one's
+    file_path: Path
+    language: Optional[str]
+    domain: Optional[str]
+    accuracy_priority: str
+    enable_enhancements: bool
+    start_time: float = field(default_factory=time.time)
+    cache_key: Optional[str] = None
+    result: Optional[TranscriptionResult] = None
+    audio_buffer: Optional[AudioBuffer] = None
+    detected_language: Optional[DetectedLanguage] = None
+    audio_characteristics: Dict[str, Any] = field(default_factory=dict)
+    enhanced_audio: Optional[np.ndarray] = None
+    optimal_config: Optional[ModelConfig] = None
+    checkpoint: Optional[TranscriptionCheckpoint] = None
+    raw_result: Optional[Dict[str, Any]] = None
+    speech_timeline: Optional[SpeechTimeline] = None
+    transcription_time: float = 0.0
+    # Seconds per span name, across every stage; ends up in the result's
+    # metadata["timings"]
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def decode_language(self) -> Optional[str]:
+        if self.detected_language is not None:
+            return self.detected_language.language
+        return self.language
+
+
+def _traced_stage(name: str):
+    # Binds the file's timings for the whole stage, whichever thread runs it,
+    # and refreshes the breakdown on the result once the stage has ended
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, work: TranscriptionWork, *args, **kwargs):
+            try:
+                with trace_file(work.timings), span(
+                    name, "stage", file=work.file_path.name
+                ):
+                    return method(self, work, *args, **kwargs)
+            finally:
+                if work.result is not None:
+                    work.result.metadata["timings"] = rounded_timings(work.timings)
+
+        return wrapper
+
+    return decorator
+
+
+@dataclass
+class _BatchedClip:
+    # A short file waiting for, then coming out of, a shared encoder pass
+    index: int
+    file_path: Path
+    cache_key: Optional[str]
+    start_time: float
+    audio_buffer: AudioBuffer
+    audio_characteristics: Dict[str, Any]
+    detected_language: Optional[DetectedLanguage]
+    config: Optional[ModelConfig]
+    model_input: Any = None
+    timeline: Optional[SpeechTimeline] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    raw_result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    redecoded: bool = False
+    transcription_time: float = 0.0
+
 
 class EnhancedTranscriptionService:
     def __init__(
@@ -27,6 +156,21 @@ class EnhancedTranscriptionService:
         enable_text_processing: bool = True,
         enable_speaker_detection: bool = False,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        enable_parallel_chunks: bool = False,
+        chunk_workers: Optional[int] = None,
+        enable_result_cache: bool = True,
+        result_cache: Optional[ResultCache] = None,
+        enable_vad: bool = False,
+        vad_config: Optional[VADConfig] = None,
+        enable_checkpoints: bool = False,
+        checkpoint_dir: Optional[Union[str, Path]] = None,
+        precision: str = "fp32",
+        draft_model_size: Optional[str] = None,
+        draft_confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        enable_language_predetection: bool = False,
+        bounded_memory: bool = False,
+        word_timestamps: bool = True,
+        cancel_event: Optional[threading.Event] = None,
     ):
         self.model_size = model_size
         self.device = device
@@ -35,9 +179,28 @@ class EnhancedTranscriptionService:
         self.enable_text_processing = enable_text_processing
         self.enable_speaker_detection = enable_speaker_detection
         self.progress_callback = progress_callback
+        self.enable_parallel_chunks = enable_parallel_chunks
+        self.chunk_workers = chunk_workers
+        self.enable_result_cache = enable_result_cache
+        self._result_cache = result_cache
+        self.enable_vad = enable_vad
+        self.vad_config = vad_config or VADConfig()
+        self.enable_checkpoints = enable_checkpoints
+        self.checkpoint_dir = checkpoint_dir
+        self.precision = resolve_precision(precision, resolve_device(device))
+        self.draft_model_size = draft_model_size
+        self.draft_confidence_threshold = draft_confidence_threshold
+        self.enable_language_predetection = enable_language_predetection
+        self._language_detector: Optional[LanguageDetector] = None
+        self.bounded_memory = bounded_memory
+        self.word_timestamps = word_timestamps
+        # Checked before every model call (each chunk, window or re-decoded
+        # span), so a set event stops the file at the next one
+        self.cancel_event = cancel_event
 
         self._transcriber = None
         self._loaded_model_size = None
+        self._chunked_transcriber: Optional[ChunkedTranscriber] = None
         self._audio_processor = AudioProcessor()
 
         if enable_audio_enhancement:
@@ -77,11 +240,16 @@ class EnhancedTranscriptionService:
                     f"�🔍 TRANSCRIPTION SERVICE: Loading Whisper model '{self.model_size}'"
                 )
 
-            device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
-            self._transcriber = whisper.load_model(
-                self.model_size, device=device, download_root=str(self.cache_dir)
-            )
-            self._loaded_model_size = self.model_size
+            # Borrow from the process-wide registry so back-to-back jobs on the
+            # same model skip whisper.load_model entirely
+            with span("model_load", model=self.model_size):
+                self._release_model()
+                device = resolve_device(self.device)
+                self._transcriber = get_model_registry().acquire(
+                    self.model_size, device=device, precision=self.precision
+                )
+                self._loaded_model_size = self.model_size
+                claim_warm_model(self.model_size, device, self.precision)
 
             print(
                 f"✓ TRANSCRIPTION SERVICE: Model '{self.model_size}' loaded successfully"
@@ -92,6 +260,233 @@ class EnhancedTranscriptionService:
 
         return self._transcriber
 
+    @property
+    def result_cache(self) -> ResultCache:
+        if self._result_cache is None:
+            self._result_cache = get_result_cache()
+        return self._result_cache
+
+    @property
+    def language_detector(self) -> LanguageDetector:
+        if self._language_detector is None:
+            self._language_detector = LanguageDetector(
+                device=self.device, precision=self.precision
+            )
+        return self._language_detector
+
+    def detect_language(
+        self, file_path: Union[str, Path], audio_buffer: Optional[AudioBuffer] = None
+    ) -> Optional[DetectedLanguage]:
+        # Language is detected once per file with the resident tiny model
+        # rather than by whichever (possibly much larger) model decodes it
+        if not self.enable_language_predetection:
+            return None
+
+        try:
+            if audio_buffer is None:
+                audio_buffer = self.load_audio(file_path)
+            with span("language_detection"):
+                return self.language_detector.detect(
+                    audio_buffer.samples, fingerprint_file(Path(file_path))
+                )
+        except Exception as e:
+            logger.warning(f"Language pre-detection failed: {e}")
+            return None
+
+    def _result_cache_key(
+        self,
+        file_path: Path,
+        language: Optional[str],
+        domain: Optional[str],
+        accuracy_priority: str,
+        enable_enhancements: bool,
+    ) -> str:
+        text_config = None
+        if enable_enhancements and self.enable_text_processing:
+            text_config = asdict(self.text_processor.config)
+
+        config = {
+            "model_size": self.model_size,
+            "language": language,
+            "domain": domain,
+            "accuracy_priority": accuracy_priority,
+            "enable_enhancements": enable_enhancements,
+            "audio_enhancement": self.enable_audio_enhancement,
+            "model_optimization": self.enable_model_optimization,
+            "speaker_detection": self.enable_speaker_detection,
+            "parallel_chunks": self.enable_parallel_chunks,
+            "precision": self.precision,
+            "draft_model": self.draft_model_size,
+            "draft_threshold": (
+                self.draft_confidence_threshold if self.draft_model_size else None
+            ),
+            "vad": asdict(self.vad_config) if self.enable_vad else None,
+            "text_processing": text_config,
+            "bounded_memory": self.bounded_memory,
+            "language_predetection": self.enable_language_predetection,
+        }
+        return ResultCache.make_key(fingerprint_file(file_path), config)
+
+    def _model_is_fixed(self, enable_enhancements: bool) -> bool:
+        # With model optimization the decoding model is only chosen after the
+        # audio has been analysed, so the cache key has to wait until then
+        return not (enable_enhancements and self.enable_model_optimization)
+
+    def _lookup_cached_result(
+        self,
+        file_path: Path,
+        language: Optional[str],
+        domain: Optional[str],
+        accuracy_priority: str,
+        enable_enhancements: bool,
+    ) -> tuple[Optional[str], Optional[TranscriptionResult]]:
+        if not self.enable_result_cache:
+            return None, None
+
+        try:
+            cache_key = self._result_cache_key(
+                file_path, language, domain, accuracy_priority, enable_enhancements
+            )
+            cached_result = self.result_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Result cache lookup failed: {e}")
+            return None, None
+
+        if cached_result is not None:
+            logger.info(f"⚡ Result cache hit for {file_path.name}")
+            cached_result.file_path = file_path
+            cached_result.metadata["cache_hit"] = True
+
+        return cache_key, cached_result
+
+    def _open_checkpoint(
+        self,
+        file_path: Path,
+        language: Optional[str],
+        domain: Optional[str],
+        accuracy_priority: str,
+        enable_enhancements: bool,
+    ) -> Optional[TranscriptionCheckpoint]:
+        # Keyed like the result cache, after any model switch, so a resumed
+        # run only reuses windows decoded with the same model and settings
+        if not self.enable_checkpoints:
+            return None
+
+        try:
+            key = self._result_cache_key(
+                file_path, language, domain, accuracy_priority, enable_enhancements
+            )
+            return TranscriptionCheckpoint(key, self.checkpoint_dir)
+        except Exception as e:
+            logger.warning(f"Checkpointing disabled for this file: {e}")
+            return None
+
+    def _analyze_and_enhance(
+        self,
+        audio_buffer: AudioBuffer,
+        enable_enhancements: bool,
+        accuracy_priority: str,
+    ) -> tuple[Dict[str, Any], Optional[np.ndarray]]:
+        if self.progress_callback:
+            self.progress_callback("Analyzing audio quality...", 25.0)
+
+        audio_characteristics: Dict[str, Any] = {}
+        enhanced_audio = None
+
+        if enable_enhancements and self.enable_audio_enhancement:
+            with span("analysis"):
+                audio_characteristics = self.audio_enhancer.analyze_audio_quality(
+                    audio_buffer
+                )
+            quality_score = audio_characteristics.get("quality_score", 75)
+
+            logger.info(f"📊 Audio quality score: {quality_score:.1f}/100")
+
+            enhancement_options = self._enhancement_options(
+                quality_score, accuracy_priority
+            )
+            if enhancement_options is not None:
+                logger.info("🎵 Applying audio enhancements")
+                if self.progress_callback:
+                    self.progress_callback("Enhancing audio quality...", 40.0)
+
+                with span("enhancement"):
+                    enhanced_audio, _ = self.audio_enhancer.enhance_audio(
+                        audio_buffer,
+                        **enhancement_options,
+                        trim_silence=not self.enable_vad,
+                    )
+
+        return audio_characteristics, enhanced_audio
+
+    @staticmethod
+    def _enhancement_options(
+        quality_score: float, accuracy_priority: str
+    ) -> Optional[Dict[str, Any]]:
+        if quality_score >= 80 and accuracy_priority != "accuracy":
+            return None
+        return {
+            "enable_noise_reduction": True,
+            "enable_speech_enhancement": True,
+            "enable_normalization": True,
+            "noise_reduction_strength": 0.6 if quality_score < 60 else 0.4,
+        }
+
+    def _select_config(
+        self,
+        audio_characteristics: Dict[str, Any],
+        accuracy_priority: str,
+        domain: Optional[str],
+        enable_enhancements: bool,
+    ) -> Optional[ModelConfig]:
+        if not (enable_enhancements and self.enable_model_optimization):
+            return None
+
+        if self.progress_callback:
+            self.progress_callback("Optimizing model configuration...", 50.0)
+
+        optimal_config = self.model_optimizer.optimize_config_for_audio(
+            audio_characteristics, accuracy_priority
+        )
+
+        if optimal_config.model_size != self.model_size:
+            logger.info(f"🧠 Switching to optimal model: {optimal_config.model_size}")
+            self._release_model()
+            self.model_size = optimal_config.model_size
+
+        if domain:
+            optimal_config.initial_prompt = (
+                self.model_optimizer.create_domain_specific_prompt(domain)
+            )
+
+        return optimal_config
+
+    def _post_process_text(
+        self,
+        result: Dict[str, Any],
+        domain: Optional[str],
+        enable_enhancements: bool,
+    ) -> Dict[str, Any]:
+        if enable_enhancements and self.enable_text_processing and result:
+            if self.progress_callback:
+                self.progress_callback("Post-processing text...", 85.0)
+
+            logger.info("📝 Applying text post-processing")
+
+            with span("text_processing"):
+                if "segments" in result and result["segments"]:
+                    processed_segments = self.text_processor.batch_process(
+                        result["segments"], domain
+                    )
+                    result["segments"] = processed_segments
+
+                if "text" in result:
+                    result["text"] = self.text_processor.process_text(
+                        result["text"], domain
+                    )
+
+        return result
+
     def transcribe_file(
         self,
         file_path: Union[str, Path],
@@ -100,195 +495,1113 @@ class EnhancedTranscriptionService:
         accuracy_priority: str = "balanced",
         enable_enhancements: bool = True,
     ) -> TranscriptionResult:
+        work = self.prepare_file(
+            file_path, language, domain, accuracy_priority, enable_enhancements
+        )
+        if work.result is not None:
+            return work.result
+
+        if self.bounded_memory:
+            return self._transcribe_file_bounded(
+                work.file_path,
+                language,
+                domain,
+                accuracy_priority,
+                enable_enhancements,
+                work.cache_key,
+                work.start_time,
+            )
+
+        self.decode_audio(work)
+
+        try:
+            self.enhance_audio(work)
+            self.run_inference(work)
+            if work.result is not None:
+                return work.result  # Cached under the selected model
+            return self.finalize_result(work)
+        except Exception as e:
+            raise self.transcription_error(e)
+
+    # The stages below are what transcribe_file runs in order; the batch
+    # pipeline runs them on separate threads so files overlap
+
+    def prepare_file(
+        self,
+        file_path: Union[str, Path],
+        language: Optional[str] = None,
+        domain: Optional[str] = None,
+        accuracy_priority: str = "balanced",
+        enable_enhancements: bool = True,
+    ) -> TranscriptionWork:
         file_path = Path(file_path)
 
         if not file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
 
         logger.info(f"🚀 Starting enhanced transcription of: {file_path.name}")
-        start_time = time.time()
+        work = TranscriptionWork(
+            file_path, language, domain, accuracy_priority, enable_enhancements
+        )
 
-        try:
+        if self._model_is_fixed(enable_enhancements):
+            with trace_file(work.timings):
+                self._lookup_work_result(work)
+        return work
+
+    def _lookup_work_result(self, work: TranscriptionWork) -> None:
+        with span("cache_lookup", file=work.file_path.name):
+            work.cache_key, work.result = self._lookup_cached_result(
+                work.file_path,
+                work.language,
+                work.domain,
+                work.accuracy_priority,
+                work.enable_enhancements,
+            )
+        if work.result is not None:
+            # The stored breakdown belongs to the run that filled the cache
+            work.result.metadata["timings"] = rounded_timings(work.timings)
             if self.progress_callback:
-                self.progress_callback("Analyzing audio quality...", 25.0)
+                self.progress_callback("Loaded cached transcription", 100.0)
+
+    @_traced_stage("decode")
+    def decode_audio(self, work: TranscriptionWork) -> None:
+        with span("load_audio"):
+            work.audio_buffer = self.load_audio(work.file_path)
+        if work.language is None:
+            work.detected_language = self.detect_language(
+                work.file_path, work.audio_buffer
+            )
 
-            audio_characteristics = {}
-            enhanced_audio = None
+    @_traced_stage("enhance")
+    def enhance_audio(self, work: TranscriptionWork) -> None:
+        work.audio_characteristics, work.enhanced_audio = self._analyze_and_enhance(
+            work.audio_buffer, work.enable_enhancements, work.accuracy_priority
+        )
 
-            if enable_enhancements and self.enable_audio_enhancement:
-                audio_characteristics = self.audio_enhancer.analyze_audio_quality(
-                    str(file_path)
-                )
-                quality_score = audio_characteristics.get("quality_score", 75)
+    @_traced_stage("infer")
+    def run_inference(self, work: TranscriptionWork) -> None:
+        work.optimal_config = self._select_config(
+            work.audio_characteristics,
+            work.accuracy_priority,
+            work.domain,
+            work.enable_enhancements,
+        )
+        if work.cache_key is None and not self._model_is_fixed(
+            work.enable_enhancements
+        ):
+            self._lookup_work_result(work)
+            if work.result is not None:
+                work.audio_buffer = work.enhanced_audio = None
+                return
+
+        if self.progress_callback:
+            self.progress_callback("Transcribing audio...", 60.0)
+
+        transcription_start = time.time()
+
+        # Enhanced audio is already 16 kHz mono, so it goes to Whisper in
+        # memory rather than through a temporary WAV and another ffmpeg pass
+        model_input = (
+            work.enhanced_audio
+            if work.enhanced_audio is not None
+            else work.audio_buffer.samples
+        )
+        work.checkpoint = self._open_checkpoint(
+            work.file_path,
+            work.language,
+            work.domain,
+            work.accuracy_priority,
+            work.enable_enhancements,
+        )
+        with span("inference"):
+            result, work.speech_timeline = self._transcribe_speech(
+                model_input, work.decode_language, work.optimal_config, work.checkpoint
+            )
+        # Only the original samples are needed from here on
+        work.enhanced_audio = None
+
+        work.transcription_time = time.time() - transcription_start
+        if work.detected_language is not None:
+            result["language_probability"] = work.detected_language.probability
+
+        if work.optimal_config is not None:
+            decoded_seconds = (
+                work.speech_timeline.speech_seconds
+                if work.speech_timeline is not None
+                else work.audio_buffer.duration
+            )
+            self.model_optimizer.record_decode_throughput(
+                work.optimal_config, decoded_seconds, work.transcription_time
+            )
+        work.raw_result = result
 
-                logger.info(f"📊 Audio quality score: {quality_score:.1f}/100")
+    @_traced_stage("finalize")
+    def finalize_result(self, work: TranscriptionWork) -> TranscriptionResult:
+        result = self._post_process_text(
+            work.raw_result, work.domain, work.enable_enhancements
+        )
+        optimal_config = work.optimal_config
+        speech_timeline = work.speech_timeline
 
-                if quality_score < 80 or accuracy_priority == "accuracy":
-                    logger.info("🎵 Applying audio enhancements")
-                    if self.progress_callback:
-                        self.progress_callback("Enhancing audio quality...", 40.0)
+        processing_time = time.time() - work.start_time
 
-                    enhanced_audio, _ = self.audio_enhancer.enhance_audio(
-                        str(file_path),
-                        enable_noise_reduction=True,
-                        enable_speech_enhancement=True,
-                        enable_normalization=True,
-                        noise_reduction_strength=0.6 if quality_score < 60 else 0.4,
-                    )
+        if self.progress_callback:
+            self.progress_callback("Finalizing results...", 95.0)
 
-            optimal_config = None
-            if enable_enhancements and self.enable_model_optimization:
-                if self.progress_callback:
-                    self.progress_callback("Optimizing model configuration...", 50.0)
+        transcription_result = self._create_enhanced_result(
+            result,
+            processing_time,
+            work.transcription_time,
+            work.audio_characteristics,
+            work.file_path,
+            work.audio_buffer,
+        )
 
-                optimal_config = self.model_optimizer.optimize_config_for_audio(
-                    audio_characteristics, accuracy_priority
-                )
+        if optimal_config is not None:
+            transcription_result.metadata["decoding_profile"] = optimal_config.profile
 
-                if optimal_config.model_size != self.model_size:
-                    logger.info(
-                        f"🧠 Switching to optimal model: {optimal_config.model_size}"
-                    )
-                    self._transcriber = None
-                    self.model_size = optimal_config.model_size
+        if result.get("two_pass"):
+            transcription_result.metadata["two_pass"] = result["two_pass"]
 
-                if domain:
-                    optimal_config.initial_prompt = (
-                        self.model_optimizer.create_domain_specific_prompt(domain)
-                    )
+        if work.detected_language is not None:
+            transcription_result.metadata["language_detection"] = asdict(
+                work.detected_language
+            )
 
-            if self.progress_callback:
-                self.progress_callback("Transcribing audio...", 60.0)
+        if speech_timeline is not None:
+            transcription_result.metadata["vad"] = {
+                "speech_seconds": speech_timeline.speech_seconds,
+                "skipped_fraction": speech_timeline.skipped_fraction,
+                "speech_regions": len(speech_timeline.regions),
+            }
 
-            transcription_start = time.time()
+        if (
+            work.enable_enhancements
+            and self.enable_model_optimization
+            and optimal_config
+        ):
+            quality_metrics = {
+                "text_length": len(transcription_result.full_text),
+                "segment_count": len(transcription_result.segments),
+                "avg_confidence": transcription_result.average_confidence or 0.0,
+            }
 
-            if enhanced_audio is not None:
-                import tempfile
+            audio_duration = work.audio_characteristics.get(
+                "duration", work.audio_buffer.duration
+            )
 
-                import soundfile as sf
+            self.model_optimizer.monitor_performance(
+                optimal_config, processing_time, audio_duration, quality_metrics
+            )
 
-                with tempfile.NamedTemporaryFile(
-                    suffix=".wav", delete=False
-                ) as tmp_file:
-                    sf.write(tmp_file.name, enhanced_audio, 16000)
-                    temp_audio_path = tmp_file.name
+        if work.cache_key is not None:
+            transcription_result.metadata["result_cache_key"] = work.cache_key
+            self.result_cache.put(work.cache_key, transcription_result)
+        if work.checkpoint is not None:
+            work.checkpoint.clear()
 
-                try:
-                    result = self._transcribe_with_config(
-                        temp_audio_path, language, optimal_config
-                    )
-                finally:
-                    os.unlink(temp_audio_path)
-            else:
-                result = self._transcribe_with_config(
-                    str(file_path), language, optimal_config
+        if self.progress_callback:
+            self.progress_callback("Transcription completed!", 100.0)
+
+        logger.info(f"✅ Enhanced transcription completed in {processing_time:.2f}s")
+        logger.info(
+            f"📊 Result: {len(transcription_result.full_text)} chars, "
+            f"{len(transcription_result.segments)} segments"
+        )
+
+        work.result = transcription_result
+        return transcription_result
+
+    def transcription_error(self, error: Exception) -> Exception:
+        if isinstance(error, TranscriptionCancelled):
+            # Not a failure: passed on as is and not reported as an error
+            return error
+        error_msg = f"Enhanced transcription failed: {str(error)}"
+        logger.error(error_msg)
+        if self.progress_callback:
+            self.progress_callback(f"Error: {error}", 0.0)
+        return RuntimeError(error_msg)
+
+    def _transcribe_file_bounded(
+        self,
+        file_path: Path,
+        language: Optional[str],
+        domain: Optional[str],
+        accuracy_priority: str,
+        enable_enhancements: bool,
+        cache_key: Optional[str],
+        start_time: float,
+    ) -> TranscriptionResult:
+        # Reads, enhances and decodes fixed windows straight from the decoder
+        # pipe, so peak memory stays flat however long the file is
+        is_valid, validation_msg = self._audio_processor.validate_file_properties(
+            file_path
+        )
+        if not is_valid:
+            raise ValueError(f"File validation failed: {validation_msg}")
+
+        blocks = decode_pcm_blocks(file_path)
+        timings: Dict[str, float] = {}
+        try:
+            with trace_file(timings), span("bounded", "stage", file=file_path.name):
+                result = self._transcribe_blocks(
+                    self._limit_duration(blocks),
+                    file_path,
+                    language,
+                    domain,
+                    accuracy_priority,
+                    enable_enhancements,
+                    cache_key,
+                    start_time,
+                )
+            result.metadata["timings"] = rounded_timings(timings)
+            return result
+        except ValueError:
+            raise
+        except Exception as e:
+            raise self.transcription_error(e)
+        finally:
+            blocks.close()
+
+    @staticmethod
+    def _limit_duration(blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        # The whole file is never decoded up front, so the length limit is
+        # enforced as samples arrive
+        total = 0
+        for block in blocks:
+            total += len(block)
+            if total > MAX_DURATION_SECONDS * SAMPLE_RATE:
+                raise ValueError(
+                    "File validation failed: Audio too long "
+                    f"(max {MAX_DURATION_SECONDS / 60:.0f} minutes)"
                 )
+            yield block
+
+    def _transcribe_blocks(
+        self,
+        blocks: Iterator[np.ndarray],
+        file_path: Path,
+        language: Optional[str],
+        domain: Optional[str],
+        accuracy_priority: str,
+        enable_enhancements: bool,
+        cache_key: Optional[str],
+        start_time: float,
+    ) -> TranscriptionResult:
+        logger.info(f"🌊 Bounded-memory transcription of: {file_path.name}")
+
+        # The opening window stands in for the whole file when choosing the
+        # enhancement strength, the decoding profile and the language
+        opening: List[np.ndarray] = []
+        opening_samples = 0
+        for block in blocks:
+            opening.append(block)
+            opening_samples += len(block)
+            if opening_samples >= BOUNDED_WINDOW_SECONDS * SAMPLE_RATE:
+                break
+        if not opening_samples:
+            raise ValueError(
+                "File validation failed: Audio file contains no data "
+                "(corrupt or empty)"
+            )
 
-            transcription_time = time.time() - transcription_start
+        opening_buffer = AudioBuffer(samples=np.concatenate(opening))
+        requested_language = language
+        detected_language = None
+        if language is None:
+            detected_language = self.detect_language(file_path, opening_buffer)
+            if detected_language is not None:
+                language = detected_language.language
+
+        audio_characteristics: Dict[str, Any] = {}
+        enhancement_options = None
+        if enable_enhancements and self.enable_audio_enhancement:
+            with span("analysis"):
+                audio_characteristics = self.audio_enhancer.analyze_audio_quality(
+                    opening_buffer
+                )
+            audio_characteristics["analyzed_seconds"] = opening_buffer.duration
+            enhancement_options = self._enhancement_options(
+                audio_characteristics.get("quality_score", 75), accuracy_priority
+            )
+        opening_buffer = None
 
-            if enable_enhancements and self.enable_text_processing and result:
+        optimal_config = self._select_config(
+            audio_characteristics, accuracy_priority, domain, enable_enhancements
+        )
+        if cache_key is None and not self._model_is_fixed(enable_enhancements):
+            cache_key, cached_result = self._lookup_cached_result(
+                file_path,
+                requested_language,
+                domain,
+                accuracy_priority,
+                enable_enhancements,
+            )
+            if cached_result is not None:
                 if self.progress_callback:
-                    self.progress_callback("Post-processing text...", 85.0)
+                    self.progress_callback("Loaded cached transcription", 100.0)
+                return cached_result
+
+        stream: Iterator[np.ndarray] = itertools.chain(opening, blocks)
+        if enhancement_options is not None:
+            logger.info("🎵 Enhancing audio block by block")
+            stream = self.audio_enhancer.enhance_stream(stream, **enhancement_options)
+
+        if self.progress_callback:
+            self.progress_callback("Transcribing audio...", 60.0)
+
+        device_type = self._model_device_type(self.transcriber)
+        stitcher = ChunkStitcher([])
+        transcription_time = 0.0
+        speech_seconds = 0.0
+        previous_text = ""
+
+        for window in iter_windows(stream, StreamWindower()):
+            options = self._decode_options(
+                language or stitcher.language, optimal_config, device_type
+            )
+            # Carry the tail of the previous window as the prompt, as Whisper
+            # does between its own 30-second windows
+            if previous_text:
+                options["initial_prompt"] = " ".join(
+                    p for p in (options.get("initial_prompt"), previous_text) if p
+                )
 
-                logger.info("📝 Applying text post-processing")
+            window_start = time.time()
+            with span("inference", window=window.chunk.index):
+                result, timeline = self._transcribe_window(window.samples, options)
+            transcription_time += time.time() - window_start
+            speech_seconds += (
+                timeline.speech_seconds
+                if timeline is not None
+                else window.chunk.audio_end - window.chunk.audio_start
+            )
 
-                if "segments" in result and result["segments"]:
-                    processed_segments = self.text_processor.batch_process(
-                        result["segments"], domain
-                    )
-                    result["segments"] = processed_segments
+            stitcher.chunks.append(window.chunk)
+            kept = stitcher.add(window.chunk, result, final=window.final)
+            previous_text = (previous_text + "".join(s.get("text", "") for s in kept))[
+                -200:
+            ]
 
-                if "text" in result:
-                    result["text"] = self.text_processor.process_text(
-                        result["text"], domain
-                    )
+            if self.progress_callback:
+                self.progress_callback(
+                    f"Transcribed {window.chunk.end / 60:.0f} minutes", 60.0
+                )
 
-            processing_time = time.time() - start_time
+        result = stitcher.result()
+        is_valid, validation_msg = self._audio_processor.validate_duration(
+            result["duration"]
+        )
+        if not is_valid:
+            raise ValueError(f"File validation failed: {validation_msg}")
+
+        if detected_language is not None:
+            result["language_probability"] = detected_language.probability
+        if audio_characteristics:
+            audio_characteristics["duration"] = result["duration"]
+        if optimal_config is not None:
+            self.model_optimizer.record_decode_throughput(
+                optimal_config, speech_seconds, transcription_time
+            )
 
-            if self.progress_callback:
-                self.progress_callback("Finalizing results...", 95.0)
+        result = self._post_process_text(result, domain, enable_enhancements)
+        processing_time = time.time() - start_time
 
-            transcription_result = self._create_enhanced_result(
-                result,
-                processing_time,
-                transcription_time,
-                audio_characteristics,
-                file_path,
+        transcription_result = self._create_enhanced_result(
+            result,
+            processing_time,
+            transcription_time,
+            audio_characteristics,
+            file_path,
+        )
+        transcription_result.metadata["bounded_memory"] = {
+            "windows": len(stitcher.chunks),
+            "window_seconds": BOUNDED_WINDOW_SECONDS,
+        }
+        if optimal_config is not None:
+            transcription_result.metadata["decoding_profile"] = optimal_config.profile
+        if detected_language is not None:
+            transcription_result.metadata["language_detection"] = asdict(
+                detected_language
             )
+        if self.enable_vad:
+            transcription_result.metadata["vad"] = {
+                "speech_seconds": speech_seconds,
+                "skipped_fraction": 1.0
+                - speech_seconds / max(result["duration"], 1e-6),
+            }
 
-            if (
-                enable_enhancements
-                and self.enable_model_optimization
-                and optimal_config
-            ):
-                quality_metrics = {
-                    "text_length": len(transcription_result.full_text),
-                    "segment_count": len(transcription_result.segments),
-                    "avg_confidence": transcription_result.average_confidence or 0.0,
-                }
+        if cache_key is not None:
+            transcription_result.metadata["result_cache_key"] = cache_key
+            self.result_cache.put(cache_key, transcription_result)
 
-                audio_duration = audio_characteristics.get(
-                    "duration",
-                    len(enhanced_audio) / 16000 if enhanced_audio is not None else 60,
-                )
+        if self.progress_callback:
+            self.progress_callback("Transcription completed!", 100.0)
 
-                self.model_optimizer.monitor_performance(
-                    optimal_config, processing_time, audio_duration, quality_metrics
+        logger.info(
+            f"✅ Bounded-memory transcription of {result['duration'] / 60:.1f} "
+            f"minutes in {len(stitcher.chunks)} windows ({processing_time:.2f}s)"
+        )
+        return transcription_result
+
+    def _transcribe_window(
+        self, samples: np.ndarray, options: Dict[str, Any]
+    ) -> tuple[Dict[str, Any], Optional[SpeechTimeline]]:
+        audio, timeline = self._skip_non_speech(samples)
+        if timeline is not None and not timeline.regions:
+            result = {"text": "", "segments": [], "language": options["language"]}
+            return result, timeline
+
+        result = self._run_model(audio, options)
+        self._fill_confidence(result)
+        if timeline is not None:
+            result["segments"] = timeline.restore_segments(result.get("segments", []))
+        return result, timeline
+
+    def transcribe_files_batched(
+        self,
+        file_paths: List[Union[str, Path]],
+        language: Optional[str] = None,
+        domain: Optional[str] = None,
+        enable_enhancements: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        accuracy_priority: str = "balanced",
+    ) -> Iterator[tuple[Path, Union[TranscriptionResult, Exception]]]:
+        # Yields (file, result or error) in input order. Clips that fit in one
+        # 30-second window share an encoder pass; longer files, and clips the
+        # optimizer wants on another model, go through transcribe_file. Each
+        # clip gets the per-file VAD and decoding profile, and any clip whose
+        # first-temperature decode fails Whisper's checks is re-decoded alone
+        # with the full temperature fallback
+        file_paths = [Path(p) for p in file_paths]
+        batch_model = self.model_size
+
+        def transcribe_alone(file_path: Path) -> TranscriptionResult:
+            try:
+                return self.transcribe_file(
+                    file_path, language, domain, accuracy_priority, enable_enhancements
                 )
+            finally:
+                # transcribe_file may switch models; the batch keeps its own
+                self.model_size = batch_model
 
-            if self.progress_callback:
-                self.progress_callback("Transcription completed!", 100.0)
+        for group_start in range(0, len(file_paths), batch_size):
+            group = file_paths[group_start : group_start + batch_size]
+            outcomes: Dict[int, Union[TranscriptionResult, Exception]] = {}
+            timings: Dict[int, Dict[str, float]] = {i: {} for i in range(len(group))}
+            pending: List[_BatchedClip] = []
 
-            logger.info(
-                f"✅ Enhanced transcription completed in {processing_time:.2f}s"
+            for index, file_path in enumerate(group):
+                try:
+                    with trace_file(timings[index]):
+                        if not file_path.exists():
+                            raise FileNotFoundError(
+                                f"Audio file not found: {file_path}"
+                            )
+
+                        with span("cache_lookup", file=file_path.name):
+                            cache_key, cached_result = self._lookup_cached_result(
+                                file_path,
+                                language,
+                                domain,
+                                accuracy_priority,
+                                enable_enhancements,
+                            )
+                        if cached_result is not None:
+                            cached_result.metadata["timings"] = rounded_timings(
+                                timings[index]
+                            )
+                            outcomes[index] = cached_result
+                            continue
+
+                        start_time = time.time()
+                        with span("load_audio"):
+                            audio_buffer = self.load_audio(file_path)
+                        if not fits_single_window(audio_buffer.samples):
+                            outcomes[index] = transcribe_alone(file_path)
+                            continue
+
+                        detected_language = (
+                            self.detect_language(file_path, audio_buffer)
+                            if language is None
+                            else None
+                        )
+
+                        audio_characteristics, enhanced_audio = (
+                            self._analyze_and_enhance(
+                                audio_buffer, enable_enhancements, accuracy_priority
+                            )
+                        )
+                        config = self._batched_config(
+                            audio_characteristics,
+                            accuracy_priority,
+                            domain,
+                            enable_enhancements,
+                        )
+                        if config is not None and config.model_size != batch_model:
+                            outcomes[index] = transcribe_alone(file_path)
+                            continue
+
+                        clip = _BatchedClip(
+                            index=index,
+                            file_path=file_path,
+                            cache_key=cache_key,
+                            start_time=start_time,
+                            audio_buffer=audio_buffer,
+                            audio_characteristics=audio_characteristics,
+                            detected_language=detected_language,
+                            config=config,
+                        )
+                        clip.model_input, clip.timeline = self._skip_non_speech(
+                            enhanced_audio
+                            if enhanced_audio is not None
+                            else audio_buffer.samples
+                        )
+                        pending.append(clip)
+                except Exception as e:
+                    outcomes[index] = e
+
+            if pending:
+                self._decode_batched_clips(pending, language, batch_size, timings)
+
+            for clip in pending:
+                if clip.error is not None:
+                    outcomes[clip.index] = clip.error
+                    continue
+                try:
+                    with trace_file(timings[clip.index]):
+                        outcomes[clip.index] = self._finish_batched_clip(
+                            clip, domain, enable_enhancements
+                        )
+                    outcomes[clip.index].metadata["timings"] = rounded_timings(
+                        timings[clip.index]
+                    )
+                except Exception as e:
+                    outcomes[clip.index] = e
+
+            for index, file_path in enumerate(group):
+                yield file_path, outcomes[index]
+
+    def _batched_config(
+        self,
+        audio_characteristics: Dict[str, Any],
+        accuracy_priority: str,
+        domain: Optional[str],
+        enable_enhancements: bool,
+    ) -> Optional[ModelConfig]:
+        # _select_config without the model switch; the caller decides whether
+        # a clip that wants another model leaves the batch
+        if not (enable_enhancements and self.enable_model_optimization):
+            return None
+
+        config = self.model_optimizer.optimize_config_for_audio(
+            audio_characteristics, accuracy_priority
+        )
+        if domain:
+            config.initial_prompt = self.model_optimizer.create_domain_specific_prompt(
+                domain
             )
-            logger.info(
-                f"📊 Result: {len(transcription_result.full_text)} chars, "
-                f"{len(transcription_result.segments)} segments"
+        return config
+
+    def _decode_batched_clips(
+        self,
+        clips: List["_BatchedClip"],
+        language: Optional[str],
+        batch_size: int,
+        timings: Dict[int, Dict[str, float]],
+    ) -> None:
+        device_type = self._model_device_type(self.transcriber)
+
+        # One decode per language and decoding profile, so every clip in a
+        # batch shares its options and none of them re-runs detection
+        groups: Dict[Any, List[_BatchedClip]] = {}
+        for clip in clips:
+            if clip.detected_language is not None:
+                clip_language = clip.detected_language.language
+            else:
+                clip_language = language
+            clip.options = self._decode_options(clip_language, clip.config, device_type)
+            if clip.timeline is not None and not clip.timeline.regions:
+                clip.raw_result = {
+                    "text": "",
+                    "segments": [],
+                    "language": clip_language or "unknown",
+                }
+                continue
+            groups.setdefault(tuple(sorted(clip.options.items())), []).append(clip)
+
+        transcription_start = time.time()
+        for group in groups.values():
+            options = group[0].options
+            decoder = BatchedDecoder.from_transcribe_options(
+                self.transcriber, batch_size, options
             )
+            try:
+                with span("inference", clips=len(group)), self._inference_context():
+                    decoded = decoder.decode(
+                        [clip.model_input for clip in group], options["language"]
+                    )
+            except Exception as e:
+                error = RuntimeError(f"Batched transcription failed: {str(e)}")
+                for clip in group:
+                    clip.error = error
+                continue
 
-            return transcription_result
+            for clip, raw_result in zip(group, decoded):
+                if raw_result.pop("needs_fallback", False):
+                    logger.info(
+                        f"🔁 Re-decoding {clip.file_path.name} with temperature "
+                        "fallback"
+                    )
+                    fallback_start = time.time()
+                    raw_result = self._run_model(clip.model_input, clip.options)
+                    clip.transcription_time = time.time() - fallback_start
+                    clip.redecoded = True
+                clip.raw_result = raw_result
+
+        # Each clip is charged its share of the shared decode
+        redecode_time = sum(clip.transcription_time for clip in clips)
+        transcription_time = (
+            time.time() - transcription_start - redecode_time
+        ) / len(clips)
+        for clip in clips:
+            clip.transcription_time += transcription_time
+            timings[clip.index]["inference"] = clip.transcription_time
+            clip.model_input = None
+
+    def _finish_batched_clip(
+        self,
+        clip: "_BatchedClip",
+        domain: Optional[str],
+        enable_enhancements: bool,
+    ) -> TranscriptionResult:
+        raw_result = clip.raw_result
+        if clip.detected_language is not None:
+            raw_result["language_probability"] = clip.detected_language.probability
+        self._fill_confidence(raw_result)
+        if clip.timeline is not None:
+            raw_result["segments"] = clip.timeline.restore_segments(
+                raw_result.get("segments", [])
+            )
+            raw_result["duration"] = clip.timeline.duration
+
+        raw_result = self._post_process_text(raw_result, domain, enable_enhancements)
+        result = self._create_enhanced_result(
+            raw_result,
+            time.time() - clip.start_time,
+            clip.transcription_time,
+            clip.audio_characteristics,
+            clip.file_path,
+            clip.audio_buffer,
+        )
 
-        except Exception as e:
-            error_msg = f"Enhanced transcription failed: {str(e)}"
-            logger.error(error_msg)
-            if self.progress_callback:
-                self.progress_callback(f"Error: {e}", 0.0)
-            raise RuntimeError(error_msg)
+        result.metadata["batched_inference"] = True
+        if clip.redecoded:
+            result.metadata["batched_fallback"] = True
+        if clip.config is not None:
+            result.metadata["decoding_profile"] = clip.config.profile
+        if clip.detected_language is not None:
+            result.metadata["language_detection"] = asdict(clip.detected_language)
+        if clip.timeline is not None:
+            result.metadata["vad"] = {
+                "speech_seconds": clip.timeline.speech_seconds,
+                "skipped_fraction": clip.timeline.skipped_fraction,
+                "speech_regions": len(clip.timeline.regions),
+            }
+        if clip.cache_key is not None:
+            result.metadata["result_cache_key"] = clip.cache_key
+            self.result_cache.put(clip.cache_key, result)
+        return result
 
-    def _transcribe_with_config(
-        self, audio_path: str, language: Optional[str], config: Optional[ModelConfig]
-    ) -> Dict[str, Any]:
-        transcriber = self.transcriber
+    def load_audio(self, file_path: Union[str, Path]) -> AudioBuffer:
+        file_path = Path(file_path)
 
-        device = getattr(transcriber, "device", None)
-        if device is not None:
-            device_type = getattr(device, "type", str(device))
-        else:
-            device_type = getattr(self, "device", None) or (
-                "cuda" if torch.cuda.is_available() else "cpu"
+        try:
+            audio_buffer = AudioBuffer.from_file(file_path)
+        except Exception as e:
+            raise ValueError(f"Corrupt or invalid audio file: {str(e)}")
+
+        is_valid, validation_msg = self.validate_file(file_path, audio_buffer)
+        if not is_valid:
+            raise ValueError(f"File validation failed: {validation_msg}")
+
+        return audio_buffer
+
+    @staticmethod
+    def _as_model_input(
+        audio: Union[str, np.ndarray, torch.Tensor],
+    ) -> Union[str, np.ndarray, torch.Tensor]:
+        # Whisper's mel front-end expects float32; enhancement returns float64
+        if isinstance(audio, torch.Tensor):
+            return audio.detach().to(dtype=torch.float32).flatten().contiguous()
+        if isinstance(audio, np.ndarray):
+            return np.ascontiguousarray(audio.reshape(-1), dtype=np.float32)
+        return str(audio)
+
+    def _get_chunked_transcriber(self) -> ChunkedTranscriber:
+        if (
+            self._chunked_transcriber is None
+            or self._chunked_transcriber.model_size != self.model_size
+        ):
+            if self._chunked_transcriber is not None:
+                self._chunked_transcriber.shutdown()
+            self._chunked_transcriber = ChunkedTranscriber(
+                self.model_size, workers=self.chunk_workers, precision=self.precision
             )
+        return self._chunked_transcriber
+
+    def _should_chunk(self, audio: Union[str, np.ndarray, torch.Tensor]) -> bool:
+        # Process-level parallelism only pays off on CPU; a GPU is already
+        # saturated by a single decoder
+        return (
+            self.enable_parallel_chunks
+            and isinstance(audio, np.ndarray)
+            and resolve_device(self.device) == "cpu"
+            and self._get_chunked_transcriber().should_chunk(len(audio))
+        )
 
+    def _decode_options(
+        self,
+        language: Optional[str],
+        config: Optional[ModelConfig],
+        device_type: str,
+    ) -> Dict[str, Any]:
         options: Dict[str, Any] = {
             "language": language,
             "task": "transcribe",
             "verbose": False,
-            "word_timestamps": True,
         }
+        if self.word_timestamps:
+            # Timed by the decoding model on the audio it decoded; align_words
+            # only fills in results that come back without words
+            options["word_timestamps"] = True
 
         if device_type == "cpu":
             options["fp16"] = False
 
-        result = transcriber.transcribe(audio_path, **options)
+        # The optimizer's profile decides beam vs greedy, thresholds and the
+        # prompt; without one Whisper's own defaults apply
+        if config is not None:
+            options.update(config.to_decode_options(device_type))
+
+        return options
+
+    def _check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise TranscriptionCancelled("Transcription was cancelled")
+
+    def _on_chunk_completed(self, completed: int, total: int) -> None:
+        self._check_cancelled()
+        if self.progress_callback:
+            self.progress_callback(
+                f"Transcribed chunk {completed}/{total}...",
+                60.0 + 25.0 * completed / total,
+            )
+
+    def transcribe_stream(
+        self,
+        file_path: Union[str, Path],
+        language: Optional[str] = None,
+        domain: Optional[str] = None,
+        enable_enhancements: bool = True,
+    ) -> Iterator[TranscriptionSegment]:
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+        logger.info(f"📡 Starting streaming transcription of: {file_path.name}")
+        audio_buffer = self.load_audio(file_path)
+        samples = audio_buffer.samples
+
+        if language is None:
+            detected_language = self.detect_language(file_path, audio_buffer)
+            if detected_language is not None:
+                language = detected_language.language
+
+        windows = plan_chunks(
+            samples,
+            chunk_seconds=STREAM_WINDOW_SECONDS,
+            search_seconds=STREAM_SEARCH_SECONDS,
+        )
+        stitcher = ChunkStitcher(windows)
+
+        transcriber = self.transcriber
+        device_type = resolve_device(self.device)
+        domain_prompt = ""
+        if domain and self.enable_model_optimization:
+            domain_prompt = self.model_optimizer.create_domain_specific_prompt(domain)
+
+        previous_text = ""
+        for window in windows:
+            options = self._decode_options(language, None, device_type)
+            options["verbose"] = None
+
+            # Windows are decoded separately, so carry the tail of the previous
+            # text as the prompt to keep Whisper's cross-window context
+            prompt = " ".join(p for p in (domain_prompt, previous_text[-200:]) if p)
+            if prompt:
+                options["initial_prompt"] = prompt
+
+            result = self._run_model(
+                audio_buffer.slice(window.audio_start, window.audio_end), options
+            )
+            self._fill_confidence(result)
+
+            # Lock the language after the first window so later windows do not
+            # re-run detection or switch language mid-file
+            if language is None and result.get("language"):
+                language = result["language"]
+
+            for raw_segment in stitcher.add(window, result):
+                if enable_enhancements and self.enable_text_processing:
+                    raw_segment = self.text_processor.batch_process(
+                        [raw_segment], domain
+                    )[0]
+
+                previous_text += raw_segment.get("text", "")
+                yield TranscriptionSegment(
+                    start=float(raw_segment["start"]),
+                    end=float(raw_segment["end"]),
+                    text=raw_segment.get("text", ""),
+                    confidence=float(raw_segment.get("confidence", 0.0)),
+                )
+
+            if self.progress_callback:
+                self.progress_callback(
+                    f"Transcribed {window.end:.0f}s of {audio_buffer.duration:.0f}s",
+                    100.0 * (window.index + 1) / len(windows),
+                )
 
+    @staticmethod
+    def _fill_confidence(result: Dict[str, Any]) -> None:
         if "segments" in result:
             base_confidence = result.get("language_probability", 0.9)
             for segment in result["segments"]:
                 if "confidence" not in segment:
-                    segment["confidence"] = min(base_confidence, 0.95)
+                    confidence = segment_confidence(segment)
+                    if confidence is None:
+                        confidence = min(base_confidence, 0.95)
+                    segment["confidence"] = confidence
+
+    def _skip_non_speech(
+        self, audio: Union[str, np.ndarray, torch.Tensor]
+    ) -> tuple[Union[str, np.ndarray, torch.Tensor], Optional[SpeechTimeline]]:
+        audio = self._as_model_input(audio)
+        if not self.enable_vad or not isinstance(audio, np.ndarray) or not len(audio):
+            return audio, None
+
+        compacted, timeline = compact_speech(audio, config=self.vad_config)
+        logger.info(
+            f"🔇 VAD: {timeline.speech_seconds:.1f}s of speech in "
+            f"{timeline.duration:.1f}s ({timeline.skipped_fraction:.0%} non-speech)"
+        )
+
+        if timeline.regions and timeline.skipped_fraction < MIN_VAD_SKIP_FRACTION:
+            return audio, SpeechTimeline([(0.0, timeline.duration)], timeline.duration)
+        return compacted, timeline
+
+    def _transcribe_speech(
+        self,
+        audio: Union[str, np.ndarray, torch.Tensor],
+        language: Optional[str],
+        config: Optional[ModelConfig],
+        checkpoint: Optional[TranscriptionCheckpoint] = None,
+    ) -> tuple[Dict[str, Any], Optional[SpeechTimeline]]:
+        # Only speech regions reach the model; segment times are mapped back
+        # onto the original timeline afterwards
+        audio, timeline = self._skip_non_speech(audio)
+        if timeline is None:
+            result = self._transcribe_with_config(audio, language, config, checkpoint)
+            return result, None
+
+        if not timeline.regions:
+            logger.info("🔇 No speech detected, skipping decode")
+            result = {"text": "", "segments": [], "language": language or "unknown"}
+        else:
+            result = self._transcribe_with_config(audio, language, config, checkpoint)
+            result["segments"] = timeline.restore_segments(result.get("segments", []))
+
+        result["duration"] = timeline.duration
+        return result, timeline
+
+    def _transcribe_with_config(
+        self,
+        audio: Union[str, np.ndarray, torch.Tensor],
+        language: Optional[str],
+        config: Optional[ModelConfig],
+        checkpoint: Optional[TranscriptionCheckpoint] = None,
+    ) -> Dict[str, Any]:
+        audio = self._as_model_input(audio)
+
+        if (
+            checkpoint is not None
+            and isinstance(audio, np.ndarray)
+            and len(audio) / SAMPLE_RATE > CHECKPOINT_MIN_SECONDS
+        ):
+            result = self._transcribe_checkpointed(audio, language, config, checkpoint)
+        elif self._should_chunk(audio):
+            options = self._decode_options(language, config, "cpu")
+            result = self._get_chunked_transcriber().transcribe(
+                audio, options, self._on_chunk_completed
+            )
+        else:
+            options = self._decode_options(
+                language, config, self._model_device_type(self.transcriber)
+            )
+            result = self._run_model(audio, options)
+
+        self._fill_confidence(result)
+
+        return result
+
+    def _run_model(self, audio: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+        self._check_cancelled()
+        if self.draft_model_size and self.draft_model_size != self.model_size:
+            return self._transcribe_two_pass(audio, options)
+
+        transcriber = self.transcriber
+        with self._inference_context():
+            return transcriber.transcribe(audio, **options)
+
+    def _transcribe_two_pass(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # Draft with the small model, then re-decode only the time ranges it
+        # was unsure about with the full model and splice those back in
+        device = resolve_device(self.device)
+        registry = get_model_registry()
+        with registry.borrow(self.draft_model_size, device, self.precision) as draft:
+            with inference_context(draft, self.precision, device):
+                result = draft.transcribe(audio, **options)
+
+        self._fill_confidence(result)
+        duration = len(audio) / SAMPLE_RATE
+        spans = find_low_confidence_spans(
+            result.get("segments", []), self.draft_confidence_threshold, duration
+        )
 
+        redecoded_seconds = sum(end - start for start, end in spans)
+        logger.info(
+            f"📝 Draft '{self.draft_model_size}' pass: {len(spans)} low-confidence "
+            f"spans ({redecoded_seconds:.1f}s of {duration:.1f}s) for "
+            f"'{self.model_size}'"
+        )
+
+        if spans:
+            transcriber = self.transcriber
+            span_options = dict(options)
+            span_options["language"] = options.get("language") or result.get("language")
+
+            redecoded = []
+            for start, end in spans:
+                # Prompt with the draft text leading up to the span so the
+                # large model keeps the surrounding context
+                preceding = "".join(
+                    segment.get("text", "")
+                    for segment in result["segments"]
+                    if segment["start"] < start
+                )
+                span_options["initial_prompt"] = preceding[-200:] or options.get(
+                    "initial_prompt"
+                )
+
+                self._check_cancelled()
+                with self._inference_context():
+                    span_result = transcriber.transcribe(
+                        audio[int(start * SAMPLE_RATE) : int(end * SAMPLE_RATE)],
+                        **span_options,
+                    )
+                redecoded.append(
+                    (
+                        (start, end),
+                        offset_segments(span_result.get("segments", []), start),
+                    )
+                )
+
+            result["segments"] = splice_segments(result["segments"], redecoded)
+            result["text"] = "".join(s.get("text", "") for s in result["segments"])
+
+        result["two_pass"] = {
+            "draft_model": self.draft_model_size,
+            "redecoded_spans": len(spans),
+            "redecoded_seconds": redecoded_seconds,
+        }
         return result
 
+    def _inference_context(self):
+        # bf16 autocast on CPU; a no-op for fp32 and int8
+        return inference_context(
+            self.transcriber, self.precision, resolve_device(self.device)
+        )
+
+    def _model_device_type(self, transcriber: Any) -> str:
+        device = getattr(transcriber, "device", None)
+        if device is not None:
+            return getattr(device, "type", str(device))
+        return getattr(self, "device", None) or (
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+
+    def _transcribe_checkpointed(
+        self,
+        audio: np.ndarray,
+        language: Optional[str],
+        config: Optional[ModelConfig],
+        checkpoint: TranscriptionCheckpoint,
+    ) -> Dict[str, Any]:
+        chunks = plan_chunks(audio, CHECKPOINT_WINDOW_SECONDS)
+        completed = checkpoint.load(chunks)
+
+        if self._should_chunk(audio):
+            options = self._decode_options(language, config, "cpu")
+            return self._get_chunked_transcriber().transcribe(
+                audio,
+                options,
+                self._on_chunk_completed,
+                chunks=chunks,
+                completed=completed,
+                on_result=checkpoint.save,
+            )
+
+        transcriber = self.transcriber
+        device_type = self._model_device_type(transcriber)
+        results = dict(completed)
+
+        for chunk in chunks:
+            if chunk.index in results:
+                continue
+
+            # Lock the language detected so far and carry the tail of the
+            # previous window as the prompt, as Whisper does between its own
+            # 30-second windows
+            detected = next(
+                (r["language"] for r in results.values() if r.get("language")), None
+            )
+            options = self._decode_options(language or detected, config, device_type)
+            previous = results.get(chunk.index - 1)
+            if previous and previous.get("text"):
+                options["initial_prompt"] = " ".join(
+                    p
+                    for p in (options.get("initial_prompt"), previous["text"][-200:])
+                    if p
+                )
+
+            result = self._run_model(
+                audio[
+                    int(chunk.audio_start * SAMPLE_RATE) : int(
+                        chunk.audio_end * SAMPLE_RATE
+                    )
+                ],
+                options,
+            )
+            checkpoint.save(chunk.index, result)
+            results[chunk.index] = result
+            self._on_chunk_completed(len(results), len(chunks))
+
+        return stitch_chunk_results(chunks, results)
+
     def _create_enhanced_result(
         self,
         raw_result: Dict[str, Any],
@@ -296,6 +1609,7 @@ class EnhancedTranscriptionService:
         transcription_time: float,
         audio_characteristics: Dict[str, Any],
         file_path: Path,
+        audio_buffer: Optional[AudioBuffer] = None,
     ) -> TranscriptionResult:
         if raw_result is None:
             raw_result = {
@@ -311,9 +1625,11 @@ class EnhancedTranscriptionService:
                 logger.info("🎭 Applying speaker diarization...")
                 from .speaker_diarization import add_speaker_labels
 
-                raw_result["segments"] = add_speaker_labels(
-                    str(file_path), raw_result["segments"]
-                )
+                with span("diarization"):
+                    raw_result["segments"] = add_speaker_labels(
+                        audio_buffer if audio_buffer is not None else str(file_path),
+                        raw_result["segments"],
+                    )
                 logger.info("✅ Speaker diarization completed")
             except Exception as e:
                 logger.warning(f"Speaker diarization failed: {e}")
@@ -364,6 +1680,17 @@ class EnhancedTranscriptionService:
             if max_segment_end > duration:
                 duration = max_segment_end
 
+        word_timestamps = self._decoded_words(raw_result.get("segments") or [])
+        if word_timestamps:
+            enhanced_metadata["aligned_ranges"] = [
+                list(r)
+                for r in merge_ranges(
+                    (s["start"], s["end"])
+                    for s in raw_result["segments"]
+                    if s.get("words")
+                )
+            ]
+
         transcription_result = TranscriptionResult(
             segments=segments,
             language=raw_result.get("language", "unknown"),
@@ -371,7 +1698,7 @@ class EnhancedTranscriptionService:
             duration=duration,
             processing_time=processing_time,
             model_used=self.model_size,
-            word_timestamps=raw_result.get("word_timestamps"),
+            word_timestamps=word_timestamps or None,
             file_path=file_path,
             metadata=enhanced_metadata,
         )
@@ -390,15 +1717,105 @@ class EnhancedTranscriptionService:
     def get_supported_formats(self) -> list[str]:
         return [".wav", ".mp3", ".m4a", ".flac", ".aac", ".ogg"]
 
-    def validate_file(self, file_path: Union[str, Path]) -> tuple[bool, str]:
-        return self._audio_processor.validate_audio_file(file_path)
+    def validate_file(
+        self,
+        file_path: Union[str, Path],
+        audio_buffer: Optional[AudioBuffer] = None,
+    ) -> tuple[bool, str]:
+        return self._audio_processor.validate_audio_file(file_path, audio_buffer)
+
+    @staticmethod
+    def _decoded_words(raw_segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Same shape as align_segments, from Whisper's per-segment "words"
+        return [
+            {
+                "word": word["word"],
+                "start": round(float(word["start"]), 3),
+                "end": round(float(word["end"]), 3),
+                "confidence": float(word.get("probability", 0.0)),
+            }
+            for segment in raw_segments
+            for word in segment.get("words") or []
+        ]
+
+    def align_words(
+        self,
+        transcription_result: TranscriptionResult,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        audio_buffer: Optional[AudioBuffer] = None,
+    ) -> List[Dict[str, Any]]:
+        # Word timing is a deferred stage: only segments in the requested
+        # range that have not been aligned before are run through the model,
+        # and the words are kept on the result (and in the result cache)
+        range_start = start or 0.0
+        range_end = end if end is not None else transcription_result.duration
+        aligned_ranges = [
+            tuple(r) for r in transcription_result.metadata.get("aligned_ranges", [])
+        ]
+
+        pending = [
+            segment
+            for segment in transcription_result.segments
+            if segment.end > range_start
+            and segment.start < range_end
+            and not is_covered(segment.start, segment.end, aligned_ranges)
+        ]
+
+        if pending:
+            if audio_buffer is None:
+                if transcription_result.file_path is None:
+                    raise ValueError("Word alignment needs the source audio file")
+                audio_buffer = self.load_audio(transcription_result.file_path)
+
+            logger.info(f"🔤 Aligning words for {len(pending)} segments")
+            with span(
+                "word_alignment", segments=len(pending)
+            ), self._inference_context():
+                words = align_segments(
+                    self.transcriber,
+                    audio_buffer.samples,
+                    pending,
+                    transcription_result.language,
+                )
+
+            transcription_result.word_timestamps = sorted(
+                (transcription_result.word_timestamps or []) + words,
+                key=lambda word: word["start"],
+            )
+            transcription_result.metadata["aligned_ranges"] = [
+                list(r)
+                for r in merge_ranges(
+                    aligned_ranges + [(s.start, s.end) for s in pending]
+                )
+            ]
+
+            cache_key = transcription_result.metadata.get("result_cache_key")
+            if cache_key and self.enable_result_cache:
+                self.result_cache.put(cache_key, transcription_result)
+
+        return [
+            word
+            for word in transcription_result.word_timestamps or []
+            if word["end"] > range_start and word["start"] < range_end
+        ]
 
     def generate_subtitles(
         self, transcription_result: TranscriptionResult, format: str = "srt"
     ) -> str:
-        return self.subtitle_generator.generate_subtitles(
-            transcription_result, format, transcription_result.word_timestamps
-        )
+        # Words timed while decoding are kept; only segments that came back
+        # without them (batched clips, word_timestamps=False, older cache
+        # entries) are aligned here, after the fact
+        if transcription_result.file_path is not None:
+            try:
+                self.align_words(transcription_result)
+            except Exception as e:
+                logger.warning(f"Word alignment failed, estimating word timing: {e}")
+
+        with span("subtitles", format=format):
+            return self.subtitle_generator.generate_subtitles(
+                transcription_result, format, transcription_result.word_timestamps
+            )
 
     def transcribe_and_generate_subtitles(
         self,
@@ -426,24 +1843,27 @@ class EnhancedTranscriptionService:
 
         return transcription_result, subtitles
 
-    def cleanup(self):
+    def _release_model(self):
         if self._transcriber is not None:
-            import gc
-
-            logger.info(
-                f"🧹 Cleaning up Whisper model '{self._loaded_model_size}' from memory"
-            )
-
-            del self._transcriber
+            get_model_registry().release(self._transcriber)
             self._transcriber = None
             self._loaded_model_size = None
 
-            gc.collect()
+    def cleanup(self, free_memory: bool = False):
+        if self._chunked_transcriber is not None:
+            self._chunked_transcriber.shutdown()
+            self._chunked_transcriber = None
 
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+        if self._transcriber is not None:
+            logger.info(
+                f"🧹 Releasing Whisper model '{self._loaded_model_size}' "
+                "back to the model registry"
+            )
+            self._release_model()
 
-            logger.info("✓ Model cleanup complete")
+        if free_memory:
+            evicted = get_model_registry().clear_idle()
+            logger.info(f"✓ Model cleanup complete ({evicted} idle models evicted)")
 
 
 class TranscriptionService(EnhancedTranscriptionService):
@@ -0,0 +1,223 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+Region = Tuple[float, float]  # (start, end) in seconds
+
+
+@dataclass
+class VADConfig:
+    frame_ms: float = 30.0
+    threshold_db: Optional[float] = None  # None = adaptive from noise floor
+    min_speech_seconds: float = 0.25
+    min_silence_seconds: float = 0.3
+    padding_seconds: float = 0.1
+    absolute_floor_db: float = -55.0
+
+
+def frame_energy_db(
+    samples: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_ms: float = 30.0
+) -> np.ndarray:
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = samples[: n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def _adaptive_threshold(energy_db: np.ndarray, config: VADConfig) -> float:
+    if config.threshold_db is not None:
+        return config.threshold_db
+
+    noise_floor = np.percentile(energy_db, 10)
+    peak = np.percentile(energy_db, 95)
+    # Speech-only recordings have a high "floor", so never demand more than
+    # 18 dB below the loud frames
+    return float(max(config.absolute_floor_db, min(noise_floor + 12, peak - 18)))
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    if len(mask) == 0:
+        return []
+    padded = np.concatenate([[False], mask, [False]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+def detect_speech_regions(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    config: Optional[VADConfig] = None,
+) -> List[Region]:
+    config = config or VADConfig()
+    energy_db = frame_energy_db(samples, sample_rate, config.frame_ms)
+    if len(energy_db) == 0:
+        return []
+
+    frame_seconds = config.frame_ms / 1000
+    speech = energy_db > _adaptive_threshold(energy_db, config)
+
+    # Bridge short pauses so words within a phrase stay together
+    min_gap = int(round(config.min_silence_seconds / frame_seconds))
+    for start, end in _runs(~speech):
+        if start > 0 and end < len(speech) and end - start < min_gap:
+            speech[start:end] = True
+
+    min_run = int(round(config.min_speech_seconds / frame_seconds))
+    duration = len(samples) / sample_rate
+
+    regions: List[Region] = []
+    for start, end in _runs(speech):
+        if end - start < min_run:
+            continue
+        region_start = max(0.0, start * frame_seconds - config.padding_seconds)
+        region_end = min(duration, end * frame_seconds + config.padding_seconds)
+        if regions and region_start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], region_end)
+        else:
+            regions.append((region_start, region_end))
+
+    return regions
+
+
+def silence_regions(speech: List[Region], duration: float) -> List[Region]:
+    gaps = []
+    cursor = 0.0
+    for start, end in speech:
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < duration:
+        gaps.append((cursor, duration))
+    return gaps
+
+
+def find_split_points(
+    samples: np.ndarray,
+    target_chunk_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+    search_seconds: float = 30.0,
+    config: Optional[VADConfig] = None,
+) -> List[Tuple[float, bool]]:
+    # Each split is (time, is_silence); a hard split (no silence within the
+    # search window) is flagged so the caller can overlap and de-duplicate
+    duration = len(samples) / sample_rate
+    if duration <= target_chunk_seconds:
+        return []
+
+    speech = detect_speech_regions(samples, sample_rate, config)
+    gaps = silence_regions(speech, duration)
+
+    splits: List[Tuple[float, bool]] = []
+    previous = 0.0
+    target = target_chunk_seconds
+    while target < duration - target_chunk_seconds / 4:
+        candidates = [
+            (start + end) / 2
+            for start, end in gaps
+            if abs((start + end) / 2 - target) <= search_seconds
+            and (start + end) / 2 > previous
+        ]
+        if candidates:
+            split = min(candidates, key=lambda t: abs(t - target))
+            splits.append((split, True))
+        else:
+            split = target
+            splits.append((split, False))
+
+        previous = split
+        target = split + target_chunk_seconds
+
+    return splits
+
+
+@dataclass
+class SpeechTimeline:
+    regions: List[Region]  # speech kept, on the original timeline
+    duration: float
+    gap_seconds: float = 0.4
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    @property
+    def skipped_fraction(self) -> float:
+        if self.duration <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.speech_seconds / self.duration)
+
+    def _knots(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Piecewise-linear map from the compacted audio back to the original;
+        # times inside an inserted gap interpolate across the skipped silence
+        compact, original = [], []
+        cursor = 0.0
+        for start, end in self.regions:
+            compact += [cursor, cursor + (end - start)]
+            original += [start, end]
+            cursor += (end - start) + self.gap_seconds
+        return np.asarray(compact), np.asarray(original)
+
+    def to_original(self, time_s: float) -> float:
+        if not self.regions:
+            return time_s
+        compact, original = self._knots()
+        return float(np.interp(time_s, compact, original))
+
+    def restore_segments(self, segments: List[dict]) -> List[dict]:
+        if not self.regions:
+            return segments
+
+        compact, original = self._knots()
+
+        def remap(value) -> float:
+            return float(np.interp(float(value), compact, original))
+
+        restored = []
+        for segment in segments:
+            segment = dict(segment)
+            segment["start"] = remap(segment.get("start", 0.0))
+            segment["end"] = remap(segment.get("end", 0.0))
+            if segment.get("words"):
+                segment["words"] = [
+                    {
+                        **word,
+                        "start": remap(word.get("start", 0.0)),
+                        "end": remap(word.get("end", 0.0)),
+                    }
+                    for word in segment["words"]
+                ]
+            restored.append(segment)
+        return restored
+
+
+def compact_speech(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    config: Optional[VADConfig] = None,
+    gap_seconds: float = 0.4,
+) -> Tuple[np.ndarray, SpeechTimeline]:
+    # Concatenates the speech regions with a short pause between them so the
+    # decoder still sees phrase boundaries
+    duration = len(samples) / sample_rate
+    regions = detect_speech_regions(samples, sample_rate, config)
+    timeline = SpeechTimeline(regions, duration, gap_seconds)
+
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=samples.dtype)
+    pieces = []
+    for index, (start, end) in enumerate(regions):
+        if index:
+            pieces.append(gap)
+        pieces.append(samples[int(start * sample_rate) : int(end * sample_rate)])
+
+    compacted = np.concatenate(pieces) if pieces else samples[:0]
+    return np.ascontiguousarray(compacted), timeline
@@ -0,0 +1,106 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.transcription_result import TranscriptionSegment
+from .audio_buffer import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+ALIGN_WINDOW_SECONDS = 30.0  # one encoder window per alignment pass
+
+Range = Tuple[float, float]
+
+
+def group_segments(
+    segments: Sequence[TranscriptionSegment],
+    window_seconds: float = ALIGN_WINDOW_SECONDS,
+) -> List[List[TranscriptionSegment]]:
+    # Consecutive segments that fit in one window share an encoder pass
+    groups: List[List[TranscriptionSegment]] = []
+    for segment in segments:
+        if groups and segment.end - groups[-1][0].start <= window_seconds:
+            groups[-1].append(segment)
+        else:
+            groups.append([segment])
+    return groups
+
+
+def merge_ranges(ranges: Sequence[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1e-6:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def is_covered(start: float, end: float, ranges: Sequence[Range]) -> bool:
+    return any(
+        r_start <= start + 1e-6 and end <= r_end + 1e-6 for r_start, r_end in ranges
+    )
+
+
+def align_segments(
+    model: Any,
+    samples: np.ndarray,
+    segments: Sequence[TranscriptionSegment],
+    language: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    # Forced alignment of already-decoded text: Whisper's cross-attention
+    # DTW (the same code word_timestamps=True runs) applied after the fact
+    import whisper
+    from whisper.audio import HOP_LENGTH
+    from whisper.timing import add_word_timestamps
+    from whisper.tokenizer import LANGUAGES, get_tokenizer
+
+    tokenizer = get_tokenizer(
+        model.is_multilingual,
+        num_languages=getattr(model, "num_languages", 99),
+        language=language if language in LANGUAGES else None,
+        task="transcribe",
+    )
+    n_mels = getattr(getattr(model, "dims", None), "n_mels", 80)
+
+    words: List[Dict[str, Any]] = []
+    for group in group_segments([s for s in segments if s.text.strip()]):
+        window_start = group[0].start
+        window_end = min(group[-1].end, window_start + ALIGN_WINDOW_SECONDS)
+        clip = samples[int(window_start * SAMPLE_RATE) : int(window_end * SAMPLE_RATE)]
+        if len(clip) < HOP_LENGTH:
+            continue
+
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), n_mels=n_mels)
+        raw_segments = [
+            {
+                "seek": 0,
+                "start": segment.start - window_start,
+                "end": segment.end - window_start,
+                "tokens": tokenizer.encode(" " + segment.text.strip()),
+            }
+            for segment in group
+        ]
+
+        add_word_timestamps(
+            segments=raw_segments,
+            model=model,
+            tokenizer=tokenizer,
+            mel=mel.to(model.device),
+            num_frames=len(clip) // HOP_LENGTH,
+            last_speech_timestamp=0.0,
+        )
+
+        for raw_segment in raw_segments:
+            for word in raw_segment.get("words", []):
+                words.append(
+                    {
+                        "word": word["word"],
+                        "start": round(float(word["start"]) + window_start, 3),
+                        "end": round(float(word["end"]) + window_start, 3),
+                        "confidence": float(word.get("probability", 0.0)),
+                    }
+                )
+
+    return words
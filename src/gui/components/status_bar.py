@@ -121,8 +121,19 @@ class StatusBarComponent(QStatusBar):
 
     def hide_progress(self):
         self.progress_bar.setVisible(False)
+        self.progress_bar.setFormat("%p%")
         self.update_status("Status: Ready")
 
+    def set_eta(self, seconds_left):
+        seconds_left = int(seconds_left)
+        if seconds_left < 60:
+            eta = f"{seconds_left}s"
+        elif seconds_left < 3600:
+            eta = f"{seconds_left // 60}m {seconds_left % 60}s"
+        else:
+            eta = f"{seconds_left // 3600}h {(seconds_left % 3600) // 60}m"
+        self.progress_bar.setFormat(f"%p% | ETA {eta}")
+
     def update_status(self, status_text):
         current_text = self.system_monitor_label.text()
         # Replace everything after the last | with new status
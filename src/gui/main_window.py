@@ -3,7 +3,7 @@ import os
 import sys
 from pathlib import Path
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QPalette
 from PySide6.QtWidgets import (
     QApplication,
@@ -593,6 +593,12 @@ class ProfessionalMainWindow(QMainWindow):
             self.current_worker = None
 
     def _auto_save_results(self, results):
+        from src.core.tracing import span
+
+        with span("export", format="auto_save"):
+            self._write_auto_save(results)
+
+    def _write_auto_save(self, results):
         try:
             from datetime import datetime
             from pathlib import Path
@@ -1230,6 +1236,22 @@ For detailed compliance information, generate a Privacy Report."""
 
         batch_file_objects = [BatchFile(file_path) for file_path in batch_files]
 
+        # Journal the batch before anything runs, so a crash from here on can
+        # be resumed at the next launch
+        journal, batch_id = None, None
+        try:
+            from src.core.batch_journal import get_batch_journal
+
+            journal = get_batch_journal()
+            batch_id = journal.create_batch(batch_files, config)
+        except Exception as e:
+            logger.warning(f"Batch will not be resumable after a crash: {e}")
+
+        self._launch_batch_processor(batch_file_objects, config, journal, batch_id)
+
+    def _launch_batch_processor(self, batch_file_objects, config, journal, batch_id):
+        _apply_batch_deadlines(batch_file_objects)
+
         # Create and start batch processor
         self.batch_processor = BatchProcessor(
             files=batch_file_objects,
@@ -1237,6 +1259,9 @@ For detailed compliance information, generate a Privacy Report."""
             language=config["language"],
             enhanced=config["enhanced_preprocessing"],
             speaker_detection=config["speaker_detection"],
+            journal=journal,
+            batch_id=batch_id,
+            **_batch_execution_options(),
         )
 
         # Connect batch processor signals
@@ -1245,6 +1270,7 @@ For detailed compliance information, generate a Privacy Report."""
         self.batch_processor.file_completed.connect(self._on_batch_file_completed)
         self.batch_processor.file_failed.connect(self._on_batch_file_failed)
         self.batch_processor.batch_completed.connect(self._on_batch_finished)
+        self.batch_processor.eta_updated.connect(self.status_bar.set_eta)
 
         # Update UI for batch processing
         self.file_input.batch_component.set_batch_controls_enabled(
@@ -1260,6 +1286,78 @@ For detailed compliance information, generate a Privacy Report."""
         # Start batch processor
         self.batch_processor.start()
 
+    def offer_batch_resume(self):
+        # Called once the window is up: a batch still active in the journal
+        # means the last session ended before it finished
+        try:
+            from src.core.batch_journal import get_batch_journal
+
+            journal = get_batch_journal()
+            batch = journal.unfinished_batch()
+        except Exception as e:
+            logger.warning(f"Could not read batch journal: {e}")
+            return
+
+        if batch is None or self.batch_processor is not None:
+            return
+        if self.file_input.batch_component.get_batch_files():
+            # Files were opened at launch; keep the old batch for next time
+            return
+
+        from datetime import datetime
+
+        started = datetime.fromtimestamp(batch.created_at).strftime("%Y-%m-%d %H:%M")
+        reply = QMessageBox.question(
+            self,
+            "Resume Batch?",
+            f"A batch started {started} did not finish.\n\n"
+            f"{len(batch.completed)} of {len(batch.files)} file(s) are done and "
+            f"{len(batch.remaining)} remain.\n\n"
+            f"Resume where it stopped?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+        if reply != QMessageBox.Yes:
+            journal.abandon_batch(batch.batch_id)
+            return
+
+        from src.gui.workers.batch_processor import BatchFile
+
+        batch_component = self.file_input.batch_component
+        file_paths = [journaled.file_path for journaled in batch.files]
+        batch_component.add_external_files(file_paths)
+
+        # Completed files keep their journaled results and are never run
+        # again; files that were mid-transcription restart from their
+        # checkpoint
+        self.batch_results = []
+        batch_file_objects = []
+        for journaled in batch.files:
+            batch_file = BatchFile(journaled.file_path)
+            if journaled.state == "completed":
+                batch_file.status = "completed"
+                batch_file.result = journaled.result
+                self.batch_results.append(
+                    {"index": journaled.index, "results": journaled.result}
+                )
+                batch_component.update_file_status(
+                    journaled.file_path, "Completed", 100
+                )
+            elif journaled.state == "failed":
+                batch_file.status = "failed"
+                batch_file.error_message = journaled.error or ""
+                batch_component.update_file_status(journaled.file_path, "Failed", 0)
+            batch_file_objects.append(batch_file)
+
+        logger.info(
+            f"⏩ Resuming batch {batch.batch_id}: {len(batch.remaining)} of "
+            f"{len(batch.files)} files left"
+        )
+        config = {**self.settings.get_configuration(), **batch.settings}
+        self._launch_batch_processor(
+            batch_file_objects, config, journal, batch.batch_id
+        )
+
     def _pause_batch_processing(self):
         if self.batch_processor:
             self.batch_processor.pause()
@@ -1565,13 +1663,13 @@ For detailed compliance information, generate a Privacy Report."""
             self.current_worker, "transcription_service"
         ):
             if self.current_worker.transcription_service:
-                self.current_worker.transcription_service.cleanup()
+                self.current_worker.transcription_service.cleanup(free_memory=True)
 
         if self.batch_processor and hasattr(
             self.batch_processor, "transcription_service"
         ):
             if self.batch_processor.transcription_service:
-                self.batch_processor.transcription_service.cleanup()
+                self.batch_processor.transcription_service.cleanup(free_memory=True)
 
         # Clean up workers
         if self.current_worker:
@@ -1598,6 +1696,107 @@ def emergency_save_state():
     return manager.emergency_save_state()
 
 
+def _configure_model_registry():
+    """
+    Apply the "model_memory_budget_gb" config key to the shared model
+    registry; without it the budget is derived from free RAM.
+    """
+    try:
+        from src.core.first_run_manager import FirstRunManager
+        from src.core.model_registry import get_model_registry
+
+        budget_gb = FirstRunManager().get_config().get("model_memory_budget_gb")
+        if budget_gb:
+            get_model_registry().set_memory_budget(float(budget_gb))
+            logger.info(f"Model memory budget set to {budget_gb}GB from config")
+    except Exception as e:
+        logger.warning(f"Could not configure model memory budget: {e}")
+
+
+def _batch_execution_options():
+    """
+    How batches run, from the "batch_mode", "batch_workers", "batch_size",
+    "batch_pipeline" and "batch_schedule" config keys. An explicit mode wins;
+    in "auto" the process pool is only used when batch_workers asks for more
+    than one worker.
+    """
+    try:
+        from src.core.batch_pipeline import parse_stage_spec
+        from src.core.batch_scheduler import POLICIES
+        from src.core.first_run_manager import FirstRunManager
+        from src.gui.workers.batch_processor import AUTO, BATCH_MODES
+
+        config = FirstRunManager().get_config()
+        mode = config.get("batch_mode") or AUTO
+        if mode not in BATCH_MODES:
+            logger.warning(f"Unknown batch_mode {mode!r}; using {AUTO}")
+            mode = AUTO
+        options = {"mode": mode, "workers": config.get("batch_workers")}
+        if config.get("batch_size"):
+            options["batch_size"] = int(config["batch_size"])
+        if config.get("batch_pipeline"):
+            try:
+                options["pipeline_stages"] = parse_stage_spec(config["batch_pipeline"])
+            except ValueError as e:
+                logger.warning(f"Ignoring batch_pipeline setting: {e}")
+        if config.get("batch_schedule") in POLICIES:
+            options["schedule_policy"] = config["batch_schedule"]
+        elif config.get("batch_schedule"):
+            logger.warning(f"Unknown batch_schedule {config['batch_schedule']!r}")
+        return options
+    except Exception as e:
+        logger.warning(f"Could not read batch settings: {e}")
+        return {}
+
+
+def _apply_batch_deadlines(batch_files):
+    """
+    Give files matching the "batch_deadlines" config globs their due time,
+    e.g. {"calls/*.mp3": "2h", "urgent.wav": "2026-10-16T17:00"}. Relative
+    times count from when the batch starts.
+    """
+    try:
+        from src.core.batch_scheduler import match_deadlines, parse_deadline_rules
+        from src.core.first_run_manager import FirstRunManager
+
+        rules = FirstRunManager().get_config().get("batch_deadlines") or {}
+        specs = [f"{pattern}={when}" for pattern, when in rules.items()]
+        deadlines = match_deadlines(
+            [batch_file.file_path for batch_file in batch_files],
+            parse_deadline_rules(specs),
+        )
+    except Exception as e:
+        logger.warning(f"Could not apply batch deadlines: {e}")
+        return
+    for index, deadline in deadlines.items():
+        batch_files[index].deadline = deadline
+
+
+def _start_model_warmup():
+    """
+    Preload the configured default model on a background thread (opt-in via
+    the "warm_up_model_on_start" config key) so the first job starts warm.
+    """
+    try:
+        from src.core.first_run_manager import FirstRunManager
+        from src.core.model_warmup import start_model_warmup
+
+        manager = FirstRunManager()
+        config = manager.get_config()
+        if not config.get("warm_up_model_on_start", False):
+            return None
+
+        model_name = config.get("default_model", "base")
+        if not manager.is_model_downloaded(model_name):
+            logger.info(f"Skipping warm-up: model {model_name} not downloaded")
+            return None
+
+        return start_model_warmup(model_name)
+    except Exception as e:
+        logger.warning(f"Could not start model warm-up: {e}")
+        return None
+
+
 def run_professional_gui(is_first_run=False):
     """
     Run the professional xScribe GUI application
@@ -1720,12 +1919,31 @@ def run_professional_gui(is_first_run=False):
     logger.info("Showing main window")
     window.show()
 
+    # Ask about an interrupted batch once the event loop is running
+    QTimer.singleShot(0, window.offer_batch_resume)
+
+    _configure_model_registry()
+    _start_model_warmup()
+
     # THIS IS THE CRITICAL PART - Start the Qt event loop
     logger.info("Starting Qt event loop")
     exit_code = app.exec()
 
     logger.info(f"Qt event loop exited with code: {exit_code}")
 
+    from src.core.model_warmup import cancel_model_warmup
+
+    cancel_model_warmup()
+
+    # XSCRIBE_TRACE=/path/trace.json records every stage of the session
+    from src.core.tracing import TRACE_ENV_VAR, get_tracer
+
+    if get_tracer().enabled:
+        try:
+            get_tracer().export_chrome_trace(os.environ[TRACE_ENV_VAR])
+        except Exception as e:
+            logger.warning(f"Could not write trace: {e}")
+
     # Clean up the instance manager
     manager.clear()
 
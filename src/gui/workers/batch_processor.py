@@ -1,6 +1,5 @@
 import logging
-import os
-import time
+from concurrent.futures import FIRST_COMPLETED, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -8,11 +7,26 @@ from typing import Dict, List, Optional
 from PySide6.QtCore import QThread, Signal
 
 # Proper API imports - no more path hacking!
+from src.core.batch_journal import BatchJournal
+from src.core.batch_pipeline import PipelinedBatchExecutor, StageConfig
+from src.core.batch_pool import BatchProcessPool, batch_worker_count
+from src.core.batch_scheduler import BatchScheduler, ScheduledFile, default_policy
+from src.core.batched_inference import DEFAULT_BATCH_SIZE, WINDOW_SECONDS
+from src.core.tracing import get_tracer
 from src.core.transcription_service import EnhancedTranscriptionService
 from src.models import TranscriptionResult
 
 logger = logging.getLogger(__name__)
 
+# How a batch is executed. "auto" uses the process pool only when more than
+# one worker was asked for, shared encoder passes when every file fits one
+# 30-second window, and the in-process stage pipeline otherwise
+AUTO = "auto"
+PIPELINE = "pipeline"
+BATCHED = "batched"
+POOL = "pool"
+BATCH_MODES = (AUTO, PIPELINE, BATCHED, POOL)
+
 
 @dataclass
 class ProcessingSteps:
@@ -32,6 +46,20 @@ class ProcessingSteps:
         5: "⚡ Processing results",
     }
 
+    @classmethod
+    def for_progress(cls, progress: float) -> int:
+        # Worker processes only report the service's percentage; map it back
+        # onto the step that produces it
+        if progress < 25:
+            return cls.MODEL_LOADING
+        if progress < 40:
+            return cls.AUDIO_QUALITY_ANALYSIS
+        if progress < 60:
+            return cls.AUDIO_PREPROCESSING
+        if progress < 85:
+            return cls.TRANSCRIPTION
+        return cls.POST_PROCESSING
+
 
 @dataclass
 class BatchFile:
@@ -40,6 +68,7 @@ class BatchFile:
     result: Optional[Dict] = None
     error_message: str = ""
     progress: int = 0
+    deadline: Optional[float] = None  # epoch seconds, for earliest_deadline
 
 
 class BatchProcessor(QThread):
@@ -48,6 +77,7 @@ class BatchProcessor(QThread):
     file_progress = Signal(int, int, str, float)  # file_index, step, message, progress
     file_completed = Signal(int, object)  # file_index, result
     file_failed = Signal(int, str)  # file_index, error_message
+    eta_updated = Signal(float)  # estimated seconds left in the batch
     batch_completed = Signal()
 
     def __init__(
@@ -57,19 +87,43 @@ class BatchProcessor(QThread):
         language: str,
         enhanced: bool,
         speaker_detection: bool,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: Optional[int] = None,
+        pipeline_stages: Optional[Dict[str, StageConfig]] = None,
+        schedule_policy: Optional[str] = None,
+        journal: Optional[BatchJournal] = None,
+        batch_id: Optional[int] = None,
+        mode: str = AUTO,
     ):
         super().__init__()
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode: {mode}")
         self.files = files
         self.model = model
         self.language = language
         self.enhanced = enhanced
         self.speaker_detection = speaker_detection
+        self.batch_size = max(1, batch_size)
+        # None sizes the process pool from cores, free RAM and the model when
+        # mode is "pool"; in "auto" it means a single in-process worker
+        self.workers = workers
+        self.mode = mode
+        self.pipeline_stages = pipeline_stages
+        # None orders by deadline when any file has one, else shortest first
+        self.schedule_policy = schedule_policy
+        # With a journal every state change is recorded so a crashed batch
+        # can be resumed; files already completed or failed are skipped
+        self.journal = journal if batch_id is not None else None
+        self.batch_id = batch_id
 
         # Control flags
         self.should_pause = False
         self.should_stop = False
 
         self.transcription_service = None
+        self._pipeline: Optional[PipelinedBatchExecutor] = None
+        self._scheduler: Optional[BatchScheduler] = None
+        self._remaining: Dict[int, ScheduledFile] = {}
 
     def run(self):
         try:
@@ -82,89 +136,50 @@ class BatchProcessor(QThread):
             print(f"Speaker detection: {self.speaker_detection}")
             print("=" * 60 + "\n")
 
-            # One service shared across batch; keep chosen model fixed
-            self.transcription_service = EnhancedTranscriptionService(
-                model_size=self.model,
-                enable_speaker_detection=self.speaker_detection,
-                enable_model_optimization=False,
-                enable_audio_enhancement=self.enhanced,
-                enable_text_processing=True,
-            )
+            todo = [
+                i
+                for i, batch_file in enumerate(self.files)
+                if batch_file.status not in ("completed", "failed")
+            ]
+            mode = self.mode
+            if mode == AUTO and self.workers is not None and self.workers > 1:
+                mode = POOL
+            workers = 1
+            if mode == POOL:
+                workers = self.workers or batch_worker_count(self.model)
+                workers = max(1, min(workers, len(todo)))
+
+            if len(todo) < len(self.files):
+                logger.info(
+                    f"⏩ Resuming batch: {len(self.files) - len(todo)} files "
+                    "already done"
+                )
+
+            order = self._plan(workers, todo)
+            if mode == AUTO:
+                mode = BATCHED if self._all_short_clips() else PIPELINE
 
             logger.info(
-                f"🔄 Starting batch processing of {len(self.files)} files with {self.model} model"
+                f"🔄 Starting batch processing of {len(todo)} files with "
+                f"{self.model} model ({mode}, {workers} worker process(es))"
             )
 
-            for i, batch_file in enumerate(self.files):
-                if self.should_stop:
-                    logger.info("🛑 Batch processing stopped by user")
-                    break
-
-                # Handle pause/resume
-                while self.should_pause and not self.should_stop:
-                    self.msleep(100)  # Milliseconds
-
-                if self.should_stop:
-                    break
-
-                # Start processing this file
-                filename = Path(batch_file.file_path).name
-                self.file_started.emit(i, filename)
-                logger.info(f"📁 Processing file {i + 1}/{len(self.files)}: {filename}")
-
-                try:
-                    # Validate file before processing
-                    is_valid, validation_msg = self.transcription_service.validate_file(
-                        batch_file.file_path
-                    )
-                    if not is_valid:
-                        raise ValueError(f"File validation failed: {validation_msg}")
-
-                    # Process file using professional service
-                    result = self._process_single_file(i, batch_file)
-
-                    if result:
-                        self.file_completed.emit(i, result.to_dict())
-                        logger.info(f"✅ Successfully processed: {filename}")
-                    else:
-                        raise Exception("Transcription service returned no result")
-
-                except FileNotFoundError as e:
-                    error_msg = f"File not found: {str(e)}"
-                    logger.error(f"❌ {error_msg}")
-                    self.file_failed.emit(i, error_msg)
-                    # Continue
-
-                except ValueError as e:
-                    # Validation errors (corrupt, empty, too long, etc.)
-                    error_msg = f"Invalid file: {str(e)}"
-                    logger.error(f"❌ {error_msg}")
-                    self.file_failed.emit(i, error_msg)
-                    # Continue
-
-                except PermissionError as e:
-                    error_msg = f"Permission denied: {str(e)}"
-                    logger.error(f"❌ {error_msg}")
-                    self.file_failed.emit(i, error_msg)
-                    # Continue
-
-                except MemoryError:
-                    error_msg = f"Out of memory processing {filename}"
-                    logger.error(f"❌ {error_msg}")
-                    self.file_failed.emit(i, error_msg)
-                    # Try to recover by cleaning up
-                    if self.transcription_service:
-                        self.transcription_service.cleanup()
-                    import gc
-
-                    gc.collect()
-                    # Continue
-
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"❌ Failed to process {filename}: {error_msg}")
-                    self.file_failed.emit(i, error_msg)
-                    # Continue
+            if mode == POOL:
+                self._run_pool(workers, order)
+            elif mode == BATCHED:
+                # One service shared across batch; keep chosen model fixed. The
+                # model itself is borrowed from the process-wide registry
+                self.transcription_service = EnhancedTranscriptionService(
+                    **self._service_options()
+                )
+                self._run_batched(order)
+                self.transcription_service.cleanup()
+            else:
+                self._run_pipelined(order)
+
+            if self.journal is not None and not self.should_stop:
+                # A stopped batch stays resumable
+                self.journal.finish_batch(self.batch_id)
 
             logger.info("🎉 Batch processing completed")
             self.batch_completed.emit()
@@ -174,84 +189,270 @@ class BatchProcessor(QThread):
             self.file_failed.emit(-1, f"Batch processing failed: {e}")
             # End
 
-    def _process_single_file(
-        self, file_index: int, batch_file: BatchFile
-    ) -> Optional[TranscriptionResult]:
-        # Step 1: File validation
-        self.file_progress.emit(
-            file_index,
-            ProcessingSteps.FILE_VALIDATION,
-            "Validating audio file...",
-            10,
+    def _service_options(self) -> Dict:
+        return {
+            "model_size": self.model,
+            "enable_speaker_detection": self.speaker_detection,
+            "enable_model_optimization": False,
+            "enable_audio_enhancement": self.enhanced,
+            "enable_text_processing": True,
+            # A resumed batch picks long files up from their last window
+            "enable_checkpoints": True,
+        }
+
+    def _plan(self, workers: int, todo: List[int]) -> List[int]:
+        # Durations come from file headers (or ffprobe), so ordering a large
+        # batch costs well under a second per hundred files
+        deadlines = {
+            position: self.files[i].deadline
+            for position, i in enumerate(todo)
+            if self.files[i].deadline is not None
+        }
+        policy = self.schedule_policy or default_policy(bool(deadlines))
+        self._scheduler = BatchScheduler(policy, self.model, workers)
+        schedule = self._scheduler.schedule(
+            [self.files[i].file_path for i in todo], deadlines
         )
-
-        if not os.path.exists(batch_file.file_path):
-            raise Exception(f"Audio file not found: {batch_file.file_path}")
-
-        # Step 2: Quality analysis
-        self.file_progress.emit(
-            file_index,
-            ProcessingSteps.AUDIO_QUALITY_ANALYSIS,
-            "Analyzing audio quality...",
-            25,
+        # The scheduler numbers files by their position in todo
+        for item in schedule:
+            item.index = todo[item.index]
+        self._remaining = {item.index: item for item in schedule}
+        self._emit_eta()
+        return [item.index for item in schedule]
+
+    def _all_short_clips(self) -> bool:
+        # Batching only pays off when every file is a single encoder window;
+        # one long file would hold the rest of its group back
+        if self.batch_size < 2 or not self._remaining:
+            return False
+        return all(
+            item.duration is not None and item.duration <= WINDOW_SECONDS
+            for item in self._remaining.values()
         )
 
-        # Step 3: Preprocessing
-        self.file_progress.emit(
-            file_index,
-            ProcessingSteps.AUDIO_PREPROCESSING,
-            "Preprocessing audio...",
-            40,
+    def _emit_eta(self):
+        if self._scheduler is not None:
+            remaining = list(self._remaining.values())
+            self.eta_updated.emit(self._scheduler.remaining_seconds(remaining))
+
+    def _start_file(self, file_index: int, filename: str):
+        self.files[file_index].status = "processing"
+        if self.journal is not None:
+            self.journal.mark_processing(self.batch_id, file_index)
+        self.file_started.emit(file_index, filename)
+
+    def _complete_file(self, file_index: int, result: Dict):
+        self.files[file_index].status = "completed"
+        self.files[file_index].result = result
+        if self.journal is not None:
+            self.journal.mark_completed(self.batch_id, file_index, result)
+        self.file_completed.emit(file_index, result)
+        if self._scheduler is not None:
+            # Each finished file refines the realtime factor behind the ETA
+            self._scheduler.record_result(result)
+        self._remaining.pop(file_index, None)
+        self._emit_eta()
+
+    def _run_pool(self, workers: int, order: List[int]):
+        # Each worker process holds its own model and takes the next file as
+        # soon as it is free. Only as many files as there are workers are in
+        # flight, so pause and stop take effect at the next file boundary
+        language = None if self.language == "auto" else self.language
+        options = {"language": language, "enable_enhancements": self.enhanced}
+        pending = [(i, self.files[i]) for i in order]
+        in_flight = {}
+
+        with BatchProcessPool(workers, self._service_options()) as pool:
+            while pending or in_flight:
+                while (
+                    pending
+                    and len(in_flight) < workers
+                    and not self.should_pause
+                    and not self.should_stop
+                ):
+                    i, batch_file = pending.pop(0)
+                    filename = Path(batch_file.file_path).name
+                    self._start_file(i, filename)
+                    logger.info(
+                        f"📁 Dispatching file {i + 1}/{len(self.files)}: {filename}"
+                    )
+                    try:
+                        future = pool.submit(i, batch_file.file_path, options)
+                    except Exception as e:
+                        self._report_failure(i, filename, e)
+                        continue
+                    in_flight[future] = (i, filename)
+
+                if self.should_stop and not in_flight:
+                    logger.info("🛑 Batch processing stopped by user")
+                    break
+                if not in_flight:
+                    self.msleep(100)  # Paused with nothing running
+                    continue
+
+                done, _ = wait(in_flight, timeout=0.1, return_when=FIRST_COMPLETED)
+                self._emit_pool_progress(pool)
+
+                for future in done:
+                    i, filename = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._report_failure(i, filename, e)
+                        continue
+                    get_tracer().extend(result.pop("trace_events", []))
+
+                    self.file_progress.emit(
+                        i, ProcessingSteps.POST_PROCESSING, "Processing complete", 100
+                    )
+                    self._complete_file(i, result)
+                    logger.info(f"✅ Successfully processed: {filename}")
+
+    def _emit_pool_progress(self, pool: BatchProcessPool):
+        for i, message, progress in pool.progress_events():
+            if progress < 100:
+                self.file_progress.emit(
+                    i, ProcessingSteps.for_progress(progress), message, progress
+                )
+
+    def _run_pipelined(self, order: List[int]):
+        # Decoding and enhancing the next files overlaps inference of the
+        # current one; each stage reports through the usual per-file signals
+        language = None if self.language == "auto" else self.language
+        self._pipeline = PipelinedBatchExecutor(
+            stages=self.pipeline_stages, **self._service_options()
         )
+        if self.should_pause:
+            self._pipeline.pause()
 
-        # Step 4: Model loading (already loaded, but report progress)
-        self.file_progress.emit(
-            file_index,
-            ProcessingSteps.MODEL_LOADING,
-            f"Using {self.model.upper()} model...",
-            60,
-        )
+        # The executor numbers files by their position in the scheduled order
+        def on_started(position: int, file_path: Path):
+            i = order[position]
+            self._start_file(i, file_path.name)
+            logger.info(
+                f"📁 Processing file {i + 1}/{len(self.files)}: {file_path.name}"
+            )
 
-        # Step 5: Transcription
-        self.file_progress.emit(
-            file_index, ProcessingSteps.TRANSCRIPTION, "🗣️ Transcribing audio...", 70
-        )
+        def on_progress(position: int, message: str, progress: float):
+            self.file_progress.emit(
+                order[position],
+                ProcessingSteps.for_progress(progress),
+                message,
+                progress,
+            )
 
-        # Use professional service for transcription
-        transcription_start = time.time()
-        language = None if self.language == "auto" else self.language
+        def on_completed(position: int, result: TranscriptionResult, _):
+            self._complete_file(order[position], result.to_dict())
+            logger.info(f"✅ Successfully processed: {result.file_path.name}")
 
-        result = self.transcription_service.transcribe_file(
-            file_path=batch_file.file_path,
-            language=language,
-            enable_enhancements=self.enhanced,
-        )
+        def on_failed(position: int, error: Exception):
+            i = order[position]
+            self._report_failure(i, Path(self.files[i].file_path).name, error)
+
+        try:
+            self._pipeline.run(
+                [self.files[i].file_path for i in order],
+                on_started=on_started,
+                on_progress=on_progress,
+                on_completed=on_completed,
+                on_failed=on_failed,
+                language=language,
+                enable_enhancements=self.enhanced,
+            )
+        finally:
+            self._pipeline = None
 
-        transcription_time = time.time() - transcription_start
+    def _run_batched(self, order: List[int]):
+        # Short clips from several files share one encoder pass; results come
+        # back per file, so the GUI still sees the usual per-file signals
+        language = None if self.language == "auto" else self.language
 
-        # Step 6: Post-processing
-        self.file_progress.emit(
-            file_index,
-            ProcessingSteps.POST_PROCESSING,
-            f"⚡ Completed in {transcription_time:.1f}s",
-            95,
-        )
+        for group_start in range(0, len(order), self.batch_size):
+            if not self._wait_while_paused():
+                logger.info("🛑 Batch processing stopped by user")
+                break
+
+            group = [
+                (i, self.files[i])
+                for i in order[group_start : group_start + self.batch_size]
+            ]
+            for i, batch_file in group:
+                self._start_file(i, Path(batch_file.file_path).name)
+                self.file_progress.emit(
+                    i,
+                    ProcessingSteps.TRANSCRIPTION,
+                    f"🗣️ Transcribing in a batch of {len(group)}...",
+                    50,
+                )
 
-        # Final progress
-        self.file_progress.emit(
-            file_index, ProcessingSteps.POST_PROCESSING, "Processing complete", 100
-        )
+            logger.info(
+                f"📦 Processing files {group_start + 1}-{group_start + len(group)}"
+                f"/{len(self.files)} as one batch"
+            )
+            outcomes = self.transcription_service.transcribe_files_batched(
+                [batch_file.file_path for _, batch_file in group],
+                language=language,
+                enable_enhancements=self.enhanced,
+                batch_size=self.batch_size,
+            )
 
-        return result
+            for (i, batch_file), (_, outcome) in zip(group, outcomes):
+                filename = Path(batch_file.file_path).name
+                if isinstance(outcome, Exception):
+                    self._report_failure(i, filename, outcome)
+                    continue
+
+                self.file_progress.emit(
+                    i, ProcessingSteps.POST_PROCESSING, "Processing complete", 100
+                )
+                self._complete_file(i, outcome.to_dict())
+                logger.info(f"✅ Successfully processed: {filename}")
+
+    def _wait_while_paused(self) -> bool:
+        while self.should_pause and not self.should_stop:
+            self.msleep(100)  # Milliseconds
+        return not self.should_stop
+
+    def _report_failure(self, file_index: int, filename: str, error: Exception):
+        if isinstance(error, FileNotFoundError):
+            error_msg = f"File not found: {str(error)}"
+        elif isinstance(error, ValueError):
+            # Validation errors (corrupt, empty, too long, etc.)
+            error_msg = f"Invalid file: {str(error)}"
+        elif isinstance(error, PermissionError):
+            error_msg = f"Permission denied: {str(error)}"
+        elif isinstance(error, MemoryError):
+            error_msg = f"Out of memory processing {filename}"
+        else:
+            error_msg = str(error)
+
+        logger.error(f"❌ Failed to process {filename}: {error_msg}")
+        self.files[file_index].status = "failed"
+        self.files[file_index].error_message = error_msg
+        if self.journal is not None:
+            self.journal.mark_failed(self.batch_id, file_index, error_msg)
+        self.file_failed.emit(file_index, error_msg)
+        self._remaining.pop(file_index, None)
+        self._emit_eta()
+
+        if isinstance(error, MemoryError) and self.transcription_service:
+            # Try to recover by evicting idle models from the registry
+            self.transcription_service.cleanup(free_memory=True)
 
     def pause(self):
         self.should_pause = True
+        if self._pipeline is not None:
+            self._pipeline.pause()
         logger.info("Batch processing paused")
 
     def resume(self):
         self.should_pause = False
+        if self._pipeline is not None:
+            self._pipeline.resume()
         logger.info("Batch processing resumed")
 
     def stop(self):
         self.should_stop = True
+        if self._pipeline is not None:
+            self._pipeline.stop()
         logger.info("Batch processing stop requested")
@@ -113,6 +113,7 @@ class TranscriptionWorker(QThread):
                 enable_audio_enhancement=self.enhanced,
                 enable_text_processing=True,
                 progress_callback=progress_callback,
+                word_timestamps=self.word_timestamps,
             )
 
             self.progress_updated.emit(
@@ -171,3 +172,8 @@ class TranscriptionWorker(QThread):
                 f"Transcription failed for {os.path.basename(self.file_path)}: {error_msg}"
             )
             self.error_occurred.emit(error_msg)
+
+        finally:
+            # Hand the model back to the registry so the next job reuses it
+            if self.transcription_service:
+                self.transcription_service.cleanup()
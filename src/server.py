@@ -0,0 +1,421 @@
+import argparse
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import socket
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from src.cli import MODEL_SIZES, OUTPUT_FORMATS, render_output
+from src.core.filename_utils import sanitize_filename
+from src.core.job_queue import (
+    DEFAULT_MAX_QUEUED_JOBS,
+    JobState,
+    QueueFullError,
+    TranscriptionJobQueue,
+)
+from src.core.job_store import JobStore
+from src.core.model_warmup import ModelWarmup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_JSON_BODY_BYTES = 1024 * 1024
+DEFAULT_UPLOAD_DIR = Path.home() / ".cache" / "xscribe" / "uploads"
+TOKEN_ENV_VAR = "XSCRIBE_SERVER_TOKEN"
+LOOPBACK_NAMES = ("127.0.0.1", "localhost", "[::1]")
+
+JOB_OPTIONS = ("language", "domain", "accuracy_priority", "enable_enhancements")
+CONTENT_TYPES = {
+    "json": "application/json",
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+}
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TranscriptionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        job_queue: TranscriptionJobQueue,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        upload_dir: Optional[Path] = None,
+        token: Optional[str] = None,
+    ):
+        # Jobs name files on this machine, so the server refuses to listen
+        # anywhere but loopback. Loopback alone does not stop a web page in
+        # the user's browser, hence the Host/Origin checks and the token
+        if not is_loopback(host):
+            raise ValueError(f"Refusing to bind to non-loopback address: {host}")
+        if ":" in host:
+            self.address_family = socket.AF_INET6
+
+        self.job_queue = job_queue
+        self.upload_dir = Path(
+            upload_dir or tempfile.mkdtemp(prefix="xscribe-uploads-")
+        )
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.token = token or secrets.token_urlsafe(24)
+        super().__init__((host, port), TranscriptionRequestHandler)
+
+    @property
+    def allowed_hosts(self) -> Tuple[str, ...]:
+        port = self.server_address[1]
+        return tuple(f"{name}:{port}" for name in LOOPBACK_NAMES)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.job_queue.shutdown(wait=False)
+
+
+class TranscriptionRequestHandler(BaseHTTPRequestHandler):
+    server: TranscriptionServer
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = (
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("GET", re.compile(r"^/jobs$"), "list_jobs"),
+        ("POST", re.compile(r"^/jobs$"), "submit_job"),
+        ("GET", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)$"), "job_status"),
+        ("GET", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)/result$"), "job_result"),
+        ("POST", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)/cancel$"), "cancel_job"),
+        ("DELETE", re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)$"), "cancel_job"),
+    )
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(f"🌐 {self.address_string()} {format % args}")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self._body_read = False
+        try:
+            self._check_caller(url.path)
+            for route_method, pattern, handler_name in self.ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    getattr(self, handler_name)(query, **match.groupdict())
+                    return
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+        except HTTPError as e:
+            self._send_error(e.status, str(e))
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+
+    def _check_caller(self, path: str) -> None:
+        # A rebound DNS name reaches loopback with a foreign Host, and a
+        # cross-site page sends its own Origin; neither gets past here
+        host = (self.headers.get("Host") or "").lower()
+        if host not in self.server.allowed_hosts:
+            raise HTTPError(HTTPStatus.FORBIDDEN, f"Host not allowed: {host}")
+        origin = self.headers.get("Origin")
+        if origin is not None and urlparse(origin).netloc.lower() != host:
+            raise HTTPError(HTTPStatus.FORBIDDEN, f"Origin not allowed: {origin}")
+        if path == "/health":
+            return
+
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.strip().encode(), self.server.token.encode()
+        ):
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Missing or wrong token")
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        # Keep-alive parses the next request straight after this one's body,
+        # so a body left unread (or half read) means the connection must go
+        if not self._body_read and (
+            self.headers.get("Content-Length") not in (None, "0")
+            or self.headers.get("Transfer-Encoding")
+        ):
+            self.close_connection = True
+        self._send_json({"error": message}, status)
+
+    # Endpoints
+
+    def health(self, query: Dict[str, str]) -> None:
+        self._send_json({"status": "ok", **self.server.job_queue.stats()})
+
+    def list_jobs(self, query: Dict[str, str]) -> None:
+        jobs = self.server.job_queue.jobs()
+        if "status" in query:
+            jobs = [job for job in jobs if job.status == query["status"]]
+        self._send_json({"jobs": [job.to_dict() for job in jobs]})
+
+    def submit_job(self, query: Dict[str, str]) -> None:
+        file_path, options, upload = self._read_submission(query)
+        try:
+            job = self.server.job_queue.submit(file_path, owns_file=upload, **options)
+        except QueueFullError as e:
+            if upload:
+                file_path.unlink(missing_ok=True)
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, str(e))
+        self._send_json(job.to_dict(), HTTPStatus.ACCEPTED)
+
+    def job_status(self, query: Dict[str, str], job_id: str) -> None:
+        self._send_json(self._get_job(job_id).to_dict())
+
+    def job_result(self, query: Dict[str, str], job_id: str) -> None:
+        job = self._get_job(job_id)
+        fmt = query.get("format", "json").lower()
+        if fmt not in OUTPUT_FORMATS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unsupported format: {fmt}")
+        if job.status != JobState.COMPLETED:
+            raise HTTPError(HTTPStatus.CONFLICT, f"Job is {job.status}")
+
+        job_queue = self.server.job_queue
+        # Subtitles align words on demand, which updates the stored result
+        with job_queue.result_service() as service, job.lock:
+            content = render_output(service, job.result, fmt)
+        if fmt in ("srt", "vtt"):
+            job_queue.persist(job)
+        self._send_body(content.encode("utf-8"), CONTENT_TYPES[fmt])
+
+    def cancel_job(self, query: Dict[str, str], job_id: str) -> None:
+        job = self.server.job_queue.cancel(job_id)
+        if job is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+        self._send_json(job.to_dict(), HTTPStatus.ACCEPTED)
+
+    # Helpers
+
+    def _get_job(self, job_id: str):
+        job = self.server.job_queue.get(job_id)
+        if job is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+        return job
+
+    def _read_submission(
+        self, query: Dict[str, str]
+    ) -> Tuple[Path, Dict[str, Any], bool]:
+        # Either JSON naming a local file, or the audio itself as the body
+        # with ?filename=... and the job options as query parameters
+        length = self._content_length()
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+
+        if content_type == "application/json":
+            if length > MAX_JSON_BODY_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+            body = self.rfile.read(length)
+            self._body_read = len(body) == length
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+            if not payload.get("path"):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing 'path'")
+            file_path = Path(payload["path"]).expanduser()
+            if not file_path.is_file():
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"File not found: {file_path}")
+            return file_path, _job_options(payload), False
+
+        if length <= 0:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Upload needs Content-Length")
+        filename = sanitize_filename(unquote(query.get("filename", "upload.wav")))
+        fd, name = tempfile.mkstemp(
+            prefix="job-", suffix=f"-{filename}", dir=self.server.upload_dir
+        )
+        upload_path = Path(name)
+        with os.fdopen(fd, "wb") as f:
+            remaining = length
+            while remaining > 0:
+                data = self.rfile.read(min(UPLOAD_CHUNK_BYTES, remaining))
+                if not data:
+                    break
+                f.write(data)
+                remaining -= len(data)
+        if remaining:
+            upload_path.unlink(missing_ok=True)
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Upload ended early")
+        self._body_read = True
+        return upload_path, _job_options(query), True
+
+    def _content_length(self) -> int:
+        if self.headers.get("Transfer-Encoding"):
+            raise HTTPError(
+                HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported"
+            )
+        value = self.headers.get("Content-Length") or "0"
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"Invalid Content-Length: {value!r}"
+            )
+        return length
+
+    def _send_json(
+        self, payload: Dict[str, Any], status: HTTPStatus = HTTPStatus.OK
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self._send_body(body, "application/json", status)
+
+    def _send_body(
+        self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _job_options(source: Dict[str, Any]) -> Dict[str, Any]:
+    options = {key: source[key] for key in JOB_OPTIONS if source.get(key) is not None}
+    if options.get("language") == "auto":
+        options["language"] = None
+    if isinstance(options.get("enable_enhancements"), str):
+        options["enable_enhancements"] = options["enable_enhancements"].lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+    return options
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xscribe-server",
+        description="Serve transcription jobs to local tools over HTTP.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Loopback address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-m", "--model", default="base", choices=MODEL_SIZES)
+    parser.add_argument("--device", help="Torch device, e.g. cpu or cuda")
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16", "int8"))
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=1, help="Jobs processed at once"
+    )
+    parser.add_argument(
+        "--max-queued",
+        type=int,
+        default=DEFAULT_MAX_QUEUED_JOBS,
+        help="Waiting jobs before submissions are refused",
+    )
+    parser.add_argument("--bounded-memory", action="store_true")
+    parser.add_argument("--upload-dir", type=Path)
+    parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENV_VAR),
+        help=f"Bearer token clients must send (default: ${TOKEN_ENV_VAR}, "
+        "else a new random one printed at startup)",
+    )
+    parser.add_argument(
+        "--jobs-db", type=Path, help="SQLite file that keeps jobs across restarts"
+    )
+    parser.add_argument(
+        "--no-persist",
+        action="store_true",
+        help="Keep jobs in memory only; they are lost when the server stops",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    # Queued uploads have to outlive the process for stored jobs to resume,
+    # so only an in-memory queue gets a throwaway upload directory
+    store = None if args.no_persist else JobStore(args.jobs_db)
+    upload_dir = args.upload_dir
+    if upload_dir is None and store is not None:
+        upload_dir = DEFAULT_UPLOAD_DIR
+
+    job_queue = TranscriptionJobQueue(
+        concurrency=args.concurrency,
+        max_queued=args.max_queued,
+        store=store,
+        model_size=args.model,
+        device=args.device,
+        precision=args.precision,
+        enable_model_optimization=False,
+        bounded_memory=args.bounded_memory,
+    )
+    try:
+        server = TranscriptionServer(
+            job_queue, args.host, args.port, upload_dir, token=args.token
+        )
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    # Keep one warm model pinned for the server's lifetime; every worker's
+    # service borrows that same instance from the registry
+    warmup = ModelWarmup(args.model, args.device, args.precision).start()
+    job_queue.start()
+    print(f"xScribe server listening on {server.url}", file=sys.stderr)
+    if not args.token:
+        print(f"Token: {server.token}", file=sys.stderr)
+
+    try:
+        with redirect_stdout(sys.stderr):
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        warmup.cancel()
+        if store is None:
+            shutil.rmtree(server.upload_dir, ignore_errors=True)
+        else:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
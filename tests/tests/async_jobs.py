@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pytest
+
+from support import WindowModel, audio_files, decode_as, service_factory, tone
+
+
+@pytest.fixture
+def async_files(monkeypatch, tmp_path):
+    decode_as(monkeypatch, tone(5.0))
+    return audio_files(tmp_path, "a.wav", "b.wav", "c.wav")
+
+
+_ASYNC_SERVICE_OPTIONS = {
+    "enable_audio_enhancement": False,
+    "enable_model_optimization": False,
+}
+
+
+def test_async_service_bounds_concurrency(async_files):
+    import asyncio
+    import threading
+    import time
+
+    from src.core.async_service import AsyncTranscriptionService
+
+    running, peak, lock = [0], [0], threading.Lock()
+
+    class _SlowModel(WindowModel):
+        def transcribe(self, audio, **options):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return super().transcribe(audio, **options)
+
+    async def main():
+        async with AsyncTranscriptionService(
+            max_concurrent_jobs=2,
+            service_factory=service_factory(_SlowModel, **_ASYNC_SERVICE_OPTIONS),
+        ) as service:
+            return await asyncio.gather(*(service.submit(f) for f in async_files))
+
+    results = asyncio.run(main())
+    assert all(r.full_text.strip() for r in results)
+    assert peak[0] == 2
+
+
+def test_async_service_streams_progress_until_done(async_files):
+    import asyncio
+
+    from src.core.async_service import AsyncTranscriptionService
+
+    async def main():
+        async with AsyncTranscriptionService(
+            service_factory=service_factory(**_ASYNC_SERVICE_OPTIONS)
+        ) as service:
+            job = service.submit(async_files[0])
+            events = [event async for event in job.progress()]
+            return events, await job, await service.validate_file(async_files[0])
+
+    events, result, validation = asyncio.run(main())
+    assert [e.progress for e in events] == sorted(e.progress for e in events)
+    assert events[-1].progress == 100.0
+    assert result.full_text.strip()
+    assert validation[0]
+
+
+def test_async_service_cancels_a_running_job(async_files):
+    import asyncio
+    import threading
+
+    from src.core.async_service import AsyncTranscriptionService
+
+    release = threading.Event()
+
+    class _BlockingModel(WindowModel):
+        def transcribe(self, audio, **options):
+            release.wait(5)
+            return super().transcribe(audio, **options)
+
+    async def main():
+        async with AsyncTranscriptionService(
+            service_factory=service_factory(_BlockingModel, **_ASYNC_SERVICE_OPTIONS)
+        ) as service:
+            job = service.submit(async_files[0])
+            await asyncio.sleep(0.2)
+            job.cancel()
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await job
+            return job
+
+    assert asyncio.run(main()).cancelled
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE, AudioBuffer
+from src.core.audio_enhancer import AudioEnhancer
+
+from support import tone
+
+
+@pytest.fixture
+def tone_buffer() -> AudioBuffer:
+    return AudioBuffer.from_array(tone(2.0))
+
+
+def test_audio_buffer_normalizes_dtype_and_reports_duration(tone_buffer):
+    assert tone_buffer.samples.dtype == np.float32
+    assert tone_buffer.duration == pytest.approx(2.0)
+    assert len(tone_buffer.slice(0.5, 1.0)) == SAMPLE_RATE // 2
+
+
+def test_audio_buffer_resamples_foreign_rate():
+    buffer = AudioBuffer.from_array(tone(1.0)[::2], sample_rate=8000)
+    assert buffer.sample_rate == SAMPLE_RATE
+    assert buffer.native_sample_rate == 8000
+    assert buffer.duration == pytest.approx(1.0, abs=0.01)
+
+
+def test_quality_analysis_reports_the_native_sample_rate(monkeypatch, tmp_path):
+    import wave
+
+    import whisper
+
+    path = tmp_path / "studio.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b"\0\0" * 44100)
+    monkeypatch.setattr(whisper, "load_audio", lambda path: tone(1.0))
+
+    buffer = AudioBuffer.from_file(path)
+    assert buffer.native_sample_rate == 44100
+
+    # Measured on the shared 16 kHz samples, reported at the source's rate
+    analysis = AudioEnhancer().analyze_audio_quality(buffer)
+    assert analysis["sample_rate"] == 44100
+    assert analysis["analysis_sample_rate"] == SAMPLE_RATE
+    assert analysis["duration"] == pytest.approx(1.0)
+
+
+def test_enhancer_accepts_shared_buffer(tone_buffer):
+    enhancer = AudioEnhancer()
+
+    analysis = enhancer.analyze_audio_quality(tone_buffer)
+    assert analysis["duration"] == pytest.approx(2.0)
+    assert analysis["sample_rate"] == SAMPLE_RATE
+
+    enhanced, sr = enhancer.enhance_audio(tone_buffer, enable_noise_reduction=False)
+    assert sr == SAMPLE_RATE
+    assert len(enhanced) > 0
+
+
+def test_model_input_is_float32_in_memory():
+    import torch
+
+    from src.core.transcription_service import EnhancedTranscriptionService
+
+    enhanced = tone(0.5)  # float64, as returned by the enhancement chain
+    model_input = EnhancedTranscriptionService._as_model_input(enhanced)
+    assert isinstance(model_input, np.ndarray)
+    assert model_input.dtype == np.float32
+
+    tensor_input = EnhancedTranscriptionService._as_model_input(
+        torch.from_numpy(enhanced)
+    )
+    assert tensor_input.dtype == torch.float32
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import pytest
+
+from support import WindowModel, service_factory, write_wav
+
+
+def test_batch_worker_count_respects_cores_memory_and_safe_limit(monkeypatch):
+    import psutil
+
+    from src.core import batch_pool
+
+    class _Monitor:
+        limit = None
+
+        def get_safe_batch_size_recommendation(self):
+            return self.limit
+
+    def available(gb):
+        memory = psutil.virtual_memory()
+        monkeypatch.setattr(
+            psutil,
+            "virtual_memory",
+            lambda: memory._replace(available=int(gb * 1024**3)),
+        )
+
+    monitor = _Monitor()
+    monkeypatch.setattr(batch_pool.os, "cpu_count", lambda: 16)
+
+    available(64)
+    assert batch_pool.batch_worker_count("base", monitor) == 8
+    # medium needs 3 GB of weights plus working set per worker
+    available(18)
+    assert batch_pool.batch_worker_count("medium", monitor) == 4
+    available(2.5)
+    assert batch_pool.batch_worker_count("medium", monitor) == 1
+
+    available(64)
+    monitor.limit = 3
+    assert batch_pool.batch_worker_count("tiny", monitor) == 3
+
+
+def test_batch_pipeline_overlaps_stages_and_reports_per_file(
+    monkeypatch, speech_files, tmp_path
+):
+    import threading
+
+    from src.core.batch_pipeline import (
+        ENHANCE,
+        FINALIZE,
+        INFER,
+        PipelinedBatchExecutor,
+        StageConfig,
+        parse_stage_spec,
+    )
+    from src.core.transcription_service import EnhancedTranscriptionService
+
+    # Inference of the first file blocks until the second has been enhanced,
+    # which only happens if preparation runs ahead of the model
+    second_enhanced = threading.Event()
+    original_enhance = EnhancedTranscriptionService.enhance_audio
+
+    def enhance_audio(self, work):
+        original_enhance(self, work)
+        if work.file_path.name == "b.wav":
+            second_enhanced.set()
+
+    monkeypatch.setattr(EnhancedTranscriptionService, "enhance_audio", enhance_audio)
+
+    class _OverlapModel(WindowModel):
+        def transcribe(self, audio, **options):
+            assert second_enhanced.wait(5), "enhance did not overlap inference"
+            return super().transcribe(audio, **options)
+
+    files = speech_files("a.wav", "b.wav", "c.wav")
+    files.insert(1, tmp_path / "missing.wav")
+
+    completed, failed, exported = {}, {}, []
+    executor = PipelinedBatchExecutor(
+        stages={INFER: StageConfig(workers=1, queue_depth=1)},
+        service_factory=service_factory(_OverlapModel),
+        enable_model_optimization=False,
+        enable_audio_enhancement=False,
+    )
+    stats = executor.run(
+        files,
+        on_completed=lambda i, result, extra: completed.setdefault(i, (result, extra)),
+        on_failed=lambda i, error: failed.setdefault(i, error),
+        export=lambda service, i, result: exported.append(i) or f"out-{i}",
+        enable_enhancements=False,
+    )
+
+    assert sorted(completed) == [0, 2, 3]
+    assert isinstance(failed[1], FileNotFoundError)
+    assert sorted(exported) == [0, 2, 3]
+    result, extra = completed[2]
+    assert extra == "out-2" and "number" in result.full_text.lower()
+    assert stats[FINALIZE].processed == 3 and stats[ENHANCE].processed == 3
+    assert executor.queue_depths() == {name: 0 for name in executor.stages}
+
+    stages = parse_stage_spec("enhance=3, infer=1:4")
+    assert stages[ENHANCE].workers == 3 and stages[INFER].queue_depth == 4
+    with pytest.raises(ValueError):
+        parse_stage_spec("transcode=2")
+
+
+def test_batch_processor_picks_execution_mode_explicitly(
+    monkeypatch, rtf_store, tmp_path
+):
+    from src.gui.workers import batch_processor
+    from src.gui.workers.batch_processor import BatchFile, BatchProcessor
+
+    # Many cores must not switch a batch to the process pool on its own
+    monkeypatch.setattr(batch_processor, "batch_worker_count", lambda model: 8)
+
+    clips = [write_wav(tmp_path / f"clip{i}.wav", 2) for i in range(3)]
+    lecture = write_wav(tmp_path / "lecture.wav", 45)
+
+    def chosen(files, **options):
+        processor = BatchProcessor(
+            [BatchFile(str(path)) for path in files],
+            model="base",
+            language="auto",
+            enhanced=False,
+            speaker_detection=False,
+            **options,
+        )
+        runs = []
+        processor._run_pool = lambda workers, order: runs.append(("pool", workers))
+        processor._run_batched = lambda order: runs.append(("batched", 1))
+        processor._run_pipelined = lambda order: runs.append(("pipeline", 1))
+        processor.run()
+        return runs
+
+    assert chosen(clips) == [("batched", 1)]
+    assert chosen(clips + [lecture]) == [("pipeline", 1)]
+    assert chosen(clips, batch_size=1) == [("pipeline", 1)]
+    assert chosen(clips, workers=2) == [("pool", 2)]
+    assert chosen(clips, mode="pool") == [("pool", 3)]
+    assert chosen(clips + [lecture], mode="batched") == [("batched", 1)]
+    with pytest.raises(ValueError):
+        chosen(clips, mode="threads")
+
+
+def test_batch_processor_runs_pipeline_with_configured_stages(
+    monkeypatch, speech_files, rtf_store, tmp_path
+):
+    from src.core import batch_pipeline
+    from src.core.batch_pipeline import ENHANCE, INFER, parse_stage_spec
+    from src.gui.workers import batch_processor
+    from src.gui.workers.batch_processor import BatchFile, BatchProcessor
+
+    executors = []
+
+    class _Executor(batch_pipeline.PipelinedBatchExecutor):
+        def __init__(self, stages=None, **options):
+            super().__init__(stages, service_factory(), **options)
+            executors.append(self)
+
+    monkeypatch.setattr(batch_processor, "PipelinedBatchExecutor", _Executor)
+
+    files = [tmp_path / name for name in ("a.wav", "missing.wav", "b.wav")]
+    for path in (files[0], files[2]):
+        write_wav(path, 45)
+    processor = BatchProcessor(
+        [BatchFile(str(path)) for path in files],
+        model="base",
+        language="auto",
+        enhanced=False,
+        speaker_detection=False,
+        pipeline_stages=parse_stage_spec("enhance=2,infer=1:1"),
+    )
+    processor.run()
+
+    (executor,) = executors
+    assert executor.stages[ENHANCE].workers == 2
+    assert executor.stages[INFER].queue_depth == 1
+    a, missing, b = processor.files
+    assert (a.status, missing.status, b.status) == ("completed", "failed", "completed")
+    assert "number" in a.result["full_text"].lower()
+    assert "not found" in missing.error_message.lower()
+
+
+def test_batch_scheduler_orders_by_probed_duration_and_estimates_etas(tmp_path):
+    import time
+
+    from src.core.batch_scheduler import (
+        EARLIEST_DEADLINE,
+        LONGEST_FIRST,
+        SHORTEST_FIRST,
+        BatchScheduler,
+        RealtimeFactorStore,
+        probe_duration,
+    )
+
+    files = [
+        write_wav(tmp_path / "long.wav", 5),
+        write_wav(tmp_path / "short.wav", 1),
+        write_wav(tmp_path / "mid.wav", 3),
+    ]
+    # Not a readable header, so its length is estimated from the file size
+    files.append(tmp_path / "opaque.mp3")
+    files[-1].write_bytes(b"\0" * 32000)
+
+    assert probe_duration(files[0]).duration == pytest.approx(5.0)
+    assert probe_duration(files[0]).source == "header"
+    assert probe_duration(files[3]).source in ("ffprobe", "size")
+
+    store = RealtimeFactorStore(tmp_path / "rtf.json")
+    store.record("base", audio_seconds=100.0, processing_seconds=10.0)
+
+    shortest = BatchScheduler(SHORTEST_FIRST, "base", store=store).schedule(files)
+    assert [item.index for item in shortest] == [1, 3, 2, 0]
+    # 10x realtime on one worker: finish times accumulate
+    assert [round(item.finish_eta, 2) for item in shortest] == [0.1, 0.3, 0.6, 1.1]
+
+    scheduler = BatchScheduler(LONGEST_FIRST, "base", workers=2, store=store)
+    longest = scheduler.schedule(files)
+    assert [item.index for item in longest] == [0, 2, 3, 1]
+    assert scheduler.remaining_seconds(longest) == pytest.approx(0.6)
+
+    soon = time.time() + 60
+    edf = BatchScheduler(EARLIEST_DEADLINE, "base", store=store).schedule(
+        files, deadlines={0: soon, 2: soon + 60}
+    )
+    assert [item.index for item in edf] == [0, 2, 1, 3]
+    assert not any(item.misses_deadline for item in edf)
+
+    # Measured factors persist; cache hits do not count as measurements
+    scheduler.record_result(
+        {"duration": 100.0, "processing_time": 40.0, "metadata": {}}
+    )
+    scheduler.record_result(
+        {"duration": 100.0, "processing_time": 0.0, "metadata": {"cache_hit": True}}
+    )
+    assert RealtimeFactorStore(tmp_path / "rtf.json").get("base") == pytest.approx(4.0)
+
+    with pytest.raises(ValueError):
+        BatchScheduler("random")
+
+
+def test_deadline_rules_match_globs_and_pick_the_policy():
+    from datetime import datetime
+
+    from src.core.batch_scheduler import (
+        EARLIEST_DEADLINE,
+        SHORTEST_FIRST,
+        default_policy,
+        match_deadlines,
+        parse_deadline,
+        parse_deadline_rules,
+    )
+
+    assert parse_deadline("90m", now=1000.0) == 1000.0 + 5400
+    assert parse_deadline("2026-10-16T17:00") == datetime(2026, 10, 16, 17).timestamp()
+    with pytest.raises(ValueError):
+        parse_deadline("soon")
+    with pytest.raises(ValueError):
+        parse_deadline_rules(["2h"])
+
+    files = ["/in/calls/a.mp3", "/in/b.mp3", "/in/calls/urgent.wav"]
+    rules = parse_deadline_rules(
+        ["calls/*=2h", "urgent.wav=30m", "calls/*.mp3=1h"], now=0.0
+    )
+    assert match_deadlines(files, rules) == {0: 3600.0, 2: 1800.0}
+    assert default_policy(True) == EARLIEST_DEADLINE
+    assert default_policy(False) == SHORTEST_FIRST
+
+
+def test_batch_journal_survives_reopen_and_lists_remaining_work(tmp_path):
+    from src.core.batch_journal import BatchJournal
+
+    db_path = tmp_path / "journal.sqlite3"
+    journal = BatchJournal(db_path)
+    files = [tmp_path / f"{name}.wav" for name in ("a", "b", "c", "d")]
+    batch_id = journal.create_batch(files, {"model": "tiny", "language": "en"})
+
+    journal.mark_processing(batch_id, 0)
+    journal.mark_completed(batch_id, 0, {"full_text": "done", "duration": 1.0})
+    journal.mark_processing(batch_id, 1)
+    journal.mark_failed(batch_id, 1, "Invalid file: empty")
+    journal.mark_processing(batch_id, 2)
+    # Crash here: the connection is never closed cleanly
+    del journal
+
+    batch = BatchJournal(db_path).unfinished_batch()
+    assert batch.batch_id == batch_id
+    assert batch.settings == {"model": "tiny", "language": "en"}
+    assert [f.state for f in batch.files] == [
+        "completed",
+        "failed",
+        "processing",
+        "pending",
+    ]
+    assert batch.completed[0].result == {"full_text": "done", "duration": 1.0}
+    assert batch.files[1].error == "Invalid file: empty"
+    # The in-flight file counts as remaining and is run again
+    assert [f.index for f in batch.remaining] == [2, 3]
+    assert batch.files[2].attempts == 1
+
+    # A new batch supersedes the interrupted one
+    journal = BatchJournal(db_path)
+    new_id = journal.create_batch(files[:1], {})
+    assert journal.unfinished_batch().batch_id == new_id
+
+    # Once every file has run, there is nothing left to offer
+    journal.mark_completed(new_id, 0, {})
+    assert journal.unfinished_batch() is None
+    journal.finish_batch(new_id)
+    assert journal.unfinished_batch() is None
+    journal.close()
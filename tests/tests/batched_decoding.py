@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE
+
+from support import decode_as, fake_service, tone
+
+
+def test_timestamp_tokens_split_into_clamped_segments():
+    from src.core.batched_inference import split_timestamped_tokens
+
+    begin = 1000
+    # <|0.00|> a b <|1.00|><|1.00|> c <|2.50|> d (unterminated)
+    tokens = [begin, 1, 2, begin + 50, begin + 50, 3, begin + 125, 4]
+    segments = split_timestamped_tokens(tokens, begin, duration=2.0)
+
+    assert [s["tokens"] for s in segments] == [[1, 2], [3], [4]]
+    assert segments[0]["start"] == 0.0 and segments[0]["end"] == pytest.approx(1.0)
+    assert segments[1]["end"] == 2.0  # clamped to the clip duration
+    assert segments[2]["start"] == 2.0 and segments[2]["end"] == 2.0
+
+
+def test_batched_transcription_demultiplexes_results_per_file(monkeypatch, tmp_path):
+    from src.core.batched_inference import BatchedDecoder
+    from src.core.result_cache import ResultCache
+
+    durations = {"a.wav": 3.0, "b.wav": 5.0, "long.wav": 45.0}
+    files = []
+    for name in durations:
+        (tmp_path / name).write_bytes(name.encode() * 512)
+        files.append(tmp_path / name)
+    files.insert(1, tmp_path / "missing.wav")
+    decode_as(monkeypatch, lambda path: tone(durations[path.name]))
+
+    batches = []
+
+    def fake_decode_batch(self, clips, language):
+        batches.append(len(clips))
+        return [
+            {
+                "text": f" clip of {len(clip) // SAMPLE_RATE} seconds",
+                "segments": [
+                    {
+                        "start": 0.0,
+                        "end": len(clip) / SAMPLE_RATE,
+                        "text": f" clip of {len(clip) // SAMPLE_RATE} seconds",
+                    }
+                ],
+                "language": "en",
+                "duration": len(clip) / SAMPLE_RATE,
+            }
+            for clip in clips
+        ]
+
+    monkeypatch.setattr(BatchedDecoder, "_decode_batch", fake_decode_batch)
+
+    service = fake_service(
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        result_cache=ResultCache(tmp_path / "cache"),
+    )
+
+    outcomes = list(service.transcribe_files_batched(files, batch_size=8))
+
+    assert [path.name for path, _ in outcomes] == [f.name for f in files]
+    assert batches == [2]  # both short clips in one encoder pass
+    assert outcomes[0][1].full_text == "Clip of 3 seconds."
+    assert isinstance(outcomes[1][1], FileNotFoundError)
+    assert outcomes[2][1].full_text == "Clip of 5 seconds."
+    assert outcomes[2][1].metadata["batched_inference"] is True
+    # Files longer than one window take the regular path
+    assert "batched_inference" not in outcomes[3][1].metadata
+
+    again = list(service.transcribe_files_batched(files[:1]))
+    assert again[0][1].metadata["cache_hit"] is True
+    assert batches == [2]
+
+
+def test_batched_decoder_takes_per_file_profile_options():
+    from src.core.batched_inference import BatchedDecoder
+    from src.core.model_optimizer import ModelConfig
+
+    accuracy = ModelConfig.for_high_accuracy()
+    accuracy.initial_prompt = "Medical terminology."
+    decoder = BatchedDecoder.from_transcribe_options(
+        None, 4, accuracy.to_decode_options("cpu")
+    )
+    assert decoder.decode_options["beam_size"] == 10
+    assert decoder.decode_options["temperature"] == 0.0
+    assert "best_of" not in decoder.decode_options  # rejected when greedy
+    assert decoder.decode_options["prompt"] == "Medical terminology."
+    assert decoder.compression_ratio_threshold == 2.0
+    assert decoder.logprob_threshold == -0.5
+
+
+def test_batched_transcription_applies_profile_and_redecodes_failures(
+    monkeypatch, tmp_path
+):
+    from src.core.batched_inference import BatchedDecoder
+    from src.core.model_optimizer import ModelOptimizer
+    from src.core.result_cache import ResultCache
+
+    files = [tmp_path / "good.wav", tmp_path / "bad.wav"]
+    for path in files:
+        path.write_bytes(path.name.encode() * 512)
+    decode_as(monkeypatch, tone(4.0))
+
+    decoded_with = []
+
+    def fake_decode_batch(self, clips, language):
+        decoded_with.append(dict(self.decode_options))
+        return [
+            {
+                "text": " batched",
+                "segments": [{"start": 0.0, "end": 4.0, "text": " batched"}],
+                "language": "en",
+                "needs_fallback": i == 1,
+            }
+            for i in range(len(clips))
+        ]
+
+    monkeypatch.setattr(BatchedDecoder, "_decode_batch", fake_decode_batch)
+
+    service = fake_service(
+        enable_audio_enhancement=False,
+        enable_vad=True,
+        result_cache=ResultCache(tmp_path / "cache"),
+    )
+    service.model_optimizer = ModelOptimizer()
+    monkeypatch.setattr(
+        service.model_optimizer, "select_optimal_model_size", lambda *a: "base"
+    )
+
+    outcomes = dict(
+        service.transcribe_files_batched(files, accuracy_priority="accuracy")
+    )
+
+    assert decoded_with[0]["beam_size"] == 10
+    good, bad = outcomes[files[0]], outcomes[files[1]]
+    assert good.full_text == "Batched."
+    assert good.metadata["decoding_profile"] == "accuracy"
+    # The failed clip went through transcribe() with the temperature ladder
+    assert bad.metadata["batched_fallback"] is True
+    assert bad.full_text == "Window number 1."
+    assert "vad" in good.metadata
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from support import audio_files, decode_as, fake_service, speech_with_pauses
+
+
+@pytest.fixture
+def speech_files(monkeypatch, tmp_path):
+    # Every file decodes to 7s of speech around a pause
+    samples = speech_with_pauses([(3.0, True), (1.0, False), (3.0, True)])
+    decode_as(monkeypatch, samples)
+    return lambda *names: audio_files(tmp_path, *names)
+
+
+@pytest.fixture
+def rtf_store(monkeypatch, tmp_path):
+    # Keeps measured realtime factors out of the user's cache
+    from src.core import batch_scheduler
+
+    store = batch_scheduler.RealtimeFactorStore(tmp_path / "rtf.json")
+    monkeypatch.setattr(batch_scheduler, "_realtime_factor_store", store)
+    return store
+
+
+@pytest.fixture
+def stream_service(monkeypatch, tmp_path):
+    from src.core.result_cache import ResultCache
+
+    decode_as(
+        monkeypatch,
+        speech_with_pauses(
+            [(20.0, True), (1.0, False), (20.0, True), (1.0, False), (10.0, True)]
+        ),
+    )
+    (audio_file,) = audio_files(tmp_path, "long.wav", size=2048)
+    service = fake_service(
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        result_cache=ResultCache(tmp_path / "cache"),
+    )
+    return service, audio_file
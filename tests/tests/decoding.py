@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE, AudioBuffer
+
+from support import (
+    FakeModel,
+    WindowModel,
+    audio_files,
+    decode_as,
+    fake_service,
+    speech_with_pauses,
+    tone,
+)
+
+
+def test_decoding_profiles_map_to_whisper_options():
+    from src.core.model_optimizer import ModelConfig, ModelOptimizer
+
+    speed = ModelConfig.for_speed().to_decode_options("cpu")
+    assert speed["beam_size"] is None and speed["patience"] is None  # greedy
+    assert speed["best_of"] is None
+    assert speed["temperature"][0] == 0.0
+
+    accuracy = ModelConfig.for_high_accuracy().to_decode_options("cuda")
+    assert accuracy["beam_size"] == 10 and accuracy["patience"] == 2.0
+    # GPUs decode in fp16 unless a profile turns it off; CPUs never do
+    assert accuracy["fp16"] is True
+    assert speed["fp16"] is False
+    assert ModelConfig(fp16=False).to_decode_options("cuda")["fp16"] is False
+    for profile in (ModelConfig(), ModelConfig.for_noisy_audio()):
+        service_options = fake_service(enable_result_cache=False)._decode_options(
+            "en", profile, "cuda"
+        )
+        assert service_options["fp16"] is True
+
+    optimizer = ModelOptimizer()
+    optimizer.record_decode_throughput(ModelConfig.for_speed(), 60.0, 6.0)
+    optimizer.record_decode_throughput(ModelConfig.for_speed(), 60.0, 14.0)
+    stats = optimizer.get_profile_throughput("speed")["base/speed"]
+    assert stats["runs"] == 2
+    assert stats["realtime_factor"] == pytest.approx(6.0)
+
+
+class _DraftModel:
+    device = "cpu"
+
+    def transcribe(self, audio, **options):
+        return {
+            "language": "en",
+            "segments": [
+                {"start": 0.0, "end": 2.0, "text": " clear start", "avg_logprob": -0.1},
+                {"start": 2.0, "end": 4.0, "text": " mumble", "avg_logprob": -2.0},
+                {"start": 4.0, "end": 6.0, "text": " clear end", "avg_logprob": -0.2},
+            ],
+        }
+
+
+class _FullModel:
+    device = "cpu"
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append((len(audio) / SAMPLE_RATE, options))
+        seconds = len(audio) / SAMPLE_RATE
+        return {
+            "language": "en",
+            "segments": [
+                {"start": 0.0, "end": seconds, "text": " fixed", "avg_logprob": -0.3}
+            ],
+        }
+
+
+def test_two_pass_redecodes_only_low_confidence_spans(monkeypatch):
+    import src.core.transcription_service as service_module
+    from src.core.model_registry import ModelRegistry
+    from src.core.transcription_service import EnhancedTranscriptionService
+
+    registry = ModelRegistry(loader=lambda size, device, precision: _DraftModel())
+    monkeypatch.setattr(service_module, "get_model_registry", lambda: registry)
+
+    service = EnhancedTranscriptionService(
+        model_size="medium",
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+        draft_model_size="tiny",
+    )
+    full_model = _FullModel()
+    service._transcriber = full_model
+    service._loaded_model_size = "medium"
+
+    result = service._transcribe_with_config(tone(6.0), None, None)
+
+    assert len(full_model.calls) == 1
+    seconds, options = full_model.calls[0]
+    assert seconds == pytest.approx(3.0)  # 2-4s plus padding
+    assert options["language"] == "en"
+    assert options["initial_prompt"] == " clear start"
+    assert [s["text"] for s in result["segments"]] == [
+        " clear start",
+        " fixed",
+        " clear end",
+    ]
+    assert result["segments"][1]["start"] == pytest.approx(2.0)
+    assert result["segments"][0]["confidence"] == pytest.approx(0.905, abs=0.01)
+    assert result["two_pass"]["redecoded_spans"] == 1
+    assert registry.stats()["models"][0]["refcount"] == 0
+
+
+def test_word_alignment_is_lazy_range_limited_and_cached(monkeypatch, tmp_path):
+    import src.core.transcription_service as service_module
+    from src.core.transcription_service import EnhancedTranscriptionService
+    from src.models.transcription_result import (
+        TranscriptionResult,
+        TranscriptionSegment,
+    )
+
+    aligned_batches = []
+
+    def fake_align(model, samples, segments, language=None):
+        aligned_batches.append([s.text for s in segments])
+        return [
+            {"word": s.text, "start": s.start, "end": s.end, "confidence": 0.9}
+            for s in segments
+        ]
+
+    monkeypatch.setattr(service_module, "align_segments", fake_align)
+
+    service = fake_service(
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+        word_timestamps=False,
+    )
+    assert "word_timestamps" not in service._decode_options(None, None, "cpu")
+
+    result = TranscriptionResult(
+        segments=[
+            TranscriptionSegment(start=0.0, end=2.0, text="one"),
+            TranscriptionSegment(start=2.0, end=4.0, text="two"),
+            TranscriptionSegment(start=10.0, end=12.0, text="three"),
+        ],
+        language="en",
+        language_probability=0.9,
+        duration=12.0,
+        processing_time=1.0,
+        model_used="base",
+        file_path=tmp_path / "clip.wav",
+    )
+    buffer = AudioBuffer(samples=tone(12.0))
+
+    words = service.align_words(result, start=0.0, end=3.0, audio_buffer=buffer)
+    assert [w["word"] for w in words] == ["one", "two"]
+    assert aligned_batches == [["one", "two"]]
+
+    # Already aligned ranges are served from the result
+    service.align_words(result, start=1.0, end=4.0, audio_buffer=buffer)
+    assert len(aligned_batches) == 1
+
+    service.align_words(result, audio_buffer=buffer)
+    assert aligned_batches[-1] == ["three"]
+    assert [w["word"] for w in result.word_timestamps] == ["one", "two", "three"]
+
+
+def test_words_timed_while_decoding_skip_alignment(monkeypatch, tmp_path):
+    import src.core.transcription_service as service_module
+
+    class _WordModel(WindowModel):
+        def transcribe(self, audio, **options):
+            result = super().transcribe(audio, **options)
+            if options.get("word_timestamps"):
+                end = result["segments"][0]["end"]
+                result["segments"][0]["words"] = [
+                    {"word": " window", "start": 0.0, "end": 1.0, "probability": 0.9},
+                    {"word": " one", "start": 1.0, "end": end, "probability": 0.8},
+                ]
+            return result
+
+    aligned = []
+    monkeypatch.setattr(
+        service_module, "align_segments", lambda *args, **kw: aligned.append(args)
+    )
+    decode_as(monkeypatch, speech_with_pauses([(5.0, True)]))
+    (audio_file,) = audio_files(tmp_path, "clip.wav")
+    service = fake_service(
+        _WordModel(),
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+    )
+
+    result = service.transcribe_file(audio_file)
+    assert [w["word"] for w in result.word_timestamps] == [" window", " one"]
+    assert result.word_timestamps[1]["confidence"] == pytest.approx(0.8)
+    service.generate_subtitles(result, "srt")
+    assert aligned == []
+
+    # Without decode-time words, subtitles still align on demand
+    service.word_timestamps = False
+    result = service.transcribe_file(audio_file)
+    assert result.word_timestamps is None
+    service.generate_subtitles(result, "srt")
+    assert len(aligned) == 1
+
+
+class _LanguageModel(FakeModel):
+    device = "cpu"
+
+    def detect_language(self, mel):
+        self.calls.append(mel.shape)
+        return None, {"en": 0.1, "de": 0.85, "fr": 0.05}
+
+
+def test_language_is_predetected_once_per_file_with_tiny_model(monkeypatch, tmp_path):
+    from src.core.language_detection import (
+        LanguageCache,
+        LanguageDetector,
+        first_speech_window,
+    )
+    from src.core.model_registry import ModelRegistry
+
+    loads = []
+
+    def loader(model_size, device, precision):
+        loads.append(model_size)
+        return _LanguageModel((model_size, device, precision))
+
+    registry = ModelRegistry(memory_budget_gb=1.0, loader=loader)
+    cache_path = tmp_path / "languages.json"
+    detector = LanguageDetector(
+        device="cpu", registry=registry, cache=LanguageCache(cache_path)
+    )
+
+    # Leading silence is skipped so the window starts on speech
+    samples = speech_with_pauses([(10.0, False), (40.0, True)])
+    window = first_speech_window(samples)
+    assert len(window) == 30 * SAMPLE_RATE
+    assert np.abs(window[: SAMPLE_RATE // 2]).max() > 0.05
+
+    detected = detector.detect(samples, fingerprint="abc")
+    assert (detected.language, detected.cached) == ("de", False)
+    assert detected.probability == pytest.approx(0.85)
+    assert loads == ["tiny"]
+
+    # A fresh cache instance reads the stored result back without the model
+    detector.cache = LanguageCache(cache_path)
+    again = detector.detect(samples, fingerprint="abc")
+    assert (again.language, again.cached) == ("de", True)
+    with registry.borrow("tiny", device="cpu") as model:
+        assert len(model.calls) == 1
+
+    # The service hands the detected language to the main decode
+    decode_as(monkeypatch, samples)
+    (audio_file,) = audio_files(tmp_path, "german.wav")
+    options = dict(
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+    )
+    main_model = FakeModel("main")
+    service = fake_service(main_model, enable_language_predetection=True, **options)
+    service._language_detector = detector
+
+    result = service.transcribe_file(audio_file)
+    assert main_model.calls[0][1]["language"] == "de"
+    assert result.metadata["language_detection"]["language"] == "de"
+
+    # Off by default: the decoding model detects the language itself
+    main_model = FakeModel("main")
+    service = fake_service(main_model, **options)
+    service._language_detector = detector
+    result = service.transcribe_file(audio_file)
+    assert main_model.calls[0][1].get("language") is None
+    assert "language_detection" not in result.metadata
+
+
+def test_language_cache_drops_least_recently_used_entries(tmp_path):
+    import json
+
+    from src.core.language_detection import DetectedLanguage, LanguageCache
+
+    cache_path = tmp_path / "languages.json"
+    cache = LanguageCache(cache_path, max_entries=2)
+    cache.put("a", DetectedLanguage("en", 0.9))
+    cache.put("b", DetectedLanguage("de", 0.8))
+    assert cache.get("a").language == "en"  # now the most recently used
+    cache.put("c", DetectedLanguage("fr", 0.7))
+
+    assert list(json.loads(cache_path.read_text())) == ["a", "c"]
+    reopened = LanguageCache(cache_path, max_entries=2)
+    assert reopened.get("b") is None
+    assert reopened.get("c").language == "fr"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import pytest
+
+from support import service_factory, write_wav
+
+
+@pytest.fixture
+def cli(monkeypatch, speech_files, rtf_store):
+    from src import cli
+
+    monkeypatch.setattr(cli, "EnhancedTranscriptionService", service_factory())
+    return cli
+
+
+def _cli_events(capsys):
+    import json
+
+    captured = capsys.readouterr()
+    return [json.loads(line) for line in captured.out.splitlines()], captured.err
+
+
+def test_cli_writes_outputs_streams_progress_and_reports_failures(
+    cli, tmp_path, capsys
+):
+    import json
+
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    (inputs / "good.wav").write_bytes(b"\0" * 4096)
+    (inputs / "tiny.mp3").write_bytes(b"\0" * 10)
+    (inputs / "notes.txt").write_text("not audio")
+
+    exit_code = cli.main(
+        [str(inputs), "-o", str(tmp_path / "out"), "-f", "txt,json", "--no-enhance"]
+    )
+    events, err = _cli_events(capsys)
+
+    assert exit_code == cli.EXIT_FAILED_FILES
+    assert events[0] == {**events[0], "event": "start", "files": 2}
+    assert any(e["event"] == "progress" for e in events)
+    assert events[-1]["event"] == "done"
+    assert events[-1]["failed"] == [str((inputs / "tiny.mp3").resolve())]
+    assert "tiny.mp3" in err
+
+    assert "window number 1" in (tmp_path / "out" / "good_transcript.txt").read_text()
+    data = json.loads((tmp_path / "out" / "good_transcript.json").read_text())
+    assert data["segments"]
+
+
+def test_cli_rejects_bad_usage(cli, speech_files, tmp_path):
+    (audio,) = speech_files("good.wav")
+
+    assert cli.main([str(tmp_path / "missing" / "*.wav")]) == cli.EXIT_USAGE
+    assert cli.main([str(audio), "-f", "docx"]) == cli.EXIT_USAGE
+    assert cli.main([str(audio), "--pipeline", "infer=0"]) == cli.EXIT_USAGE
+
+
+def test_cli_pipeline_exports_and_traces_each_stage(
+    monkeypatch, cli, speech_files, tmp_path, capsys
+):
+    import json
+
+    from src.core import tracing
+
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer())
+    (audio,) = speech_files("good.wav")
+    trace_path = tmp_path / "trace.json"
+
+    exit_code = cli.main(
+        [str(audio), "-o", str(tmp_path / "piped"), "--pipeline"]
+        + ["--trace", str(trace_path)]
+    )
+    events, _ = _cli_events(capsys)
+
+    assert exit_code == cli.EXIT_OK
+    assert [e["event"] for e in events if e["event"] != "progress"] == [
+        "start",
+        "file_started",
+        "file_completed",
+        "done",
+    ]
+    assert (tmp_path / "piped" / "good_transcript.txt").exists()
+    completed = next(e for e in events if e["event"] == "file_completed")
+    assert {"decode", "infer", "finalize"} <= set(completed["timings"])
+    span_names = {e["name"] for e in json.loads(trace_path.read_text())["traceEvents"]}
+    assert {"infer", "export"} <= span_names
+
+
+def test_cli_deadlines_reorder_the_batch(cli, tmp_path, capsys):
+    from pathlib import Path
+
+    from src.core.batch_scheduler import EARLIEST_DEADLINE, SHORTEST_FIRST
+
+    long_file = write_wav(tmp_path / "long.wav", 20)
+    short_file = write_wav(tmp_path / "short.wav", 2)
+    argv = [str(long_file), str(short_file), "-o", str(tmp_path / "out")]
+
+    def started(extra):
+        assert cli.main(argv + extra) == cli.EXIT_OK
+        events, _ = _cli_events(capsys)
+        names = [
+            Path(e["file"]).name for e in events if e["event"] == "file_started"
+        ]
+        return events[0]["schedule"], names
+
+    assert started([]) == (SHORTEST_FIRST, ["short.wav", "long.wav"])
+    assert started(["--deadline", "long.wav=1h"]) == (
+        EARLIEST_DEADLINE,
+        ["long.wav", "short.wav"],
+    )
+    assert started(["--deadline", "long.wav=1h", "--schedule", "fifo"])[0] == "fifo"
+    assert cli.main(argv + ["--deadline", "long.wav=whenever"]) == cli.EXIT_USAGE
+
+
+def test_cli_cache_hits_do_not_skew_the_realtime_factor(
+    monkeypatch, cli, speech_files, rtf_store, tmp_path, capsys
+):
+    from src.core import batch_scheduler
+    from src.core.batch_scheduler import BatchScheduler
+    from src.core.result_cache import ResultCache
+
+    # Fake decodes are near-instant; let them count so only cache_hit decides
+    min_seconds = batch_scheduler.MIN_MEASURED_PROCESSING_SECONDS
+    monkeypatch.setattr(batch_scheduler, "MIN_MEASURED_PROCESSING_SECONDS", 0.0)
+    monkeypatch.setattr(
+        cli,
+        "EnhancedTranscriptionService",
+        service_factory(
+            enable_result_cache=True, result_cache=ResultCache(tmp_path / "cache")
+        ),
+    )
+    (audio,) = speech_files("talk.wav")
+    argv = [str(audio), "-o", str(tmp_path / "out"), "--no-enhance"]
+
+    assert cli.main(argv) == cli.EXIT_OK
+    first = rtf_store.get("base")
+    assert first is not None
+    capsys.readouterr()
+
+    assert cli.main(argv) == cli.EXIT_OK
+    events, _ = _cli_events(capsys)
+    outcome = next(e for e in events if e["event"] == "file_completed")
+    assert outcome["cache_hit"] is True
+    assert rtf_store.get("base") == first
+
+    # The CLI's outcome shape, and near-instant results, are not measurements
+    monkeypatch.setattr(
+        batch_scheduler, "MIN_MEASURED_PROCESSING_SECONDS", min_seconds
+    )
+    scheduler = BatchScheduler(model_size="small", store=rtf_store)
+    scheduler.record_result({"duration": 600, "processing_time": 30, "cache_hit": True})
+    scheduler.record_result({"duration": 600, "processing_time": 0.01})
+    assert rtf_store.get("small") is None
+    scheduler.record_result({"duration": 600, "processing_time": 30.0})
+    assert rtf_store.get("small") == pytest.approx(20.0)
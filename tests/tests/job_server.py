@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from support import WindowModel, audio_files, service_factory
+
+
+class _LocalServer:
+    # A running server on an ephemeral port plus a tiny HTTP client
+    def __init__(self, server, release):
+        self.server = server
+        self.release = release
+
+    def call(
+        self, method, path, body=None, content_type="application/json", headers=None
+    ):
+        import json
+        import urllib.error
+        import urllib.request
+
+        data = json.dumps(body).encode() if isinstance(body, dict) else body
+        sent = {"Authorization": f"Bearer {self.server.token}"}
+        if data is not None:
+            sent["Content-Type"] = content_type
+        request = urllib.request.Request(
+            self.server.url + path,
+            data=data,
+            method=method,
+            headers={**sent, **(headers or {})},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def json(self, method, path, body=None):
+        import json
+
+        return json.loads(self.call(method, path, body)[1])
+
+    def wait_for(self, job_id, states):
+        import time
+
+        for _ in range(200):
+            job = self.json("GET", f"/jobs/{job_id}")
+            if job["status"] in states:
+                return job
+            time.sleep(0.05)
+        raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+
+@pytest.fixture
+def local_server(speech_files, tmp_path):
+    import threading
+
+    from src.core.job_queue import TranscriptionJobQueue
+    from src.server import TranscriptionServer
+
+    # Inference waits for the test to release it, so jobs can be caught running
+    release = threading.Event()
+
+    class _GatedModel(WindowModel):
+        def transcribe(self, audio, **options):
+            release.wait(5)
+            return super().transcribe(audio, **options)
+
+    job_queue = TranscriptionJobQueue(
+        concurrency=1,
+        max_queued=1,
+        service_factory=service_factory(_GatedModel),
+        enable_model_optimization=False,
+        enable_audio_enhancement=False,
+    ).start()
+    server = TranscriptionServer(job_queue, port=0, upload_dir=tmp_path / "uploads")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield _LocalServer(server, release)
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_local_server_refuses_non_loopback_addresses():
+    from src.core.job_queue import TranscriptionJobQueue
+    from src.server import TranscriptionServer
+
+    with pytest.raises(ValueError):
+        TranscriptionServer(TranscriptionJobQueue(), host="0.0.0.0", port=0)
+
+
+def test_local_server_bounds_the_queue_and_cancels_uploads(
+    local_server, speech_files, tmp_path
+):
+    import json
+
+    from src.core.job_queue import JobState
+
+    (audio,) = speech_files("talk.wav")
+    status, body = local_server.call("POST", "/jobs", {"path": str(audio)})
+    assert status == 202
+    first = json.loads(body)["id"]
+    local_server.wait_for(first, {JobState.RUNNING})
+
+    # One running, one waiting: the next submission is refused
+    status, body = local_server.call(
+        "POST", "/jobs?filename=upload.wav", b"\0" * 4096, "audio/wav"
+    )
+    assert status == 202
+    queued = json.loads(body)["id"]
+    assert local_server.call("POST", "/jobs", {"path": str(audio)})[0] == 429
+    assert local_server.call("GET", f"/jobs/{first}/result")[0] == 409
+
+    cancelled = local_server.json("DELETE", f"/jobs/{queued}")
+    assert cancelled["status"] == JobState.CANCELLED
+    assert not list((tmp_path / "uploads").iterdir())
+
+    # The cancelled job frees its place in the queue straight away
+    assert local_server.json("GET", "/health")["queue_depth"] == 0
+    assert local_server.call("POST", "/jobs", {"path": str(audio)})[0] == 202
+    assert local_server.call("POST", "/jobs", {"path": str(audio)})[0] == 429
+
+
+def test_local_server_serves_finished_results(local_server, speech_files):
+    from src.core.job_queue import JobState
+
+    (audio,) = speech_files("talk.wav")
+    local_server.release.set()
+    job_id = local_server.json("POST", "/jobs", {"path": str(audio)})["id"]
+    job = local_server.wait_for(job_id, {JobState.COMPLETED})
+    assert job["progress"] == 100
+
+    status, body = local_server.call("GET", f"/jobs/{job_id}/result?format=txt")
+    assert status == 200 and b"window number 1" in body.lower()
+    assert local_server.json("GET", f"/jobs/{job_id}/result")["segments"]
+    assert local_server.json("GET", "/health")["jobs"] == {JobState.COMPLETED: 1}
+    assert local_server.call("GET", "/jobs/ffff")[0] == 404
+
+
+def test_local_server_aligns_subtitles_for_uploaded_jobs(
+    local_server, speech_files, monkeypatch, tmp_path
+):
+    import json
+
+    import src.core.transcription_service as service_module
+    from src.core.job_queue import JobState
+
+    aligned = []
+
+    def fake_align(model, samples, segments, language=None):
+        aligned.extend(s.text for s in segments)
+        return [
+            {"word": s.text, "start": s.start, "end": s.end, "confidence": 0.9}
+            for s in segments
+        ]
+
+    monkeypatch.setattr(service_module, "align_segments", fake_align)
+    speech_files()
+    local_server.release.set()
+    status, body = local_server.call(
+        "POST", "/jobs?filename=upload.wav", b"\0" * 4096, "audio/wav"
+    )
+    job_id = json.loads(body)["id"]
+    local_server.wait_for(job_id, {JobState.COMPLETED})
+
+    # The upload outlives the run so subtitles can still align against it
+    (upload,) = (tmp_path / "uploads").iterdir()
+    status, body = local_server.call("GET", f"/jobs/{job_id}/result?format=srt")
+    assert status == 200 and aligned
+    assert local_server.server.job_queue.get(job_id).result.word_timestamps
+
+    # ...until the job is evicted
+    job_queue = local_server.server.job_queue
+    job_queue.max_finished = 0
+    (audio,) = audio_files(tmp_path, "next.wav")
+    job_queue.submit(audio)
+    assert not upload.exists()
+
+
+def test_local_server_rejects_foreign_hosts_origins_and_tokens(local_server):
+    port = local_server.server.server_address[1]
+
+    assert local_server.call("GET", "/jobs")[0] == 200
+    assert local_server.call("GET", "/jobs", headers={"Authorization": ""})[0] == 401
+    wrong = {"Authorization": "Bearer not-the-token"}
+    assert local_server.call("GET", "/jobs", headers=wrong)[0] == 401
+    # Health needs no token but still only answers to loopback names
+    assert local_server.call("GET", "/health", headers={"Authorization": ""})[0] == 200
+
+    rebound = {"Host": f"attacker.example:{port}"}
+    assert local_server.call("GET", "/health", headers=rebound)[0] == 403
+    other_port = {"Host": f"localhost:{port + 1}"}
+    assert local_server.call("GET", "/jobs", headers=other_port)[0] == 403
+    named = {"Host": f"localhost:{port}"}
+    assert local_server.call("GET", "/jobs", headers=named)[0] == 200
+
+    cross_site = {"Origin": "https://attacker.example"}
+    status, _ = local_server.call("POST", "/jobs", {"path": "x"}, headers=cross_site)
+    assert status == 403
+    same_site = {"Origin": f"http://127.0.0.1:{port}"}
+    assert local_server.call("GET", "/jobs", headers=same_site)[0] == 200
+
+
+def test_local_server_keeps_keep_alive_connections_in_sync(tmp_path):
+    import http.client
+    import threading
+
+    from src.core.job_queue import TranscriptionJobQueue
+    from src.server import TranscriptionServer
+
+    server = TranscriptionServer(
+        TranscriptionJobQueue(), port=0, upload_dir=tmp_path / "uploads"
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+
+    auth = {"Authorization": f"Bearer {server.token}"}
+
+    def call(method, path, body=None, headers=None):
+        conn.request(method, path, body=body, headers={**auth, **(headers or {})})
+        response = conn.getresponse()
+        response.read()
+        return response
+
+    try:
+        # An unread body must not be parsed as the next request
+        response = call("POST", "/unknown", b"GET /health HTTP/1.1\r\n\r\n")
+        assert response.status == 404
+        assert response.getheader("Connection") == "close"
+        assert call("GET", "/health").status == 200
+
+        assert call("POST", "/jobs", headers={"Content-Length": "lots"}).status == 400
+
+        # The server answers from the headers alone; sending the whole body
+        # would race its close and could fail with a broken pipe
+        conn.putrequest("POST", "/jobs")
+        conn.putheader("Authorization", auth["Authorization"])
+        conn.putheader("Content-Type", "application/json")
+        conn.putheader("Content-Length", str(2 * 1024 * 1024))
+        conn.endheaders(b"{")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 413
+        assert response.getheader("Connection") == "close"
+        conn.close()
+        assert call("GET", "/health").status == 200
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_job_queue_survives_a_restart(tmp_path):
+    import time
+
+    from src.core.job_queue import JobState, TranscriptionJobQueue
+    from src.core.job_store import JobStore
+    from src.models.transcription_result import (
+        TranscriptionResult,
+        TranscriptionSegment,
+    )
+
+    services = []
+
+    class _Service:
+        progress_callback = None
+
+        def __init__(self, **options):
+            services.append(self)
+
+        def transcribe_file(self, file_path, **options):
+            return TranscriptionResult(
+                segments=[TranscriptionSegment(0.0, 1.0, f"{file_path.name} done")],
+                language="en",
+                language_probability=0.9,
+                duration=1.0,
+                processing_time=0.1,
+                model_used="base",
+                metadata={"level": np.float32(0.5)},
+            )
+
+        def cleanup(self):
+            pass
+
+    def wait_for(job):
+        for _ in range(200):
+            if job.is_finished:
+                return job
+            time.sleep(0.01)
+        raise AssertionError(f"job {job.id} stuck in {job.status}")
+
+    db_path = tmp_path / "jobs.sqlite3"
+    upload = tmp_path / "upload.wav"
+    upload.write_bytes(b"\0" * 64)
+
+    job_queue = TranscriptionJobQueue(
+        service_factory=_Service, store=JobStore(db_path)
+    ).start()
+    finished = wait_for(job_queue.submit(tmp_path / "done.wav"))
+    job_queue.shutdown()
+    assert finished.status == JobState.COMPLETED
+
+    # Stopped before a worker picked it up: stays queued with its upload
+    job_queue = TranscriptionJobQueue(service_factory=_Service, store=JobStore(db_path))
+    pending = job_queue.submit(upload, owns_file=True, language="de")
+    job_queue.shutdown()
+    assert upload.exists()
+
+    services.clear()
+    job_queue = TranscriptionJobQueue(service_factory=_Service, store=JobStore(db_path))
+    restored = job_queue.get(finished.id)
+    assert restored.status == JobState.COMPLETED
+    assert restored.result.segments[0].text == "done.wav done"
+    assert restored.result.metadata["level"] == 0.5
+    assert job_queue.get(pending.id).status == JobState.QUEUED
+
+    requeued = wait_for(job_queue.start().get(pending.id))
+    job_queue.shutdown()
+    assert requeued.status == JobState.COMPLETED
+    assert requeued.options == {"language": "de"}
+    # Kept for subtitle alignment until the finished job is evicted
+    assert upload.exists()
+    job_queue.max_finished = 0
+    job_queue._evict_finished()
+    assert not upload.exists()
+
+    # Rendering results reuses one service rather than building one per request
+    services.clear()
+    with job_queue.result_service() as first:
+        pass
+    with job_queue.result_service() as second:
+        pass
+    assert first is second and len(services) == 1
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE
+
+from support import (
+    WindowModel,
+    audio_files,
+    decode_as,
+    fake_service,
+    speech_with_pauses,
+)
+
+
+def test_vad_finds_speech_regions():
+    from src.core.voice_activity import detect_speech_regions
+
+    samples = speech_with_pauses([(1.0, False), (2.0, True), (1.0, False)])
+    regions = detect_speech_regions(samples)
+
+    assert len(regions) == 1
+    start, end = regions[0]
+    assert start == pytest.approx(1.0, abs=0.15)
+    assert end == pytest.approx(3.0, abs=0.15)
+
+
+def test_plan_chunks_splits_at_silence():
+    from src.core.chunked_transcription import plan_chunks
+
+    samples = speech_with_pauses(
+        [(9.0, True), (1.0, False), (9.0, True), (1.0, False), (9.0, True)]
+    )
+    chunks = plan_chunks(samples, chunk_seconds=10.0)
+
+    assert len(chunks) == 3
+    assert chunks[1].start == pytest.approx(9.5, abs=0.2)
+    # Silence splits need no overlap
+    assert chunks[1].audio_start == chunks[1].start
+
+
+def test_stitch_offsets_and_deduplicates_overlap():
+    from src.core.chunked_transcription import AudioChunk, stitch_chunk_results
+
+    chunks = [
+        AudioChunk(index=0, start=0.0, end=10.0, audio_start=0.0, audio_end=12.0),
+        AudioChunk(index=1, start=10.0, end=20.0, audio_start=8.0, audio_end=20.0),
+    ]
+    results = {
+        0: {
+            "language": "en",
+            "segments": [
+                {"start": 0.0, "end": 4.0, "text": " First."},
+                {"start": 9.0, "end": 10.8, "text": " Edge words."},
+            ],
+        },
+        1: {
+            "language": "en",
+            "segments": [
+                {"start": 1.0, "end": 2.8, "text": " Edge words."},
+                {
+                    "start": 4.0,
+                    "end": 6.0,
+                    "text": " Second.",
+                    "words": [{"word": " Second.", "start": 4.0, "end": 6.0}],
+                },
+            ],
+        },
+    }
+
+    stitched = stitch_chunk_results(chunks, results)
+
+    assert [s["text"] for s in stitched["segments"]] == [
+        " First.",
+        " Edge words.",
+        " Second.",
+    ]
+    assert stitched["segments"][2]["start"] == pytest.approx(12.0)
+    assert stitched["segments"][2]["words"][0]["start"] == pytest.approx(12.0)
+    assert stitched["language"] == "en"
+
+
+def test_transcribe_stream_yields_processed_segments_per_window(stream_service):
+    service, audio_file = stream_service
+
+    segments = list(service.transcribe_stream(audio_file))
+
+    assert len(segments) == 3
+    assert segments[0].text == "Window number 1."
+    assert segments[1].start == pytest.approx(20.5, abs=0.2)
+    assert segments[-1].end == pytest.approx(52.0, abs=0.1)
+    # Later windows are prompted with the text decoded so far
+    assert service._transcriber.prompts[0] is None
+    assert "Window number 1." in service._transcriber.prompts[1]
+
+
+def test_vad_compaction_maps_times_back_to_original_timeline():
+    from src.core.voice_activity import compact_speech
+
+    samples = speech_with_pauses(
+        [(5.0, False), (4.0, True), (10.0, False), (3.0, True)]
+    )
+    compacted, timeline = compact_speech(samples, gap_seconds=0.4)
+
+    assert len(timeline.regions) == 2
+    assert timeline.skipped_fraction == pytest.approx(15 / 22, abs=0.05)
+    assert len(compacted) / SAMPLE_RATE == pytest.approx(7.4, abs=0.5)
+
+    first_start, first_end = timeline.regions[0]
+    second_start, _ = timeline.regions[1]
+    compact_second = (first_end - first_start) + 0.4
+    assert timeline.to_original(0.0) == pytest.approx(first_start)
+    assert timeline.to_original(compact_second + 1.0) == pytest.approx(
+        second_start + 1.0
+    )
+
+    restored = timeline.restore_segments(
+        [{"start": compact_second, "end": compact_second + 2.0, "text": " hi"}]
+    )
+    assert restored[0]["start"] == pytest.approx(second_start)
+    assert restored[0]["end"] == pytest.approx(second_start + 2.0)
+
+
+def test_transcribe_file_skips_silence_and_reports_fraction(monkeypatch, tmp_path):
+    decode_as(
+        monkeypatch, speech_with_pauses([(20.0, False), (5.0, True), (20.0, False)])
+    )
+    (audio_file,) = audio_files(tmp_path, "meeting.wav")
+    options = dict(
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+    )
+    # Off unless asked for: the whole file goes to the model
+    assert "vad" not in fake_service(**options).transcribe_file(audio_file).metadata
+
+    result = fake_service(enable_vad=True, **options).transcribe_file(audio_file)
+
+    assert result.metadata["vad"]["skipped_fraction"] == pytest.approx(
+        40 / 45, abs=0.05
+    )
+    # The model saw ~5s of speech, but the segment lands at 20s in the file
+    assert result.segments[0].start == pytest.approx(20.0, abs=0.2)
+    assert result.segments[0].end == pytest.approx(25.0, abs=0.2)
+    assert result.duration == pytest.approx(45.0)
+
+
+class _CrashingWindowModel(WindowModel):
+    def __init__(self, crash_on: int):
+        super().__init__()
+        self.crash_on = crash_on
+
+    def transcribe(self, audio, **options):
+        if len(self.prompts) + 1 == self.crash_on:
+            raise RuntimeError("simulated crash")
+        return super().transcribe(audio, **options)
+
+
+def test_transcribe_file_resumes_from_checkpoint(monkeypatch, tmp_path):
+    import src.core.transcription_service as service_module
+
+    monkeypatch.setattr(service_module, "CHECKPOINT_MIN_SECONDS", 30.0)
+    monkeypatch.setattr(service_module, "CHECKPOINT_WINDOW_SECONDS", 15.0)
+
+    decode_as(monkeypatch, speech_with_pauses([(15.0, True), (1.0, False)] * 4))
+    (audio_file,) = audio_files(tmp_path, "long.wav")
+
+    def make_service(model, enable_checkpoints=True):
+        return fake_service(
+            model,
+            enable_audio_enhancement=False,
+            enable_model_optimization=False,
+            enable_result_cache=False,
+            enable_checkpoints=enable_checkpoints,
+            checkpoint_dir=tmp_path / "checkpoints",
+        )
+
+    # Off by default: the file is decoded in one pass and nothing is saved
+    model = WindowModel()
+    make_service(model, enable_checkpoints=False).transcribe_file(audio_file)
+    assert len(model.prompts) == 1
+    assert not (tmp_path / "checkpoints").exists()
+
+    with pytest.raises(RuntimeError):
+        make_service(_CrashingWindowModel(crash_on=3)).transcribe_file(audio_file)
+    assert len(list((tmp_path / "checkpoints").glob("*.json"))) == 1
+
+    model = WindowModel()
+    result = make_service(model).transcribe_file(audio_file)
+
+    # Two windows came from the checkpoint, only the rest were decoded
+    assert len(model.prompts) == 2
+    assert len(result.segments) == 4
+    assert result.segments[2].start == pytest.approx(32.0, abs=0.6)
+    assert list((tmp_path / "checkpoints").glob("*.json")) == []
+
+
+def test_stream_windower_cuts_pipe_at_silence_with_bounded_buffer():
+    import io
+
+    from src.core.audio_stream import StreamWindower, iter_pcm_blocks
+
+    samples = speech_with_pauses(
+        [(55.0, True), (1.0, False), (70.0, True), (1.0, False), (30.0, True)]
+    )
+    pcm = (samples * 32767).astype(np.int16).tobytes()
+
+    windower = StreamWindower(window_seconds=60.0, search_seconds=10.0)
+    windows, peak = [], 0
+    for block in iter_pcm_blocks(io.BytesIO(pcm), block_seconds=10.0):
+        windows.extend(windower.push(block))
+        peak = max(peak, len(windower._pending))
+    windows.extend(windower.finish())
+
+    chunks = [w.chunk for w in windows]
+    assert chunks[0].end == pytest.approx(55.5, abs=0.2)
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+    assert chunks[-1].end == pytest.approx(len(samples) / SAMPLE_RATE)
+    assert [w.final for w in windows] == [False] * (len(windows) - 1) + [True]
+    for window in windows:
+        expected = (window.chunk.audio_end - window.chunk.audio_start) * SAMPLE_RATE
+        assert len(window.samples) == pytest.approx(expected, abs=1)
+
+    # Never more than 1.5 windows plus one block held at once
+    assert peak <= 100 * SAMPLE_RATE
+
+
+def test_bounded_memory_transcription_streams_windows(monkeypatch, tmp_path):
+    from src.core import transcription_service as service_module
+    from src.core.audio_enhancer import AudioEnhancer
+
+    blocks = [speech_with_pauses([(29.0, True), (1.0, False)]) for _ in range(10)]
+    enhanced = list(AudioEnhancer().enhance_stream(iter(blocks[:2])))
+    assert [len(b) for b in enhanced] == [len(b) for b in blocks[:2]]
+    assert all(b.dtype == np.float32 for b in enhanced)
+
+    def fake_decoder(path, block_seconds=30.0):
+        yield from blocks
+
+    monkeypatch.setattr(service_module, "decode_pcm_blocks", fake_decoder)
+    decode_as(monkeypatch, lambda path: pytest.fail("whole file was decoded"))
+
+    (audio_file,) = audio_files(tmp_path, "long.wav")
+    model = WindowModel()
+    service = fake_service(
+        model,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+        enable_language_predetection=False,
+        bounded_memory=True,
+    )
+
+    result = service.transcribe_file(audio_file, language="en")
+    assert result.duration == pytest.approx(300.0)
+    assert result.metadata["bounded_memory"]["windows"] == len(model.prompts) > 1
+    assert result.segments[-1].end == pytest.approx(300.0, abs=1.0)
+    # Later windows are prompted with the tail of the previous one
+    assert "window number 1" in model.prompts[1]
+
+
+def test_cancel_event_stops_a_file_between_windows(monkeypatch, tmp_path):
+    import threading
+
+    import src.core.transcription_service as service_module
+    from src.core.transcription_service import TranscriptionCancelled
+
+    monkeypatch.setattr(service_module, "CHECKPOINT_MIN_SECONDS", 30.0)
+    monkeypatch.setattr(service_module, "CHECKPOINT_WINDOW_SECONDS", 15.0)
+    decode_as(monkeypatch, speech_with_pauses([(15.0, True), (1.0, False)] * 4))
+    (audio_file,) = audio_files(tmp_path, "long.wav")
+
+    cancel = threading.Event()
+
+    class _CancellingModel(WindowModel):
+        def transcribe(self, audio, **options):
+            cancel.set()  # as if the user cancelled during the first window
+            return super().transcribe(audio, **options)
+
+    model = _CancellingModel()
+    reports = []
+    service = fake_service(
+        model,
+        enable_audio_enhancement=False,
+        enable_model_optimization=False,
+        enable_result_cache=False,
+        enable_checkpoints=True,
+        checkpoint_dir=tmp_path / "checkpoints",
+        cancel_event=cancel,
+        progress_callback=lambda message, progress: reports.append(message),
+    )
+
+    with pytest.raises(TranscriptionCancelled):
+        service.transcribe_file(audio_file)
+    assert len(model.prompts) == 1
+    # A cancellation is not reported as an error
+    assert not [m for m in reports if m.startswith("Error")]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE
+
+from support import FakeModel
+
+
+def _registry(budget_gb: float = 1.0):
+    from src.core.model_registry import ModelRegistry
+
+    loads = []
+
+    def loader(model_size, device, precision):
+        loads.append(model_size)
+        return FakeModel((model_size, device, precision))
+
+    return ModelRegistry(memory_budget_gb=budget_gb, loader=loader), loads
+
+
+def test_model_registry_reuses_resident_models():
+    registry, loads = _registry()
+
+    with registry.borrow("tiny", device="cpu") as first:
+        pass
+    with registry.borrow("tiny", device="cpu") as second:
+        pass
+
+    assert first is second
+    assert loads == ["tiny"]
+    assert registry.stats()["hits"] == 1
+
+
+def test_model_registry_evicts_least_recently_used_idle_model():
+    # Fake models fall back to the size table: tiny 0.15GB, base 0.3GB, small 1GB
+    registry, loads = _registry(budget_gb=0.5)
+
+    tiny = registry.acquire("tiny", device="cpu")
+    registry.release(tiny)
+    base = registry.acquire("base", device="cpu")
+    registry.release(base)
+    assert registry.is_resident("tiny", device="cpu")
+
+    held = registry.acquire("small", device="cpu")
+    assert not registry.is_resident("tiny", device="cpu")
+    assert not registry.is_resident("base", device="cpu")
+    assert registry.is_resident("small", device="cpu")  # in use, never evicted
+    registry.release(held)
+
+
+def test_model_registry_rejects_unknown_precision():
+    registry, _ = _registry()
+    with pytest.raises(ValueError):
+        registry.acquire("tiny", device="cpu", precision="int4")
+
+
+def test_bf16_shares_fp32_weights_in_registry():
+    registry, loads = _registry()
+    fp32 = registry.acquire("tiny", device="cpu", precision="fp32")
+    bf16 = registry.acquire("tiny", device="cpu", precision="bf16")
+    assert bf16 is fp32
+    assert registry.make_key("tiny", "cpu", "int8")[2] == "int8"
+
+
+def test_model_registry_budget_follows_free_memory(monkeypatch):
+    import psutil
+
+    from src.core import model_registry
+
+    memory = psutil.virtual_memory()
+    monkeypatch.setattr(
+        psutil,
+        "virtual_memory",
+        lambda: memory._replace(available=int(10 * 1024**3)),
+    )
+    monkeypatch.setattr(model_registry, "_registry", None)
+
+    registry = model_registry.get_model_registry()
+    assert registry.memory_budget_bytes == 8 * 1024**3  # less the 2GB reserve
+
+    registry.set_memory_budget(1.0)
+    assert registry.stats()["memory_budget_bytes"] == 1024**3
+
+
+def _tiny_whisper_checkpoint(path):
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+
+    dims = ModelDimensions(
+        n_mels=80,
+        n_audio_ctx=1500,
+        n_audio_state=64,
+        n_audio_head=2,
+        n_audio_layer=1,
+        n_vocab=51865,
+        n_text_ctx=448,
+        n_text_state=64,
+        n_text_head=2,
+        n_text_layer=1,
+    )
+    model = Whisper(dims)
+    # Whisper allocates this with torch.empty; leftover garbage in it can turn
+    # into NaN activations, which dynamic quantization rejects
+    model.decoder.positional_embedding.data.normal_(std=0.01)
+    torch.save({"dims": dims.__dict__, "model_state_dict": model.state_dict()}, path)
+    return str(path)
+
+
+def test_int8_model_is_quantized_once_and_cached(monkeypatch, tmp_path):
+    import torch
+    import whisper
+
+    import src.core.model_registry as registry_module
+
+    monkeypatch.setattr(registry_module, "QUANTIZED_CACHE_DIR", tmp_path / "int8")
+    checkpoint = _tiny_whisper_checkpoint(tmp_path / "mini.pt")
+
+    fp32_loads = []
+    real_load_model = whisper.load_model
+    monkeypatch.setattr(
+        whisper,
+        "load_model",
+        lambda *args, **kwargs: fp32_loads.append(args)
+        or real_load_model(*args, **kwargs),
+    )
+
+    first = registry_module._load_whisper_model(checkpoint, "cpu", "int8")
+    second = registry_module._load_whisper_model(checkpoint, "cpu", "int8")
+
+    assert len(fp32_loads) == 1  # the second load comes from the disk cache
+    assert isinstance(
+        second.decoder.blocks[0].mlp[0], torch.ao.nn.quantized.dynamic.Linear
+    )
+    assert registry_module.estimate_model_bytes(first) < (
+        registry_module.estimate_model_bytes(real_load_model(checkpoint))
+    )
+
+    mel = torch.zeros(1, 80, 3000)
+    tokens = torch.tensor([[50258, 50259]])
+    assert second(mel, tokens).shape == (1, 2, 51865)
+
+
+def test_model_warmup_hands_warm_model_to_first_job():
+    from src.core.model_warmup import ModelWarmup
+
+    registry, loads = _registry()
+
+    warmup = ModelWarmup("tiny", device="cpu", registry=registry).start()
+    assert warmup.wait(timeout=5)
+
+    job_model = registry.acquire("tiny", device="cpu")
+    assert [n for n, _ in job_model.calls] == [SAMPLE_RATE]
+    assert warmup.hand_off()
+    assert loads == ["tiny"]
+    assert registry.stats()["models"][0]["refcount"] == 1
+    registry.release(job_model)
+
+
+def test_model_warmup_waits_for_model_lock():
+    from src.core.model_registry import model_lock
+    from src.core.model_warmup import ModelWarmup
+
+    registry, _ = _registry()
+    model = registry.acquire("tiny", device="cpu")
+
+    with model_lock(model):
+        # A decode already running on the shared model holds its lock
+        warmup = ModelWarmup("tiny", device="cpu", registry=registry).start()
+        assert not warmup.wait(timeout=0.3)
+        assert model.calls == []
+
+    assert warmup.wait(timeout=5)
+    assert [n for n, _ in model.calls] == [SAMPLE_RATE]
+    warmup.cancel()
+    registry.release(model)
+
+
+def test_model_warmup_cancel_releases_model():
+    from src.core.model_warmup import ModelWarmup
+
+    registry, _ = _registry()
+    warmup = ModelWarmup(
+        "tiny", device="cpu", registry=registry, run_dummy_inference=False
+    ).start()
+    warmup.wait(timeout=5)
+    warmup.cancel()
+
+    assert warmup.is_cancelled
+    assert registry.stats()["models"][0]["refcount"] == 0
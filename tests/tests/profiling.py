@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.audio_buffer import SAMPLE_RATE
+
+from support import decode_as, fake_service, write_wav
+
+
+def test_stage_spans_fill_timings_and_export_chrome_trace(
+    monkeypatch, stream_service, tmp_path
+):
+    import json
+
+    from src.core import tracing
+
+    tracer = tracing.Tracer(enabled=True)
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    from src.core.audio_enhancer import AudioEnhancer
+
+    service, audio_file = stream_service
+    service.enable_language_predetection = False
+    service.enable_audio_enhancement = True
+    service.audio_enhancer = AudioEnhancer()
+
+    result = service.transcribe_file(audio_file, accuracy_priority="accuracy")
+    timings = result.metadata["timings"]
+
+    for name in (
+        "cache_lookup",
+        "decode",
+        "load_audio",
+        "enhance",
+        "analysis",
+        "enhancement",
+        "enhancement.noise_reduction",
+        "enhancement.normalization",
+        "infer",
+        "inference",
+        "finalize",
+        "text_processing",
+    ):
+        assert name in timings, name
+    # Sub-steps are counted inside the stage that runs them
+    assert timings["enhancement.noise_reduction"] <= timings["enhancement"]
+    assert timings["enhancement"] <= timings["enhance"]
+    assert timings["inference"] <= timings["infer"]
+
+    # A cache hit reports only its own (cheap) work
+    cached = service.transcribe_file(audio_file, accuracy_priority="accuracy")
+    assert set(cached.metadata["timings"]) == {"cache_lookup"}
+
+    trace = json.loads(tracer.export_chrome_trace(tmp_path / "trace.json").read_text())
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert {"decode", "enhance", "infer", "finalize"} <= {e["name"] for e in spans}
+    assert all(e["dur"] >= 0 and e["ts"] > 0 for e in spans)
+    stage = next(e for e in spans if e["name"] == "decode")
+    assert stage["cat"] == "stage" and stage["args"]["file"] == audio_file.name
+    assert any(e["ph"] == "M" for e in trace["traceEvents"])
+
+
+def test_pool_worker_spans_are_merged_into_the_gui_trace(
+    monkeypatch, rtf_store, tmp_path
+):
+    import queue
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from src.core import batch_pool, tracing
+    from src.gui.workers import batch_processor
+    from src.gui.workers.batch_processor import BatchFile, BatchProcessor
+    from src.models.transcription_result import (
+        TranscriptionResult,
+        TranscriptionSegment,
+    )
+
+    tracer = tracing.Tracer(enabled=True)
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+
+    class _Service:
+        progress_callback = None
+
+        def transcribe_file(self, file_path, **options):
+            with tracing.span("infer", category="stage", file=Path(file_path).name):
+                return TranscriptionResult(
+                    segments=[TranscriptionSegment(0.0, 1.0, "hello")],
+                    language="en",
+                    language_probability=0.9,
+                    duration=1.0,
+                    processing_time=0.1,
+                    model_used="base",
+                )
+
+    # Worker side: spans recorded while transcribing travel with the result
+    monkeypatch.setattr(batch_pool, "_worker_service", _Service())
+    monkeypatch.setattr(batch_pool, "_worker_events", queue.Queue())
+    outcome = batch_pool._transcribe_file(0, str(tmp_path / "a.wav"), {})
+    assert [e["name"] for e in outcome["trace_events"] if e["ph"] == "X"] == ["infer"]
+    assert tracer.drain() == []
+
+    # Parent side: the processor folds them into its own tracer
+    class _Pool:
+        def __init__(self, workers, service_options):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def submit(self, index, file_path, options):
+            future = Future()
+            future.set_result(batch_pool._transcribe_file(index, file_path, options))
+            return future
+
+        def progress_events(self):
+            return []
+
+    monkeypatch.setattr(batch_processor, "BatchProcessPool", _Pool)
+    files = [write_wav(tmp_path / name, 1) for name in ("a.wav", "b.wav")]
+    processor = BatchProcessor(
+        [BatchFile(str(path)) for path in files],
+        model="base",
+        language="auto",
+        enhanced=False,
+        speaker_detection=False,
+        mode="pool",
+        workers=2,
+    )
+    processor.run()
+
+    assert all(f.status == "completed" for f in processor.files)
+    assert all("trace_events" not in f.result for f in processor.files)
+    merged = [e for e in tracer.drain() if e["ph"] == "X"]
+    assert sorted(e["args"]["file"] for e in merged) == ["a.wav", "b.wav"]
+
+
+def test_benchmark_reports_stage_costs_and_flags_regressions(
+    monkeypatch, tmp_path, capsys
+):
+    import json
+
+    import soundfile as sf
+
+    from src import benchmark
+
+    monkeypatch.setattr(
+        benchmark,
+        "EnhancedTranscriptionService",
+        lambda **options: fake_service(**options),
+    )
+    # No ffmpeg here; the synthetic inputs are plain 16 kHz WAVs
+    decode_as(monkeypatch, lambda path: sf.read(str(path), dtype="float32")[0])
+
+    samples = benchmark.synthesize_speech(4.0, snr_db=10, seed=1)
+    assert len(samples) == 4 * SAMPLE_RATE
+    assert np.array_equal(samples, benchmark.synthesize_speech(4.0, 10, seed=1))
+
+    inputs = benchmark.synthetic_inputs([2.0], [None, 10.0], tmp_path)
+    report = benchmark.run_benchmark(
+        inputs,
+        [benchmark.CONFIGS["minimal"], benchmark.CONFIGS["text"]],
+        repeat=2,
+        warmup=0,
+    )
+
+    cases = {case["name"]: case for case in report["cases"]}
+    assert set(cases) == {
+        "synthetic-2s-clean/minimal",
+        "synthetic-2s-clean/text",
+        "synthetic-2s-snr10/minimal",
+        "synthetic-2s-snr10/text",
+    }
+    case = cases["synthetic-2s-clean/text"]
+    assert case["runs"] == 2 and case["audio_seconds"] == 2.0
+    assert case["rtf"] == pytest.approx(case["wall_seconds"] / 2.0, abs=1e-4)
+    assert "text_processing" in case["stage_seconds"]
+    assert "text_processing" not in cases["synthetic-2s-clean/minimal"]["stage_seconds"]
+    assert case["peak_rss_mb"] > 0 and case["alloc_peak_mb"] > 0
+
+    assert benchmark.compare(report, report) == []
+    faster = json.loads(json.dumps(report))
+    for old in faster["cases"]:
+        old["wall_seconds"] = old["wall_seconds"] / 10 - 1.0
+    regressions = benchmark.compare(faster, report)
+    assert {r.metric for r in regressions} == {"wall_seconds"}
+    assert len(regressions) == 4
+
+    # End to end: write a baseline, then compare a run against it
+    baseline = tmp_path / "baseline.json"
+    args = ["--durations", "2", "--noise", "clean", "--configs", "minimal"]
+    args += ["--repeat", "1", "--warmup", "0", "--no-allocations"]
+    assert benchmark.main(args + ["-o", str(baseline)]) == benchmark.EXIT_OK
+    assert json.loads(baseline.read_text())["cases"][0]["alloc_peak_mb"] is None
+
+    data = json.loads(baseline.read_text())
+    data["cases"][0]["wall_seconds"] = -1.0
+    baseline.write_text(json.dumps(data))
+    assert benchmark.main(args + ["--compare", str(baseline)]) == (
+        benchmark.EXIT_REGRESSION
+    )
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["regressions"][0]["metric"] == "wall_seconds"
+    assert "REGRESSION" in captured.err
+
+    assert benchmark.main(["--configs", "nope"]) == benchmark.EXIT_USAGE
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from support import WindowModel
+
+
+def test_transcribe_file_is_served_from_result_cache(stream_service):
+    service, audio_file = stream_service
+
+    first = service.transcribe_file(audio_file)
+    calls = len(service._transcriber.prompts)
+    second = service.transcribe_file(audio_file)
+
+    assert len(service._transcriber.prompts) == calls
+    assert second.full_text == first.full_text
+    assert second.metadata["cache_hit"] is True
+    assert service.result_cache.stats()["hits"] == 1
+
+    # A different effective config is a different cache entry
+    service.enable_speaker_detection = True
+    service.transcribe_file(audio_file)
+    assert len(service._transcriber.prompts) == calls + 1
+
+
+def test_result_cache_keys_on_the_model_chosen_by_optimizer(
+    monkeypatch, stream_service
+):
+    from src.core import transcription_service
+    from src.core.model_optimizer import ModelOptimizer
+    from src.core.model_registry import ModelRegistry
+
+    service, audio_file = stream_service
+    loads = []
+    registry = ModelRegistry(
+        memory_budget_gb=10,
+        loader=lambda *key: loads.append(key[0]) or WindowModel(),
+    )
+    monkeypatch.setattr(transcription_service, "get_model_registry", lambda: registry)
+    service.enable_model_optimization = True
+    service.model_optimizer = ModelOptimizer()
+    monkeypatch.setattr(
+        service.model_optimizer, "select_optimal_model_size", lambda *args: "small"
+    )
+
+    first = service.transcribe_file(audio_file)
+    assert service.model_size == "small"
+    assert first.metadata["result_cache_key"] == service._result_cache_key(
+        audio_file, None, None, "balanced", True
+    )
+
+    second = service.transcribe_file(audio_file)
+    assert second.metadata["cache_hit"] is True
+    assert loads == ["small"]
+
+
+def test_result_cache_stores_numpy_metadata_as_numbers(tmp_path):
+    from src.core.result_cache import ResultCache
+    from src.models.transcription_result import (
+        TranscriptionResult,
+        TranscriptionSegment,
+    )
+
+    cache = ResultCache(tmp_path)
+    cache.put(
+        "ab" * 32,
+        TranscriptionResult(
+            segments=[TranscriptionSegment(start=0.0, end=1.0, text="Cached")],
+            language="en",
+            language_probability=0.9,
+            duration=1.0,
+            processing_time=0.1,
+            model_used="tiny",
+            metadata={"snr": np.float32(12.5), "bands": np.arange(3)},
+        ),
+    )
+
+    metadata = cache.get("ab" * 32).metadata
+    assert metadata["snr"] == 12.5
+    assert metadata["bands"] == [0, 1, 2]
+
+
+def test_result_cache_evicts_to_size_limit(tmp_path):
+    from src.core.result_cache import ResultCache
+    from src.models.transcription_result import (
+        TranscriptionResult,
+        TranscriptionSegment,
+    )
+
+    sample_result = TranscriptionResult(
+        segments=[TranscriptionSegment(start=0.0, end=1.0, text="Cached")],
+        language="en",
+        language_probability=0.9,
+        duration=1.0,
+        processing_time=0.1,
+        model_used="tiny",
+    )
+    cache = ResultCache(tmp_path)
+    cache.put("a" * 64, sample_result)
+    cache.max_size_bytes = cache.size_bytes()  # room for exactly one entry
+    os.utime(cache._entry_path("a" * 64), (1, 1))
+    cache.put("b" * 64, sample_result)
+
+    assert cache.get("a" * 64) is None
+    assert cache.get("b" * 64) is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.core.audio_buffer import SAMPLE_RATE, AudioBuffer
+
+
+def tone(seconds: float, freq: float = 440.0, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float64)
+
+
+class FakeModel:
+    def __init__(self, key):
+        self.key = key
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append((len(audio), options))
+        return {"text": "", "segments": [], "language": "en"}
+
+
+def speech_with_pauses(blocks, sr=SAMPLE_RATE):
+    # blocks: list of (seconds, is_speech)
+    parts = []
+    for seconds, is_speech in blocks:
+        block = tone(seconds, freq=220.0) if is_speech else np.zeros(int(seconds * sr))
+        parts.append(block)
+    return np.concatenate(parts).astype(np.float32)
+
+
+class WindowModel:
+    device = "cpu"
+
+    def __init__(self):
+        self.prompts = []
+
+    def transcribe(self, audio, **options):
+        self.prompts.append(options.get("initial_prompt"))
+        seconds = len(audio) / SAMPLE_RATE
+        text = f" window number {len(self.prompts)}"
+        return {
+            "language": "en",
+            "segments": [{"start": 0.0, "end": seconds, "text": text}],
+        }
+
+
+def decode_as(monkeypatch, samples):
+    # Every file "decodes" to samples (or samples(path)); what is on disk
+    # only has to exist
+    monkeypatch.setattr(
+        AudioBuffer,
+        "from_file",
+        classmethod(
+            lambda cls, path: cls(
+                samples=samples(path) if callable(samples) else samples,
+                source_path=path,
+            )
+        ),
+    )
+
+
+def audio_files(directory, *names, size=4096):
+    paths = []
+    for name in names:
+        paths.append(directory / name)
+        paths[-1].write_bytes(b"\0" * size)
+    return paths
+
+
+def fake_service(model=None, **options):
+    # A real service around a fake model that counts as already loaded
+    from src.core.transcription_service import EnhancedTranscriptionService
+
+    service = EnhancedTranscriptionService(**options)
+    service._transcriber = model if model is not None else WindowModel()
+    service._loaded_model_size = service.model_size
+    return service
+
+
+def service_factory(model_class=WindowModel, **defaults):
+    # For the executors, queues and CLI that build a service per worker. Each
+    # gets its own model object, so the per-model inference lock does not
+    # serialize them
+    def factory(**options):
+        return fake_service(
+            model_class(),
+            **{
+                "enable_result_cache": False,
+                "enable_language_predetection": False,
+                **defaults,
+                **options,
+            },
+        )
+
+    return factory
+
+
+def write_wav(path, seconds):
+    import wave
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"\0\0" * int(seconds * SAMPLE_RATE))
+    return path
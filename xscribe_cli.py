@@ -0,0 +1,13 @@
+import multiprocessing
+import os
+import sys
+
+# Redirect Numba cache the same way the GUI entry point does
+os.environ["NUMBA_CACHE_DIR"] = os.path.join(os.path.expanduser("~"), ".cache", "numba")
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    from src.cli import main
+
+    sys.exit(main())
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Redirect Numba cache the same way the GUI entry point does
+os.environ["NUMBA_CACHE_DIR"] = os.path.join(os.path.expanduser("~"), ".cache", "numba")
+
+if __name__ == "__main__":
+    from src.server import main
+
+    sys.exit(main())